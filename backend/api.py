@@ -1,9 +1,11 @@
-from flask import Flask, request, jsonify, send_file
+from flask import Flask, Response, request, jsonify, send_file, g
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 import sys
 import os
 import traceback
 import io
+import time
 
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
@@ -16,34 +18,116 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from src.preprocessing.preprocessor import DataPreprocessor
 from src.feature_engineering.engineer import FeatureEngineer
 from src.models.predictor import ShelfLifePredictor
+from src.models.execution import ExecutionPolicy
 from src.inference.pipeline import InferencePipeline
+from src.inference.cache import PredictionCache
+from src.inference.lookup_table import ShelfLifeLookupTable
+from src.inference.batcher import PredictionBatcher
+from src.inference.streaming import NDJSONPredictionStream, NDJSON_MIMETYPE
+from src.inference.metrics import InferenceMetrics, PROMETHEUS_CONTENT_TYPE
 from src.rules.interpreter import RuleBasedInterpreter
-from src.services.voice_service import ElevenLabsVoiceService
-from src.services.chat_service import OpenRouterChatService
+
+metrics = InferenceMetrics()
+
+
+class TimedJSONProvider(DefaultJSONProvider):
+    def dumps(self, obj, **kwargs):
+        start = time.perf_counter()
+        body = super().dumps(obj, **kwargs)
+        metrics.observe_stage('http', 'serialize', time.perf_counter() - start)
+        return body
+
 
 app = Flask(__name__)
+app.json = TimedJSONProvider(app)
 CORS(app)
 
 pipeline = None
+batcher = None
 voice_service = None
 chat_service = None
 
 
+def load_lookup_table(preprocessor, feature_engineer, model):
+    path = os.getenv('LOOKUP_TABLE')
+    if not path:
+        return None
+
+    artifacts = ['models/shelf_life_predictor.pkl', 'models/preprocessor.pkl']
+    lookup_table = None
+    if os.path.exists(path):
+        try:
+            lookup_table = ShelfLifeLookupTable().load(
+                path, mmap_mode=os.getenv('MODEL_MMAP_MODE', 'r') or None, artifacts=artifacts
+            )
+        except ValueError as e:
+            print(f"Warning: {e}, rebuilding it")
+
+    if lookup_table is None:
+        print("Building lookup table...")
+        lookup_table = ShelfLifeLookupTable().build(preprocessor, feature_engineer, model)
+        lookup_table.save(path, artifacts=artifacts)
+
+    print(f"Lookup table loaded: {path}")
+    if lookup_table.error_report:
+        print(f"Max interpolation error: {lookup_table.error_report['max_abs_error']:.3f} days")
+    return lookup_table
+
+
 def load_pipeline():
-    global pipeline, voice_service, chat_service
+    global pipeline, batcher
     try:
-        preprocessor = DataPreprocessor().load('models/preprocessor.pkl')
-        model = ShelfLifePredictor().load('models/shelf_life_predictor.pkl')
+        mmap_mode = os.getenv('MODEL_MMAP_MODE', 'r') or None
+        preprocessor = DataPreprocessor().load('models/preprocessor.pkl', mmap_mode=mmap_mode)
+        execution_policy = ExecutionPolicy(
+            max_threads=int(os.getenv('MODEL_MAX_THREADS') or 0) or None,
+            workers=int(os.getenv('WEB_WORKERS') or 1),
+            min_rows_per_job=int(os.getenv('MODEL_MIN_ROWS_PER_JOB', 5000))
+        )
+        model = ShelfLifePredictor(execution_policy=execution_policy).load(
+            'models/shelf_life_predictor.pkl', mmap_mode=mmap_mode
+        )
         feature_engineer = FeatureEngineer()
         rule_interpreter = RuleBasedInterpreter()
-
-        pipeline = InferencePipeline(preprocessor, feature_engineer, model, rule_interpreter)
+        lookup_table = load_lookup_table(preprocessor, feature_engineer, model)
+
+        if pipeline is None:
+            cache = PredictionCache(
+                max_size=int(os.getenv('PREDICTION_CACHE_SIZE', 4096)),
+                ttl=float(os.getenv('PREDICTION_CACHE_TTL', 300))
+            )
+            pipeline = InferencePipeline(
+                preprocessor, feature_engineer, model, rule_interpreter, cache=cache, lookup_table=lookup_table,
+                metrics=metrics,
+                feature_dtype='float32' if os.getenv('INFERENCE_FLOAT32', 'false').lower() == 'true' else 'float64'
+            )
+        else:
+            pipeline.reload(preprocessor=preprocessor, model=model, lookup_table=lookup_table)
+
+        batch_window_ms = float(os.getenv('PREDICT_BATCH_WINDOW_MS', 0))
+        if batch_window_ms > 0 and batcher is None:
+            batcher = PredictionBatcher(
+                pipeline,
+                max_wait=batch_window_ms / 1000,
+                max_batch_size=int(os.getenv('PREDICT_BATCH_MAX_SIZE', 64))
+            )
         print("Pipeline loaded successfully!")
     except Exception as e:
         print(f"Error loading pipeline: {e}")
         traceback.print_exc()
 
+    if os.getenv('INFERENCE_ONLY', 'false').lower() != 'true':
+        load_services()
+
+
+def load_services():
+    global voice_service, chat_service
+    # Imported here so that inference-only processes never load the HTTP
+    # client libraries the services depend on.
     try:
+        from src.services.voice_service import ElevenLabsVoiceService
+        from src.services.chat_service import OpenRouterChatService
+
         voice_service = ElevenLabsVoiceService()
         chat_service = OpenRouterChatService()
         print("Services loaded successfully!")
@@ -52,9 +136,44 @@ def load_pipeline():
         traceback.print_exc()
 
 
+def health_status():
+    return {
+        'status': 'healthy',
+        'pipeline_loaded': pipeline is not None,
+        'prediction_cache': pipeline.cache.stats() if pipeline is not None and pipeline.cache is not None else None,
+        'lookup_table': pipeline.lookup_table.error_report if pipeline is not None and pipeline.lookup_table is not None else None,
+        'batcher': batcher.stats() if batcher is not None else None
+    }
+
+
+def metrics_text():
+    return metrics.render(
+        cache_stats=pipeline.cache.stats() if pipeline is not None and pipeline.cache is not None else None,
+        batcher_stats=batcher.stats() if batcher is not None else None
+    )
+
+
+@app.before_request
+def start_request_timer():
+    g.request_start = time.perf_counter()
+
+
+@app.after_request
+def record_request_time(response):
+    # Streamed responses are timed to the first byte
+    route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+    metrics.observe_request(route, request.method, response.status_code, time.perf_counter() - g.request_start)
+    return response
+
+
 @app.route('/health', methods=['GET'])
 def health_check():
-    return jsonify({'status': 'healthy', 'pipeline_loaded': pipeline is not None})
+    return jsonify(health_status())
+
+
+@app.route('/metrics', methods=['GET'])
+def metrics_endpoint():
+    return Response(metrics_text(), content_type=PROMETHEUS_CONTENT_TYPE)
 
 
 @app.route('/predict', methods=['POST'])
@@ -65,7 +184,7 @@ def predict():
     try:
         data = request.get_json()
 
-        result = pipeline.predict_single(
+        result = (batcher or pipeline).predict_single(
             food_type=data['food_type'],
             temperature=float(data['temperature']),
             humidity=float(data['humidity']),
@@ -113,6 +232,12 @@ def batch_predict():
     if pipeline is None:
         return jsonify({'error': 'Model not loaded'}), 500
 
+    if request.mimetype == NDJSON_MIMETYPE:
+        # One JSON object per line in, one result per line out, scored in
+        # fixed-size chunks so memory does not grow with the upload.
+        stream = NDJSONPredictionStream(pipeline, chunk_size=int(os.getenv('BATCH_STREAM_CHUNK_SIZE', 1000)))
+        return Response(stream.stream_upload(request.stream), mimetype=NDJSON_MIMETYPE)
+
     try:
         data = request.get_json()
         items = data.get('items', [])
@@ -130,6 +255,8 @@ def batch_predict():
 def voice_explain():
     if pipeline is None:
         return jsonify({'error': 'Model not loaded'}), 500
+    if voice_service is None:
+        return jsonify({'error': 'Voice service not loaded'}), 500
 
     try:
         data = request.get_json()
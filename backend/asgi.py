@@ -0,0 +1,302 @@
+import sys
+import os
+import asyncio
+import contextlib
+import tempfile
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import httpx
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.responses import Response, StreamingResponse
+from starlette.routing import Route
+
+import api
+from src.inference.streaming import NDJSONPredictionStream, NDJSON_MIMETYPE
+from src.inference.metrics import PROMETHEUS_CONTENT_TYPE
+
+inference_executor = None
+http_client = None
+
+# Bytes per blocking read or write of a spooled NDJSON upload
+UPLOAD_IO_SIZE = 1 << 20
+
+
+def json_response(data, status_code=200):
+    # Reuse Flask's JSON provider so both servers serialize results identically
+    with api.app.app_context():
+        body = api.app.json.dumps(data)
+    return Response(body, status_code=status_code, media_type='application/json')
+
+
+async def run_inference(fn, *args):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(inference_executor, fn, *args)
+
+
+async def run_io(fn, *args):
+    # Blocking file I/O goes to the loop's default executor, so it neither
+    # stalls the event loop nor takes inference threads
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, fn, *args)
+
+
+async def predict_from_request(request):
+    data = await request.json()
+    return await run_inference(
+        (api.batcher or api.pipeline).predict_single,
+        data['food_type'],
+        float(data['temperature']),
+        float(data['humidity']),
+        data['storage_type'],
+        float(data['days_stored'])
+    )
+
+
+async def health_check(request):
+    return json_response(api.health_status())
+
+
+async def metrics_endpoint(request):
+    return Response(api.metrics_text(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+
+async def predict(request):
+    if api.pipeline is None:
+        return json_response({'error': 'Model not loaded'}, 500)
+
+    try:
+        result = await predict_from_request(request)
+        return json_response(result)
+    except Exception as e:
+        print(f"Prediction error: {e}")
+        traceback.print_exc()
+        return json_response({'error': str(e)}, 500)
+
+
+async def explain(request):
+    if api.pipeline is None:
+        return json_response({'error': 'Model not loaded'}, 500)
+
+    try:
+        result = await predict_from_request(request)
+        explanation = api.pipeline.explain_prediction(result)
+
+        return json_response({
+            'explanation': explanation,
+            'result': result
+        })
+    except Exception as e:
+        print(f"Explanation error: {e}")
+        traceback.print_exc()
+        return json_response({'error': str(e)}, 500)
+
+
+async def stream_batch_predictions(stream, upload):
+    try:
+        await run_io(upload.seek, 0)
+        while True:
+            lines = await run_io(upload.readlines, UPLOAD_IO_SIZE)
+            if not lines:
+                break
+            for line in lines:
+                rows = stream.add(line)
+                if rows:
+                    yield b''.join(await run_inference(stream.score, rows))
+        rows = stream.flush()
+        if rows:
+            yield b''.join(await run_inference(stream.score, rows))
+    finally:
+        upload.close()
+
+
+async def spool_upload(request):
+    upload = await run_io(tempfile.TemporaryFile)
+    try:
+        pending, size = [], 0
+        async for body in request.stream():
+            pending.append(body)
+            size += len(body)
+            if size >= UPLOAD_IO_SIZE:
+                await run_io(upload.write, b''.join(pending))
+                pending, size = [], 0
+        if pending:
+            await run_io(upload.write, b''.join(pending))
+    except BaseException:
+        upload.close()
+        raise
+    return upload
+
+
+async def batch_predict(request):
+    if api.pipeline is None:
+        return json_response({'error': 'Model not loaded'}, 500)
+
+    if request.headers.get('content-type', '').split(';')[0].strip() == NDJSON_MIMETYPE:
+        # Spooled to disk first, see NDJSONPredictionStream.stream_upload
+        stream = NDJSONPredictionStream(api.pipeline, chunk_size=int(os.getenv('BATCH_STREAM_CHUNK_SIZE', 1000)))
+        upload = await spool_upload(request)
+        return StreamingResponse(stream_batch_predictions(stream, upload), media_type=NDJSON_MIMETYPE)
+
+    try:
+        data = await request.json()
+        items = data.get('items', [])
+
+        results = await run_inference(api.pipeline.predict, items)
+
+        return json_response({'results': results})
+    except Exception as e:
+        print(f"Batch prediction error: {e}")
+        traceback.print_exc()
+        return json_response({'error': str(e)}, 500)
+
+
+async def voice_explain(request):
+    if api.pipeline is None:
+        return json_response({'error': 'Model not loaded'}, 500)
+    if api.voice_service is None:
+        return json_response({'error': 'Voice service not loaded'}, 500)
+
+    try:
+        result = await predict_from_request(request)
+
+        audio_result = await api.voice_service.agenerate_explanation_audio(result, client=http_client)
+
+        if 'error' in audio_result:
+            return json_response(audio_result, 500)
+
+        return Response(audio_result['audio_data'], media_type='audio/mpeg')
+
+    except Exception as e:
+        print(f"Voice explanation error: {e}")
+        traceback.print_exc()
+        return json_response({'error': str(e)}, 500)
+
+
+async def chat(request):
+    if api.chat_service is None:
+        return json_response({'error': 'Chat service not loaded'}, 500)
+
+    try:
+        data = await request.json()
+        message = data.get('message', '')
+        context = data.get('context')
+
+        response = await api.chat_service.achat(message, context, client=http_client)
+
+        if 'error' in response:
+            return json_response(response, 500)
+
+        return json_response(response)
+
+    except Exception as e:
+        print(f"Chat error: {e}")
+        traceback.print_exc()
+        return json_response({'error': str(e)}, 500)
+
+
+async def prediction_explanation(request):
+    if api.pipeline is None or api.chat_service is None:
+        return json_response({'error': 'Services not loaded'}, 500)
+
+    try:
+        result = await predict_from_request(request)
+
+        explanation = await api.chat_service.aget_prediction_explanation(result, client=http_client)
+
+        return json_response({'explanation': explanation})
+
+    except Exception as e:
+        print(f"Prediction explanation error: {e}")
+        traceback.print_exc()
+        return json_response({'error': str(e)}, 500)
+
+
+async def storage_advice(request):
+    if api.chat_service is None:
+        return json_response({'error': 'Chat service not loaded'}, 500)
+
+    try:
+        data = await request.json()
+        food_type = data['food_type']
+        storage_conditions = data.get('storage_conditions', {})
+
+        response = await api.chat_service.aget_storage_advice(food_type, storage_conditions, client=http_client)
+
+        if 'error' in response:
+            return json_response(response, 500)
+
+        return json_response(response)
+
+    except Exception as e:
+        print(f"Storage advice error: {e}")
+        traceback.print_exc()
+        return json_response({'error': str(e)}, 500)
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app):
+    global inference_executor, http_client
+    inference_executor = ThreadPoolExecutor(
+        max_workers=int(os.getenv('INFERENCE_WORKERS') or os.cpu_count() or 1),
+        thread_name_prefix='inference'
+    )
+    http_client = httpx.AsyncClient(limits=httpx.Limits(max_connections=int(os.getenv('HTTP_MAX_CONNECTIONS', 100))))
+    await asyncio.get_running_loop().run_in_executor(None, api.load_pipeline)
+
+    yield
+
+    await http_client.aclose()
+    inference_executor.shutdown(wait=False)
+
+
+class RequestMetricsMiddleware:
+    # Same request histogram as the Flask app, timed to the first response byte
+    def __init__(self, app, route_paths):
+        self.app = app
+        self.route_paths = set(route_paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            return await self.app(scope, receive, send)
+
+        start = time.perf_counter()
+        route = scope['path'] if scope['path'] in self.route_paths else 'unmatched'
+
+        async def timed_send(message):
+            if message['type'] == 'http.response.start':
+                api.metrics.observe_request(route, scope['method'], message['status'], time.perf_counter() - start)
+            await send(message)
+
+        await self.app(scope, receive, timed_send)
+
+
+routes = [
+    Route('/health', health_check, methods=['GET']),
+    Route('/metrics', metrics_endpoint, methods=['GET']),
+    Route('/predict', predict, methods=['POST']),
+    Route('/explain', explain, methods=['POST']),
+    Route('/batch_predict', batch_predict, methods=['POST']),
+    Route('/voice/explain', voice_explain, methods=['POST']),
+    Route('/chat', chat, methods=['POST']),
+    Route('/chat/prediction_explanation', prediction_explanation, methods=['POST']),
+    Route('/chat/storage_advice', storage_advice, methods=['POST'])
+]
+
+app = Starlette(
+    routes=routes,
+    middleware=[
+        Middleware(RequestMetricsMiddleware, route_paths=[route.path for route in routes]),
+        Middleware(CORSMiddleware, allow_origins=['*'], allow_methods=['*'], allow_headers=['*'])
+    ],
+    lifespan=lifespan
+)
+
+if __name__ == '__main__':
+    import uvicorn
+    uvicorn.run(app, host='0.0.0.0', port=int(os.getenv('PORT', 5001)))
@@ -0,0 +1,180 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import json
+import subprocess
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from benchmarks.predict_single import sample_requests
+from benchmarks.stubs import StubBehaviour, start_openrouter_stub
+
+
+def serve_flask(port, workers):
+    from werkzeug.serving import BaseWSGIServer
+    import api
+
+    # A fixed pool of request threads stands in for a fixed number of
+    # synchronous WSGI workers.
+    class PooledWSGIServer(BaseWSGIServer):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.executor = ThreadPoolExecutor(max_workers=workers)
+
+        def process_request(self, request, client_address):
+            self.executor.submit(self.process_request_thread, request, client_address)
+
+        def process_request_thread(self, request, client_address):
+            try:
+                self.finish_request(request, client_address)
+            except Exception:
+                self.handle_error(request, client_address)
+            finally:
+                self.shutdown_request(request)
+
+    api.load_pipeline()
+    PooledWSGIServer('127.0.0.1', port, api.app).serve_forever()
+
+
+def serve_asgi(port, workers):
+    import uvicorn
+    import asgi
+
+    os.environ['INFERENCE_WORKERS'] = str(workers)
+    uvicorn.run(asgi.app, host='127.0.0.1', port=port, log_level='warning')
+
+
+def post(url, payload, timeout=60):
+    request = urllib.request.Request(
+        url, data=json.dumps(payload).encode(), headers={'Content-Type': 'application/json'}
+    )
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        return response.read()
+
+
+def wait_for_server(base_url, timeout=60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            urllib.request.urlopen(f'{base_url}/health', timeout=1).read()
+            return
+        except Exception:
+            time.sleep(0.2)
+    raise RuntimeError(f"Server at {base_url} did not start")
+
+
+def run_load(base_url, duration, predict_clients, chat_clients):
+    stop = threading.Event()
+    latencies = []
+    errors = []
+    chats = []
+    lock = threading.Lock()
+    items = sample_requests(5000)
+
+    def chat_loop():
+        while not stop.is_set():
+            try:
+                post(f'{base_url}/chat', {'message': 'How long does milk last?'})
+                with lock:
+                    chats.append(1)
+            except Exception as e:
+                with lock:
+                    errors.append(str(e))
+
+    def predict_loop(offset):
+        i = offset
+        while not stop.is_set():
+            start = time.perf_counter()
+            try:
+                post(f'{base_url}/predict', items[i % len(items)])
+                with lock:
+                    latencies.append(time.perf_counter() - start)
+            except Exception as e:
+                with lock:
+                    errors.append(str(e))
+            i += predict_clients
+
+    threads = [threading.Thread(target=chat_loop, daemon=True) for _ in range(chat_clients)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.5)
+
+    predict_threads = [threading.Thread(target=predict_loop, args=(i,), daemon=True) for i in range(predict_clients)]
+    start = time.perf_counter()
+    for thread in predict_threads:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    elapsed = time.perf_counter() - start
+    for thread in predict_threads:
+        thread.join(timeout=60)
+
+    latencies = np.array(latencies) * 1000 if latencies else np.zeros(1)
+    return {
+        'predict_rps': len(latencies) / elapsed,
+        'predict_p50_ms': float(np.percentile(latencies, 50)),
+        'predict_p99_ms': float(np.percentile(latencies, 99)),
+        'chats_completed': len(chats),
+        'errors': len(errors)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare /predict throughput of the Flask and ASGI servers while /chat calls are in flight')
+    parser.add_argument('--serve', choices=['flask', 'asgi'], help=argparse.SUPPRESS)
+    parser.add_argument('--port', type=int, default=5101)
+    parser.add_argument('--stub-port', type=int, default=5199)
+    parser.add_argument('--workers', type=int, default=4, help='Flask request threads / ASGI inference threads')
+    parser.add_argument('--chat-latency', type=float, default=2.0)
+    parser.add_argument('--chat-clients', type=int, default=8)
+    parser.add_argument('--predict-clients', type=int, default=8)
+    parser.add_argument('--duration', type=float, default=10.0)
+    args = parser.parse_args()
+
+    if args.serve == 'flask':
+        return serve_flask(args.port, args.workers)
+    if args.serve == 'asgi':
+        return serve_asgi(args.port, args.workers)
+
+    stub = start_openrouter_stub(args.stub_port, StubBehaviour(latency=args.chat_latency))
+    env = dict(
+        os.environ,
+        OPENROUTER_BASE_URL=f'http://127.0.0.1:{args.stub_port}',
+        OPENROUTER_API_KEY='benchmark'
+    )
+    backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    results = {}
+    for mode in ['flask', 'asgi']:
+        server = subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), '--serve', mode,
+             '--port', str(args.port), '--workers', str(args.workers)],
+            cwd=backend_dir, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        try:
+            base_url = f'http://127.0.0.1:{args.port}'
+            wait_for_server(base_url)
+            results[mode] = run_load(base_url, args.duration, args.predict_clients, args.chat_clients)
+        finally:
+            server.terminate()
+            server.wait()
+
+    stub.shutdown()
+
+    print(f"{args.chat_clients} /chat clients ({args.chat_latency}s upstream latency), "
+          f"{args.predict_clients} /predict clients, {args.workers} workers, {args.duration}s\n")
+    print(f"{'Server':<8} {'predict/s':<11} {'p50 (ms)':<10} {'p99 (ms)':<10} {'chats':<7} {'errors':<7}")
+    print("-" * 56)
+    for mode, stats in results.items():
+        print(f"{mode:<8} {stats['predict_rps']:<11.1f} {stats['predict_p50_ms']:<10.1f} "
+              f"{stats['predict_p99_ms']:<10.1f} {stats['chats_completed']:<7} {stats['errors']:<7}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import json
+import subprocess
+import tempfile
+import time
+import urllib.request
+
+from benchmarks.async_serving import wait_for_server
+from benchmarks.predict_single import sample_requests
+
+
+def serve(port):
+    from werkzeug.serving import run_simple
+    import api
+
+    api.load_pipeline()
+    run_simple('127.0.0.1', port, api.app, threaded=True)
+
+
+def read_status_mb(pid):
+    fields = {}
+    with open(f'/proc/{pid}/status') as f:
+        for line in f:
+            key, _, value = line.partition(':')
+            if key in ('VmRSS', 'VmHWM'):
+                fields[key] = int(value.split()[0]) / 1024
+    return fields
+
+
+def write_payloads(tmpdir, n_rows):
+    json_path = os.path.join(tmpdir, 'batch.json')
+    ndjson_path = os.path.join(tmpdir, 'batch.ndjson')
+    items = sample_requests(n_rows)
+    with open(json_path, 'w') as f:
+        json.dump({'items': items}, f)
+    with open(ndjson_path, 'w') as f:
+        for item in items:
+            f.write(json.dumps(item) + '\n')
+    return json_path, ndjson_path
+
+
+def upload(url, path, content_type):
+    start = time.perf_counter()
+    first_result = None
+    rows = 0
+    with open(path, 'rb') as body:
+        request = urllib.request.Request(url, data=body, headers={
+            'Content-Type': content_type,
+            'Content-Length': str(os.path.getsize(path))
+        })
+        with urllib.request.urlopen(request, timeout=3600) as response:
+            if content_type == 'application/json':
+                rows = len(json.loads(response.read())['results'])
+                first_result = time.perf_counter() - start
+            else:
+                for line in response:
+                    if first_result is None:
+                        first_result = time.perf_counter() - start
+                    rows += 1
+    return rows, first_result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare server memory and latency of JSON and NDJSON /batch_predict uploads')
+    parser.add_argument('--serve', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--port', type=int, default=5102)
+    parser.add_argument('--rows', type=int, default=200000)
+    parser.add_argument('--chunk-size', type=int, default=1000)
+    args = parser.parse_args()
+
+    if args.serve:
+        return serve(args.port)
+
+    backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, BATCH_STREAM_CHUNK_SIZE=str(args.chunk_size), INFERENCE_ONLY='true')
+    base_url = f'http://127.0.0.1:{args.port}'
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        json_path, ndjson_path = write_payloads(tmpdir, args.rows)
+        uploads = {
+            'JSON': (json_path, 'application/json'),
+            'NDJSON stream': (ndjson_path, 'application/x-ndjson')
+        }
+
+        print(f"{args.rows} rows, NDJSON chunk size {args.chunk_size}\n")
+        print(f"{'Mode':<15} {'rows':<9} {'1st result (s)':<15} {'total (s)':<10} {'RSS idle (MB)':<14} {'RSS peak (MB)':<14}")
+        print("-" * 80)
+        for name, (path, content_type) in uploads.items():
+            server = subprocess.Popen(
+                [sys.executable, os.path.abspath(__file__), '--serve', '--port', str(args.port)],
+                cwd=backend_dir, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+            )
+            try:
+                wait_for_server(base_url)
+                idle = read_status_mb(server.pid)['VmRSS']
+                rows, first_result, total = upload(f'{base_url}/batch_predict', path, content_type)
+                peak = read_status_mb(server.pid)['VmHWM']
+            finally:
+                server.terminate()
+                server.wait()
+            print(f"{name:<15} {rows:<9} {first_result:<15.2f} {total:<10.2f} {idle:<14.1f} {peak:<14.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import threading
+import time
+import pandas as pd
+from joblib import parallel_config
+
+from src.preprocessing.preprocessor import DataPreprocessor
+from src.feature_engineering.engineer import FeatureEngineer
+from src.models.predictor import ShelfLifePredictor
+from src.models.execution import ExecutionPolicy
+from benchmarks.predict_single import sample_requests
+from benchmarks.tree_engine import best_time
+
+
+def sklearn_predict(model, X, n_jobs):
+    with parallel_config(backend='threading', n_jobs=n_jobs):
+        return model.predict(X)
+
+
+def run_concurrent(predict, X, clients, duration):
+    stop = threading.Event()
+    counts = [0] * clients
+
+    def loop(i):
+        while not stop.is_set():
+            predict(X)
+            counts[i] += len(X)
+
+    threads = [threading.Thread(target=loop, args=(i,), daemon=True) for i in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return sum(counts) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Find the batch sizes where sklearn n_jobs > 1 starts to pay off')
+    parser.add_argument('--models-dir', default='models')
+    parser.add_argument('--batch-sizes', default='1,10,100,500,1000,2000,5000,20000,100000')
+    parser.add_argument('--n-jobs', default=None, help='Comma-separated n_jobs values (default: 1,2,4,...,cpu count)')
+    parser.add_argument('--min-rows-per-job', type=int, default=5000)
+    parser.add_argument('--clients', type=int, default=4)
+    parser.add_argument('--concurrent-batch', type=int, default=20000)
+    parser.add_argument('--duration', type=float, default=5.0)
+    parser.add_argument('--repeats', type=int, default=5)
+    args = parser.parse_args()
+
+    cpus = os.cpu_count() or 1
+    if args.n_jobs:
+        n_jobs_values = [int(value) for value in args.n_jobs.split(',')]
+    else:
+        n_jobs_values = sorted({1, cpus} | {2 ** i for i in range(1, 8) if 2 ** i < cpus})
+
+    preprocessor = DataPreprocessor().load(os.path.join(args.models_dir, 'preprocessor.pkl'))
+    predictor = ShelfLifePredictor().load(os.path.join(args.models_dir, 'shelf_life_predictor.pkl'))
+    model = predictor.model
+    policy = ExecutionPolicy(min_rows_per_job=args.min_rows_per_job)
+    print(f"Model: {type(model).__name__}, {cpus} CPUs")
+
+    batch_sizes = [int(size) for size in args.batch_sizes.split(',')]
+    requests = pd.DataFrame(sample_requests(max(batch_sizes + [args.concurrent_batch])))
+    features = FeatureEngineer().transform(preprocessor.transform(requests))[predictor.get_feature_order()]
+
+    header = ''.join(f"{f'n_jobs={n} (ms)':<16}" for n in n_jobs_values)
+    print(f"\n{'Batch':<9} {header}{'fastest':<9} {'policy':<8}")
+    print("-" * (9 + 16 * len(n_jobs_values) + 18))
+    for size in batch_sizes:
+        X = features.iloc[:size]
+        repeats = args.repeats if size < 100000 else 1
+        timings = {n: best_time(lambda: sklearn_predict(model, X, n), repeats) for n in n_jobs_values}
+        fastest = min(timings, key=timings.get)
+        row = ''.join(f"{timings[n] * 1000:<16.2f}" for n in n_jobs_values)
+        print(f"{size:<9} {row}{fastest:<9} {policy.n_jobs_for(size):<8}")
+
+    # Several threads predicting at once, as in a threaded server: every call
+    # using all cores against every call using its share of them
+    X = features.iloc[:args.concurrent_batch]
+    fixed = run_concurrent(lambda X: sklearn_predict(model, X, -1), X, args.clients, args.duration)
+    predictor.execution_policy = policy
+    managed = run_concurrent(predictor.predict, X, args.clients, args.duration)
+    print(f"\n{args.clients} concurrent clients, batches of {args.concurrent_batch} rows:")
+    print(f"  n_jobs=-1 on every call: {fixed:.0f} rows/s")
+    print(f"  execution policy:        {managed:.0f} rows/s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import numpy as np
+import pandas as pd
+
+from src.preprocessing.preprocessor import DataPreprocessor
+from src.feature_engineering.engineer import FeatureEngineer
+from benchmarks.predict_single import sample_requests
+from benchmarks.tree_engine import best_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the array FeatureEngineer kernel against the pandas version')
+    parser.add_argument('--models-dir', default='models')
+    parser.add_argument('--batch-sizes', default='1,100,10000,1000000')
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+
+    preprocessor = DataPreprocessor().load(os.path.join(args.models_dir, 'preprocessor.pkl'))
+    engineer = FeatureEngineer()
+
+    batch_sizes = [int(size) for size in args.batch_sizes.split(',')]
+    requests = pd.DataFrame(sample_requests(max(batch_sizes)))
+    # Missing readings take the imputer's path through the preprocessor
+    requests.loc[::101, 'humidity'] = np.nan
+    processed = preprocessor.transform(requests)
+
+    codes = [processed[col].to_numpy() for col in ['food_type', 'storage_type', 'temperature', 'humidity', 'days_stored']]
+
+    print(f"\n{'Rows':<9} {'pandas (ms)':<13} {'transform (ms)':<16} {'arrays (ms)':<13} {'speedup':<8}")
+    print("-" * 60)
+    for size in batch_sizes:
+        X = processed.iloc[:size]
+        inputs = [values[:size] for values in codes]
+        out = np.empty((size, len(engineer.get_feature_names())), order='F')
+        pandas_time = best_time(lambda: engineer.transform_pandas(X), args.repeats)
+        frame_time = best_time(lambda: engineer.transform(X), args.repeats)
+        array_time = best_time(lambda: engineer.transform_arrays(*inputs, out=out), args.repeats)
+        print(f"{size:<9} {pandas_time * 1000:<13.2f} {frame_time * 1000:<16.2f} {array_time * 1000:<13.2f} "
+              f"{pandas_time / frame_time:<8.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import json
+import time
+import numpy as np
+
+from src.inference.runtime import load_inference_pipeline
+from src.datasets.synthetic import SyntheticShelfLifeGenerator
+
+REQUIRED_COLUMNS = ['food_type', 'temperature', 'humidity', 'storage_type', 'days_stored']
+
+
+def score(pipeline, df, chunk_size):
+    # Raw model predictions and the final scored frame, chunk by chunk so
+    # small chunks exercise the flat tree engine and large ones sklearn
+    raw, frames = [], []
+    start = time.perf_counter()
+    for offset in range(0, len(df), chunk_size):
+        chunk = df.iloc[offset:offset + chunk_size]
+        raw.append(pipeline._model_predict({col: chunk[col].to_numpy() for col in REQUIRED_COLUMNS}))
+    model_time = time.perf_counter() - start
+    for offset in range(0, len(df), chunk_size):
+        frames.append(pipeline.predict_frame(df.iloc[offset:offset + chunk_size]))
+    return np.concatenate(raw), frames, model_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare float32 feature mode predictions with the float64 path')
+    parser.add_argument('--models-dir', default='models')
+    parser.add_argument('--rows', type=int, default=200000)
+    parser.add_argument('--chunk-size', type=int, default=50000, help='Rows per pipeline call (<= 512 uses the flat tree engine)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help='Write the report as JSON to this file')
+    args = parser.parse_args()
+
+    reference = load_inference_pipeline(args.models_dir)
+    candidate = load_inference_pipeline(args.models_dir, feature_dtype='float32')
+    df = SyntheticShelfLifeGenerator(seed=args.seed).generate(args.rows).drop(columns='remaining_shelf_life')
+
+    raw64, frames64, time64 = score(reference, df, args.chunk_size)
+    raw32, frames32, time32 = score(candidate, df, args.chunk_size)
+
+    errors = np.abs(raw32 - raw64)
+    report = {
+        'rows': args.rows,
+        'chunk_size': args.chunk_size,
+        'model': type(reference.model.model).__name__,
+        'raw_rows_changed': int((errors > 0).sum()),
+        'raw_max_abs_error': float(errors.max()),
+        'raw_p99_abs_error': float(np.percentile(errors, 99)),
+        'raw_mean_abs_error': float(errors.mean()),
+        'rounded_rows_changed': 0,
+        'safety_changed': 0,
+        'severity_changed': 0,
+        'feature_buffer_mb_per_million': {
+            dtype: 1e6 * len(reference.feature_engineer.get_feature_names()) * np.dtype(dtype).itemsize / 1e6
+            for dtype in ('float64', 'float32')
+        },
+        'model_time_s': {'float64': time64, 'float32': time32}
+    }
+    for frame64, frame32 in zip(frames64, frames32):
+        report['rounded_rows_changed'] += int((frame64['predicted_remaining_days'] != frame32['predicted_remaining_days']).sum())
+        report['safety_changed'] += int((frame64['safety_classification'] != frame32['safety_classification']).sum())
+        report['severity_changed'] += int((frame64['severity'] != frame32['severity']).sum())
+
+    print(f"float32 vs float64 features on {args.rows} synthetic rows ({report['model']}, chunks of {args.chunk_size})\n")
+    print(f"Raw predictions changed:      {report['raw_rows_changed']} ({report['raw_rows_changed'] / args.rows:.4%})")
+    print(f"  Max abs error:              {report['raw_max_abs_error']:.4f} days")
+    print(f"  P99 abs error:              {report['raw_p99_abs_error']:.4f} days")
+    print(f"  Mean abs error:             {report['raw_mean_abs_error']:.6f} days")
+    print(f"Rounded predictions changed:  {report['rounded_rows_changed']}")
+    print(f"Safety classes changed:       {report['safety_changed']}")
+    print(f"Severity levels changed:      {report['severity_changed']}")
+    buffers = report['feature_buffer_mb_per_million']
+    print(f"\nFeature buffer per 1M rows:   {buffers['float64']:.0f} MB -> {buffers['float32']:.0f} MB")
+    print(f"Features + model time:        {time64:.2f}s -> {time32:.2f}s")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport saved to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
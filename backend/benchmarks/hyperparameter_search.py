@@ -0,0 +1,109 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import json
+import time
+import warnings
+
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.metrics import mean_absolute_error
+from sklearn.model_selection import train_test_split
+
+from src.preprocessing.preprocessor import DataPreprocessor
+from src.feature_engineering.engineer import FeatureEngineer
+from src.datasets.synthetic import SyntheticShelfLifeGenerator
+from src.models.predictor import PARAM_GRID
+from src.training.search import make_search, count_fits
+
+# The Random Forest space train_ultimate.py samples 300 candidates from
+ULTIMATE_RF_SPACE = {
+    'n_estimators': [100, 200, 300, 400, 500, 600, 800],
+    'max_depth': [10, 15, 20, 25, 30, None],
+    'min_samples_split': [2, 5, 10],
+    'min_samples_leaf': [1, 2, 4],
+    'max_features': ['sqrt', 'log2', None],
+    'bootstrap': [True, False]
+}
+
+
+def make_features(rows, seed):
+    df = SyntheticShelfLifeGenerator(seed=seed).generate(rows)
+    y = df.pop('remaining_shelf_life')
+    X = FeatureEngineer().transform(DataPreprocessor().fit_transform(df))
+    return X, y
+
+
+def run_search(name, space, mode, n_iter, resource, X_train, y_train, X_test, y_test, folds):
+    search = make_search(
+        RandomForestRegressor(random_state=42, n_jobs=-1), space, mode=mode, n_iter=n_iter, cv=folds,
+        resource=resource
+    )
+    start = time.perf_counter()
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        search.fit(X_train, y_train)
+    elapsed = time.perf_counter() - start
+    return {
+        'search': name,
+        'mode': mode if resource is None else f'{mode} ({resource})',
+        'candidates': len(search.cv_results_['params']) if mode == 'full' else search.n_candidates_[0],
+        'fits': count_fits(search),
+        'seconds': elapsed,
+        'cv_mae': -search.best_score_,
+        'test_mae': mean_absolute_error(y_test, search.best_estimator_.predict(X_test)),
+        'best_params': search.best_params_
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare successive halving with the full hyperparameter searches')
+    parser.add_argument('--rows', type=int, default=2000, help='Synthetic training rows')
+    parser.add_argument('--n-iter', type=int, default=20,
+                        help='Candidates for the train_ultimate.py Random Forest space (the script uses 300)')
+    parser.add_argument('--folds', type=int, default=5)
+    parser.add_argument('--searches', default='grid,random', help='grid: ShelfLifePredictor grid, random: train_ultimate RF space')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help='Write the results as JSON to this file')
+    args = parser.parse_args()
+
+    X, y = make_features(args.rows, args.seed)
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+
+    # Same candidates and folds for each mode; halving spends trees or
+    # samples on them in rounds instead of fitting every one in full
+    plans = {
+        'grid': ('predictor grid', PARAM_GRID, None),
+        'random': ('ultimate RF', ULTIMATE_RF_SPACE, args.n_iter)
+    }
+    results = []
+    for search in args.searches.split(','):
+        name, space, n_iter = plans[search]
+        full = None
+        for mode, resource in [('full', None), ('halving', 'n_estimators'), ('halving', 'n_samples')]:
+            result = run_search(name, space, mode, n_iter, resource, X_train, y_train, X_test, y_test, args.folds)
+            full = full or result
+            result['speedup'] = full['seconds'] / result['seconds']
+            result['test_mae_change'] = result['test_mae'] / full['test_mae'] - 1
+            results.append(result)
+            print(f"  {name} / {result['mode']}: {result['seconds']:.1f}s")
+
+    print(f"\n{len(X_train)} training rows, {len(X_test)} test rows, {args.folds}-fold CV\n")
+    print(f"{'Search':<16} {'mode':<24} {'cands':<6} {'fits':<6} {'time (s)':<9} {'speedup':<8} "
+          f"{'CV MAE':<8} {'test MAE':<9} {'vs full':<8}")
+    print("-" * 100)
+    for result in results:
+        print(f"{result['search']:<16} {result['mode']:<24} {result['candidates']:<6} {result['fits']:<6} "
+              f"{result['seconds']:<9.1f} {result['speedup']:<8.1f} {result['cv_mae']:<8.3f} "
+              f"{result['test_mae']:<9.3f} {result['test_mae_change']:+.1%}")
+    print("\nCV MAE of halving searches is measured at the budget of their last round.")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'rows': args.rows, 'folds': args.folds, 'results': results}, f, indent=2, default=str)
+        print(f"Results saved to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import json
+import subprocess
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY_MODULES = ['sklearn', 'scipy', 'requests', 'httpx', 'flask']
+ENTRY_MODULES = {'api', 'src', 'site', 'encodings'}
+
+SCENARIOS = {
+    'import api': 'import api',
+    'import src.inference.runtime': 'import src.inference.runtime',
+    'runtime load + predict_single': (
+        "from src.inference.runtime import load_inference_pipeline\n"
+        "pipeline = load_inference_pipeline(models_dir=MODELS_DIR)\n"
+        "pipeline.predict_single('dairy', 4.0, 60.0, 'refrigerator', 3.0)"
+    )
+}
+
+REPORT = (
+    "import json, sys\n"
+    "print(json.dumps({name: name in sys.modules for name in HEAVY_MODULES}))"
+)
+
+
+def parse_importtime(stderr):
+    # Lines look like "import time:  self [us] | cumulative | imported package",
+    # with nesting shown by indentation of the package column. Top-level
+    # imports add up to the total cost; for the per-package breakdown the
+    # outermost import of each root package carries its full cumulative time.
+    total_us = 0
+    packages = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        if name.startswith(' ') and not name.startswith('  '):
+            total_us += int(cumulative)
+        root = name.strip().split('.')[0]
+        if root not in ENTRY_MODULES:
+            packages[root] = max(packages.get(root, 0), int(cumulative))
+    return total_us, sorted(packages.items(), key=lambda item: item[1], reverse=True)
+
+
+def run_scenario(code, models_dir):
+    script = f"MODELS_DIR = {models_dir!r}\nHEAVY_MODULES = {HEAVY_MODULES!r}\n{code}\n{REPORT}"
+    start = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', script],
+        cwd=BACKEND_DIR, check=True, capture_output=True, text=True
+    )
+    wall_time = time.perf_counter() - start
+
+    total_us, packages = parse_importtime(completed.stderr)
+    return {
+        'wall_s': wall_time,
+        'import_ms': total_us / 1000,
+        'top_imports': [(name, us / 1000) for name, us in packages[:5]],
+        'loaded': json.loads(completed.stdout.strip().splitlines()[-1])
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure interpreter import time of the inference entry points')
+    parser.add_argument('--models-dir', default='models')
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--output', help='Write results as JSON to this file')
+    parser.add_argument('--baseline', help='JSON file from a previous --output run to compare against')
+    args = parser.parse_args()
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    results = {}
+    print(f"{'Scenario':<32} {'import (ms)':<12} {'wall (s)':<10} {'vs baseline':<12} heavy modules loaded")
+    print("-" * 100)
+    for name, code in SCENARIOS.items():
+        runs = [run_scenario(code, os.path.abspath(args.models_dir)) for _ in range(args.repeats)]
+        best = min(runs, key=lambda r: r['import_ms'])
+        results[name] = best
+
+        delta = ''
+        if baseline and name in baseline:
+            delta = f"{best['import_ms'] / baseline[name]['import_ms']:.2f}x"
+        loaded = ', '.join(module for module, present in best['loaded'].items() if present) or '-'
+        print(f"{name:<32} {best['import_ms']:<12.1f} {best['wall_s']:<10.3f} {delta:<12} {loaded}")
+
+    print("\nHeaviest packages (including their dependencies):")
+    for name, result in results.items():
+        top = ', '.join(f"{module} {ms:.0f} ms" for module, ms in result['top_imports'])
+        print(f"  {name}: {top}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults saved to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,177 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import json
+import random
+import subprocess
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict
+
+import numpy as np
+
+from benchmarks.predict_single import sample_requests
+from benchmarks.async_serving import serve_flask, serve_asgi, wait_for_server
+from benchmarks.stubs import add_stub_arguments, start_stubs
+
+DEFAULT_MIX = 'predict=60,explain=10,batch_predict=10,chat=8,chat/prediction_explanation=4,chat/storage_advice=4,voice/explain=4'
+
+
+def build_payload(route, item, batch_items):
+    if route == 'batch_predict':
+        return {'items': batch_items}
+    if route == 'chat':
+        return {'message': f"How long does {item['food_type']} last in the {item['storage_type']}?"}
+    if route == 'chat/storage_advice':
+        return {
+            'food_type': item['food_type'],
+            'storage_conditions': {key: item[key] for key in ('storage_type', 'temperature', 'humidity')}
+        }
+    return item
+
+
+def send(url, payload, timeout):
+    request = urllib.request.Request(
+        url, data=json.dumps(payload).encode(), headers={'Content-Type': 'application/json'}
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            response.read()
+            return response.status
+    except urllib.error.HTTPError as e:
+        e.read()
+        return e.code
+
+
+def parse_mix(value):
+    mix = {}
+    for part in value.split(','):
+        route, weight = part.split('=')
+        mix[route.strip().strip('/')] = float(weight)
+    return mix
+
+
+def run_load(base_url, mix, clients, duration, batch_size, timeout, seed):
+    routes = list(mix)
+    weights = [mix[route] for route in routes]
+    items = sample_requests(5000, seed=seed)
+    stop = threading.Event()
+    lock = threading.Lock()
+    latencies = defaultdict(list)
+    statuses = defaultdict(lambda: defaultdict(int))
+
+    def client(index):
+        rng = random.Random(seed + index)
+        while not stop.is_set():
+            route = rng.choices(routes, weights)[0]
+            position = rng.randrange(len(items))
+            batch = [items[(position + i) % len(items)] for i in range(batch_size)]
+            payload = build_payload(route, items[position], batch)
+            start = time.perf_counter()
+            try:
+                status = send(f'{base_url}/{route}', payload, timeout)
+            except Exception as e:
+                status = type(e).__name__
+            elapsed = time.perf_counter() - start
+            with lock:
+                latencies[route].append(elapsed)
+                statuses[route][status] += 1
+
+    threads = [threading.Thread(target=client, args=(i,), daemon=True) for i in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join(timeout=timeout)
+    elapsed = time.perf_counter() - start
+
+    results = {}
+    for route in routes:
+        timings = np.array(latencies[route]) * 1000
+        if not len(timings):
+            continue
+        ok = sum(count for status, count in statuses[route].items() if isinstance(status, int) and status < 400)
+        results[route] = {
+            'requests': len(timings),
+            'rps': len(timings) / elapsed,
+            'p50_ms': float(np.percentile(timings, 50)),
+            'p90_ms': float(np.percentile(timings, 90)),
+            'p99_ms': float(np.percentile(timings, 99)),
+            'max_ms': float(timings.max()),
+            'error_rate': 1 - ok / len(timings),
+            'statuses': {str(status): count for status, count in sorted(statuses[route].items(), key=str)}
+        }
+    return results, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load-test the HTTP API with mixed traffic against local OpenRouter/ElevenLabs stubs')
+    parser.add_argument('--serve', choices=['flask', 'asgi'], help=argparse.SUPPRESS)
+    parser.add_argument('--server', choices=['flask', 'asgi'], default='asgi', help='Server to start for the test')
+    parser.add_argument('--url', help='Test an already running API instead of starting one (stubs are not started either)')
+    parser.add_argument('--port', type=int, default=5101)
+    parser.add_argument('--workers', type=int, default=4, help='Flask request threads / ASGI inference threads')
+    parser.add_argument('--mix', default=DEFAULT_MIX, help='Comma-separated route=weight pairs')
+    parser.add_argument('--clients', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=30.0)
+    parser.add_argument('--batch-size', type=int, default=100, help='Items per /batch_predict request')
+    parser.add_argument('--timeout', type=float, default=60.0)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help='Write results as JSON to this file')
+    add_stub_arguments(parser)
+    args = parser.parse_args()
+
+    if args.serve == 'flask':
+        return serve_flask(args.port, args.workers)
+    if args.serve == 'asgi':
+        return serve_asgi(args.port, args.workers)
+
+    mix = parse_mix(args.mix)
+    stubs, server = [], None
+    base_url = args.url.rstrip('/') if args.url else f'http://127.0.0.1:{args.port}'
+    try:
+        if not args.url:
+            stubs, stub_env = start_stubs(args)
+            server = subprocess.Popen(
+                [sys.executable, os.path.abspath(__file__), '--serve', args.server,
+                 '--port', str(args.port), '--workers', str(args.workers)],
+                cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                env=dict(os.environ, INFERENCE_ONLY='false', **stub_env),
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+            )
+        wait_for_server(base_url)
+        print(f"Load testing {base_url} with {args.clients} clients for {args.duration}s...")
+        results, elapsed = run_load(base_url, mix, args.clients, args.duration, args.batch_size, args.timeout, args.seed)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+        for stub in stubs:
+            stub.shutdown()
+
+    total = sum(stats['requests'] for stats in results.values())
+    print(f"\n{'Route':<30} {'requests':<10} {'req/s':<9} {'p50 (ms)':<10} {'p90 (ms)':<10} {'p99 (ms)':<10} {'errors':<8}")
+    print("-" * 90)
+    for route, stats in results.items():
+        print(f"{'/' + route:<30} {stats['requests']:<10} {stats['rps']:<9.1f} {stats['p50_ms']:<10.1f} "
+              f"{stats['p90_ms']:<10.1f} {stats['p99_ms']:<10.1f} {stats['error_rate']:<8.1%}")
+    print(f"\nTotal: {total} requests, {total / elapsed:.1f} req/s")
+    for route, stats in results.items():
+        if stats['error_rate'] > 0:
+            print(f"  /{route} responses: {stats['statuses']}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'server': args.url or args.server, 'clients': args.clients, 'mix': mix,
+                       'duration_s': elapsed, 'routes': results}, f, indent=2)
+        print(f"\nResults saved to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
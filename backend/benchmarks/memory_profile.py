@@ -0,0 +1,97 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import gc
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+
+from src.inference.runtime import load_inference_pipeline
+from benchmarks.predict_single import sample_requests
+
+REQUIRED_COLUMNS = ['food_type', 'temperature', 'humidity', 'storage_type', 'days_stored']
+
+
+def frame_features(pipeline, df):
+    # The DataFrame path the batch pipeline used before: copy the input,
+    # preprocess into a new frame, engineer features into another, then let
+    # the predictor select the model's columns
+    df = df.copy()
+    processed = pipeline.preprocessor.transform(df[REQUIRED_COLUMNS])
+    return pipeline.feature_engineer.transform(processed)
+
+
+def frame_predict(pipeline, df):
+    return pipeline.model.predict(frame_features(pipeline, df))
+
+
+def buffer_features(pipeline, df):
+    # Preprocessing and feature engineering of _model_predict(), without the model
+    buffer_columns, _ = pipeline._get_batch_layout()
+    features = np.empty((len(df), len(buffer_columns)), order='F')
+    column = dict(zip(pipeline.feature_engineer.get_feature_names(), buffer_columns))
+    inputs = tuple(features[:, column[name]] for name in REQUIRED_COLUMNS)
+    pipeline.preprocessor.transform_arrays(*(df[col].to_numpy() for col in REQUIRED_COLUMNS), out=inputs)
+    food, temperature, humidity, storage, days = inputs
+    pipeline.feature_engineer.transform_arrays(
+        food, storage, temperature, humidity, days, out=features, columns=buffer_columns
+    )
+    return features
+
+
+def buffer_predict(pipeline, df):
+    return pipeline._model_predict({col: df[col].to_numpy() for col in REQUIRED_COLUMNS})
+
+
+def profile(fn):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return peak, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Peak memory of the batch feature pipeline, DataFrame path vs preallocated buffer')
+    parser.add_argument('--models-dir', default='models')
+    parser.add_argument('--rows', type=int, default=1000000)
+    args = parser.parse_args()
+
+    pipeline = load_inference_pipeline(args.models_dir)
+    pipeline32 = load_inference_pipeline(args.models_dir, feature_dtype='float32')
+    df = pd.DataFrame(sample_requests(args.rows))
+    df['sku'] = np.arange(len(df))
+    input_mb = df.memory_usage(deep=True).sum() / 1e6
+
+    expected = frame_predict(pipeline, df)
+    if expected.tobytes() != buffer_predict(pipeline, df).tobytes():
+        raise AssertionError("Buffer pipeline predictions differ from the DataFrame pipeline")
+    float32_drift = np.abs(buffer_predict(pipeline32, df) - expected).max()
+
+    scenarios = [
+        ('features', 'before', lambda: frame_features(pipeline, df)),
+        ('features', 'after', lambda: buffer_features(pipeline, df)),
+        ('features + model', 'before', lambda: frame_predict(pipeline, df)),
+        ('features + model', 'after', lambda: buffer_predict(pipeline, df)),
+        ('features + model', 'float32', lambda: buffer_predict(pipeline32, df))
+    ]
+
+    per_million = 1e6 / args.rows
+    print(f"{args.rows} rows, input frame {input_mb:.0f} MB (peak memory is on top of the input)\n")
+    print(f"{'Stage':<18} {'path':<8} {'peak (MB)':<11} {'MB per 1M rows':<16} {'time (s)':<9}")
+    print("-" * 64)
+    for stage, path, fn in scenarios:
+        peak, elapsed = profile(fn)
+        print(f"{stage:<18} {path:<8} {peak / 1e6:<11.0f} {peak / 1e6 * per_million:<16.0f} {elapsed:<9.2f}")
+    print(f"\nfloat32 feature mode: max prediction difference {float32_drift:.4f} days")
+
+
+if __name__ == '__main__':
+    main()
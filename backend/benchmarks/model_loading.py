@@ -0,0 +1,88 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import json
+import subprocess
+import tempfile
+import time
+
+
+def read_status_mb():
+    fields = {}
+    with open('/proc/self/status') as f:
+        for line in f:
+            key, _, value = line.partition(':')
+            if key in ('VmRSS', 'RssAnon', 'RssFile'):
+                fields[key] = int(value.split()[0]) / 1024
+    return fields
+
+
+def measure(model_path, mmap_mode):
+    import numpy as np
+    from src.models.predictor import ShelfLifePredictor
+    from src.feature_engineering.engineer import FeatureEngineer
+
+    start = time.perf_counter()
+    predictor = ShelfLifePredictor().load(model_path, mmap_mode=mmap_mode)
+    load_time = time.perf_counter() - start
+
+    X = np.zeros((1, len(FeatureEngineer().get_feature_names())))
+    start = time.perf_counter()
+    predictor.predict_array(X)
+    first_predict_time = time.perf_counter() - start
+
+    memory = read_status_mb()
+    return {
+        'load_s': load_time,
+        'first_predict_s': first_predict_time,
+        'rss_mb': memory.get('VmRSS', 0.0),
+        'rss_anon_mb': memory.get('RssAnon', 0.0),
+        'rss_file_mb': memory.get('RssFile', 0.0)
+    }
+
+
+def run_isolated(model_path, mmap_mode):
+    command = [sys.executable, os.path.abspath(__file__), '--measure', model_path]
+    if mmap_mode:
+        command += ['--mmap-mode', mmap_mode]
+    output = subprocess.run(command, check=True, capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare cold-start time and RSS of model artifact formats')
+    parser.add_argument('model', nargs='?', default='models/shelf_life_predictor.pkl')
+    parser.add_argument('--measure', help=argparse.SUPPRESS)
+    parser.add_argument('--mmap-mode', default=None, help=argparse.SUPPRESS)
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+
+    if args.measure:
+        print(json.dumps(measure(args.measure, args.mmap_mode)))
+        return
+
+    from src.models.predictor import ShelfLifePredictor
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        converted = os.path.join(tmpdir, 'shelf_life_predictor.pkl')
+        ShelfLifePredictor().load(args.model).save(converted)
+
+        runs = {
+            'original file, joblib.load': (args.model, None),
+            'save() format, no mmap': (converted, None),
+            "save() format, mmap_mode='r'": (converted, 'r')
+        }
+
+        print(f"{'Artifact':<30} {'load (s)':<10} {'1st pred (s)':<13} {'RSS (MB)':<10} {'anon (MB)':<10} {'file (MB)':<10}")
+        print("-" * 86)
+        for name, (path, mmap_mode) in runs.items():
+            results = [run_isolated(path, mmap_mode) for _ in range(args.repeats)]
+            best = min(results, key=lambda r: r['load_s'])
+            print(f"{name:<30} {best['load_s']:<10.3f} {best['first_predict_s']:<13.4f} {best['rss_mb']:<10.1f} "
+                  f"{best['rss_anon_mb']:<10.1f} {best['rss_file_mb']:<10.1f}")
+
+
+if __name__ == '__main__':
+    main()
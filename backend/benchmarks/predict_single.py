@@ -0,0 +1,80 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import time
+import numpy as np
+
+from src.preprocessing.preprocessor import DataPreprocessor
+from src.feature_engineering.engineer import FeatureEngineer
+from src.models.predictor import ShelfLifePredictor
+from src.inference.pipeline import InferencePipeline
+from src.rules.interpreter import RuleBasedInterpreter
+
+
+def sample_requests(n, seed=42):
+    rng = np.random.default_rng(seed)
+    food_types = ['dairy', 'meat', 'vegetables', 'fruits', 'bakery', 'seafood']
+    storage_types = ['refrigerator', 'freezer', 'pantry']
+    return [
+        {
+            'food_type': food_types[rng.integers(len(food_types))],
+            'temperature': float(np.round(rng.uniform(-20, 35), 1)),
+            'humidity': float(np.round(rng.uniform(30, 95))),
+            'storage_type': storage_types[rng.integers(len(storage_types))],
+            'days_stored': float(rng.integers(0, 60))
+        }
+        for _ in range(n)
+    ]
+
+
+def time_calls(fn, requests):
+    latencies = []
+    for item in requests:
+        start = time.perf_counter()
+        fn(**item)
+        latencies.append(time.perf_counter() - start)
+    latencies = np.array(latencies) * 1000
+    return {
+        'p50_ms': float(np.percentile(latencies, 50)),
+        'p99_ms': float(np.percentile(latencies, 99)),
+        'mean_ms': float(latencies.mean())
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark InferencePipeline.predict_single')
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--models-dir', default='models')
+    args = parser.parse_args()
+
+    preprocessor = DataPreprocessor().load(os.path.join(args.models_dir, 'preprocessor.pkl'))
+    model = ShelfLifePredictor().load(os.path.join(args.models_dir, 'shelf_life_predictor.pkl'))
+    pipeline = InferencePipeline(preprocessor, FeatureEngineer(), model, RuleBasedInterpreter())
+
+    requests = sample_requests(args.requests)
+
+    for item in requests:
+        pipeline.fast_single = True
+        fast = pipeline.predict_single(**item)
+        pipeline.fast_single = False
+        slow = pipeline.predict_single(**item)
+        if fast != slow:
+            raise AssertionError(f"Fast path result differs for {item}: {fast} != {slow}")
+
+    pipeline.fast_single = False
+    dataframe_stats = time_calls(pipeline.predict_single, requests)
+    pipeline.fast_single = True
+    fast_stats = time_calls(pipeline.predict_single, requests)
+
+    print(f"{'Path':<12} {'p50 (ms)':<10} {'p99 (ms)':<10} {'mean (ms)':<10}")
+    print("-" * 44)
+    for name, stats in [('dataframe', dataframe_stats), ('fast', fast_stats)]:
+        print(f"{name:<12} {stats['p50_ms']:<10.3f} {stats['p99_ms']:<10.3f} {stats['mean_ms']:<10.3f}")
+    print(f"\np50 speedup: {dataframe_stats['p50_ms'] / fast_stats['p50_ms']:.1f}x")
+    print(f"p99 speedup: {dataframe_stats['p99_ms'] / fast_stats['p99_ms']:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,41 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import numpy as np
+import pandas as pd
+
+from src.preprocessing.preprocessor import DataPreprocessor
+from benchmarks.predict_single import sample_requests
+from benchmarks.tree_engine import best_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare the throughput of the compiled DataPreprocessor transform with sklearn')
+    parser.add_argument('--models-dir', default='models')
+    parser.add_argument('--batch-sizes', default='1,100,10000,1000000')
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+
+    preprocessor = DataPreprocessor().load(os.path.join(args.models_dir, 'preprocessor.pkl'))
+
+    batch_sizes = [int(size) for size in args.batch_sizes.split(',')]
+    requests = pd.DataFrame(sample_requests(max(batch_sizes)))
+    requests.loc[::97, 'temperature'] = np.nan
+    requests.loc[::89, 'food_type'] = 'pizza'
+
+    print(f"{'Rows':<9} {'sklearn (ms)':<14} {'compiled (ms)':<15} {'arrays (ms)':<13} {'speedup':<8} {'rows/s':<12}")
+    print("-" * 74)
+    for size in batch_sizes:
+        df = requests.iloc[:size]
+        columns = [df[col].to_numpy() for col in ['food_type', 'temperature', 'humidity', 'storage_type', 'days_stored']]
+        sklearn_time = best_time(lambda: preprocessor.transform_sklearn(df), args.repeats)
+        compiled_time = best_time(lambda: preprocessor.transform(df), args.repeats)
+        array_time = best_time(lambda: preprocessor.transform_arrays(*columns), args.repeats)
+        print(f"{size:<9} {sklearn_time * 1000:<14.2f} {compiled_time * 1000:<15.2f} {array_time * 1000:<13.2f} "
+              f"{sklearn_time / compiled_time:<8.1f} {size / compiled_time:<12.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,162 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CHAT_SENTENCE = 'Keep it refrigerated below 4°C and check it for smell and texture before eating. '
+
+
+class StubBehaviour:
+    def __init__(self, latency=0.5, jitter=0.0, error_rate=0.0, error_status=500, payload_bytes=1000, seed=None):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.payload_bytes = payload_bytes
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def draw(self):
+        # Latency is the base delay plus an exponential tail with mean
+        # `jitter`, which is closer to real API latency than a uniform spread
+        with self._lock:
+            delay = self.latency + (self._random.expovariate(1 / self.jitter) if self.jitter > 0 else 0)
+            failed = self._random.random() < self.error_rate
+        return delay, failed
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    behaviour = None
+
+    def send_body(self, status, body, content_type):
+        try:
+            self.send_response(status)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            # The API server was stopped while a request was in flight
+            pass
+
+    def simulate(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        delay, failed = self.behaviour.draw()
+        time.sleep(delay)
+        if failed:
+            body = json.dumps({'error': {'message': 'Stub upstream error', 'code': self.behaviour.error_status}})
+            self.send_body(self.behaviour.error_status, body.encode(), 'application/json')
+        return not failed
+
+    def log_message(self, format, *args):
+        pass
+
+
+class OpenRouterStubHandler(StubHandler):
+    # POST /chat/completions with the OpenRouter (OpenAI-compatible) response shape
+    def do_POST(self):
+        if self.path.rstrip('/') != '/chat/completions':
+            return self.send_body(404, b'{"error": {"message": "Not found"}}', 'application/json')
+        if not self.simulate():
+            return
+
+        repeats = self.behaviour.payload_bytes // len(CHAT_SENTENCE) + 1
+        content = (CHAT_SENTENCE * repeats)[:self.behaviour.payload_bytes]
+        body = json.dumps({
+            'id': 'stub-completion',
+            'object': 'chat.completion',
+            'model': 'stub',
+            'choices': [{'index': 0, 'message': {'role': 'assistant', 'content': content}, 'finish_reason': 'stop'}],
+            'usage': {'prompt_tokens': 0, 'completion_tokens': len(content) // 4, 'total_tokens': len(content) // 4}
+        })
+        self.send_body(200, body.encode(), 'application/json')
+
+
+class ElevenLabsStubHandler(StubHandler):
+    # POST /text-to-speech/<voice_id> returning `payload_bytes` of fake MP3,
+    # and GET /voices
+    def do_POST(self):
+        if not self.path.startswith('/text-to-speech/'):
+            return self.send_body(404, b'{"detail": "Not found"}', 'application/json')
+        if not self.simulate():
+            return
+        self.send_body(200, b'\xff\xfb' + b'\x00' * max(0, self.behaviour.payload_bytes - 2), 'audio/mpeg')
+
+    def do_GET(self):
+        if self.path.rstrip('/') != '/voices':
+            return self.send_body(404, b'{"detail": "Not found"}', 'application/json')
+        if not self.simulate():
+            return
+        body = json.dumps({'voices': [{'voice_id': '21m00Tcm4TlvDq8ikWAM', 'name': 'Stub'}]})
+        self.send_body(200, body.encode(), 'application/json')
+
+
+def start_stub(handler, port, behaviour):
+    handler = type(handler.__name__, (handler,), {'behaviour': behaviour})
+    server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def start_openrouter_stub(port, behaviour):
+    return start_stub(OpenRouterStubHandler, port, behaviour)
+
+
+def start_elevenlabs_stub(port, behaviour):
+    return start_stub(ElevenLabsStubHandler, port, behaviour)
+
+
+def add_stub_arguments(parser):
+    parser.add_argument('--openrouter-port', type=int, default=5199)
+    parser.add_argument('--elevenlabs-port', type=int, default=5198)
+    parser.add_argument('--chat-latency', type=float, default=0.5, help='Base OpenRouter latency in seconds')
+    parser.add_argument('--voice-latency', type=float, default=0.8, help='Base ElevenLabs latency in seconds')
+    parser.add_argument('--jitter', type=float, default=0.1, help='Mean of the extra exponential latency in seconds')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Share of stub responses that fail')
+    parser.add_argument('--error-status', type=int, default=500)
+    parser.add_argument('--chat-bytes', type=int, default=800, help='Length of each chat completion')
+    parser.add_argument('--audio-bytes', type=int, default=60000, help='Size of each text-to-speech response')
+    parser.add_argument('--stub-seed', type=int, default=None)
+
+
+def start_stubs(args):
+    chat = StubBehaviour(args.chat_latency, args.jitter, args.error_rate, args.error_status, args.chat_bytes,
+                         args.stub_seed)
+    voice = StubBehaviour(args.voice_latency, args.jitter, args.error_rate, args.error_status, args.audio_bytes,
+                          args.stub_seed)
+    servers = [start_openrouter_stub(args.openrouter_port, chat), start_elevenlabs_stub(args.elevenlabs_port, voice)]
+    env = {
+        'OPENROUTER_BASE_URL': f'http://127.0.0.1:{args.openrouter_port}',
+        'OPENROUTER_API_KEY': 'stub',
+        'ELEVENLABS_BASE_URL': f'http://127.0.0.1:{args.elevenlabs_port}',
+        'ELEVENLABS_API_KEY': 'stub'
+    }
+    return servers, env
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run local stand-ins for the OpenRouter and ElevenLabs APIs')
+    add_stub_arguments(parser)
+    args = parser.parse_args()
+
+    servers, env = start_stubs(args)
+    print("Stubs running. Point the API at them with:")
+    for name, value in env.items():
+        print(f"  {name}={value}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        for server in servers:
+            server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,177 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import json
+import platform
+import time
+import numpy as np
+import pandas as pd
+
+from src.preprocessing.preprocessor import DataPreprocessor
+from src.feature_engineering.engineer import FeatureEngineer
+from src.models.predictor import ShelfLifePredictor
+from src.inference.pipeline import InferencePipeline
+from src.rules.interpreter import RuleBasedInterpreter
+from benchmarks.predict_single import sample_requests
+
+STAGES = ['preprocess', 'feature_engineering', 'model', 'rules', 'pipeline']
+
+
+def time_runs(fn, min_repeats, min_time, max_repeats):
+    # Warm-up call first (lazy unpickling, engine compilation, buffers), then
+    # repeat until both the repeat count and the time budget are met
+    fn()
+    timings = []
+    total = 0.0
+    while len(timings) < max_repeats and (len(timings) < min_repeats or total < min_time):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        timings.append(elapsed)
+        total += elapsed
+    timings = np.array(timings) * 1000
+    return {
+        'repeats': len(timings),
+        'min_ms': float(timings.min()),
+        'median_ms': float(np.median(timings)),
+        'p95_ms': float(np.percentile(timings, 95)),
+        'mean_ms': float(timings.mean())
+    }
+
+
+def stage_calls(pipeline, df):
+    # Each stage gets the output of the previous one, prepared up front, so
+    # the timings cover that stage alone
+    processed = pipeline.preprocessor.transform(df)
+    featured = pipeline.feature_engineer.transform(processed)
+    predictions = pipeline.model.predict(featured)
+
+    interpreter = pipeline.rule_interpreter
+    food_codes = interpreter.encode_food_types(df['food_type'].astype(str).to_numpy())
+    storage_codes = interpreter.encode_storage_types(df['storage_type'].astype(str).to_numpy())
+    temperature = df['temperature'].to_numpy()
+    humidity = df['humidity'].to_numpy()
+    days_stored = df['days_stored'].to_numpy()
+
+    return {
+        'preprocess': lambda: pipeline.preprocessor.transform(df),
+        'feature_engineering': lambda: pipeline.feature_engineer.transform(processed),
+        'model': lambda: pipeline.model.predict(featured),
+        'rules': lambda: interpreter.evaluate_batch(
+            food_codes, storage_codes, temperature, humidity, days_stored, predictions
+        ),
+        'pipeline': lambda: pipeline.predict(df)
+    }
+
+
+def environment(predictor):
+    import sklearn
+
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'sklearn': sklearn.__version__,
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'model': type(predictor.model).__name__
+    }
+
+
+def compare(results, baseline, threshold, statistic='median_ms'):
+    # A stage regresses when its latency grows by more than the threshold;
+    # sizes or stages missing from either run are skipped
+    regressions = []
+    for size, stages in results.items():
+        for stage, stats in stages.items():
+            previous = baseline.get(size, {}).get(stage)
+            if previous is None:
+                continue
+            ratio = stats[statistic] / previous[statistic]
+            stats['vs_baseline'] = ratio
+            if ratio > 1 + threshold:
+                regressions.append((size, stage, previous[statistic], stats[statistic], ratio))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark each inference stage and the full pipeline across batch sizes')
+    parser.add_argument('--models-dir', default='models')
+    parser.add_argument('--batch-sizes', default='1,10,100,1000,10000,100000,1000000')
+    parser.add_argument('--stages', default=','.join(STAGES))
+    parser.add_argument('--min-repeats', type=int, default=5)
+    parser.add_argument('--max-repeats', type=int, default=1000)
+    parser.add_argument('--min-time', type=float, default=1.0, help='Seconds to keep repeating each measurement for')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help='Write results as JSON to this file')
+    parser.add_argument('--baseline', help='JSON file from a previous --output run to compare against')
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help='Allowed slowdown against the baseline before failing (0.10 = 10%%)')
+    parser.add_argument('--statistic', choices=['median_ms', 'min_ms', 'p95_ms'], default='median_ms',
+                        help='Timing compared against the baseline; min_ms is the least noisy on shared machines')
+    args = parser.parse_args()
+
+    stages = args.stages.split(',')
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        parser.error(f"Unknown stages: {', '.join(sorted(unknown))} (choose from {', '.join(STAGES)})")
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    preprocessor = DataPreprocessor().load(os.path.join(args.models_dir, 'preprocessor.pkl'))
+    model = ShelfLifePredictor().load(os.path.join(args.models_dir, 'shelf_life_predictor.pkl'))
+    # No cache, lookup table or metrics: every call does the full work
+    pipeline = InferencePipeline(preprocessor, FeatureEngineer(), model, RuleBasedInterpreter())
+
+    batch_sizes = [int(size) for size in args.batch_sizes.split(',')]
+    requests = pd.DataFrame(sample_requests(max(batch_sizes), seed=args.seed))
+    env = environment(model)
+    print(f"Model: {env['model']}, {env['cpus']} CPUs, Python {env['python']}, sklearn {env['sklearn']}")
+
+    results = {}
+    print(f"\n{'Rows':<9} {'Stage':<21} {'median (ms)':<13} {'p95 (ms)':<12} {'rows/s':<14} {'runs':<6} {'vs baseline':<11}")
+    print("-" * 90)
+    for size in batch_sizes:
+        df = requests.iloc[:size].reset_index(drop=True)
+        calls = stage_calls(pipeline, df)
+        results[str(size)] = {}
+        for stage in stages:
+            stats = time_runs(calls[stage], args.min_repeats, args.min_time, args.max_repeats)
+            stats['rows_per_s'] = size / (stats['median_ms'] / 1000)
+            results[str(size)][stage] = stats
+
+            delta = ''
+            previous = baseline['results'].get(str(size), {}).get(stage) if baseline else None
+            if previous:
+                delta = f"{stats[args.statistic] / previous[args.statistic]:.2f}x"
+            print(f"{size:<9} {stage:<21} {stats['median_ms']:<13.3f} {stats['p95_ms']:<12.3f} "
+                  f"{stats['rows_per_s']:<14.0f} {stats['repeats']:<6} {delta:<11}")
+
+    regressions = []
+    if baseline:
+        regressions = compare(results, baseline['results'], args.threshold, args.statistic)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'environment': env, 'statistic': args.statistic, 'threshold': args.threshold,
+                       'results': results}, f, indent=2)
+        print(f"\nResults saved to {args.output}")
+
+    if baseline:
+        if baseline.get('environment') != env:
+            print("\nWarning: baseline was recorded in a different environment; comparisons may not be meaningful")
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}:")
+            for size, stage, before, after, ratio in regressions:
+                print(f"  {stage} @ {size} rows: {before:.3f} ms -> {after:.3f} ms ({ratio:.2f}x)")
+            sys.exit(1)
+        print(f"\nNo regressions beyond {args.threshold:.0%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import time
+import pandas as pd
+
+from src.preprocessing.preprocessor import DataPreprocessor
+from src.feature_engineering.engineer import FeatureEngineer
+from src.models.predictor import ShelfLifePredictor
+from benchmarks.predict_single import sample_requests
+
+
+def best_time(fn, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the flattened tree engine against sklearn')
+    parser.add_argument('--models-dir', default='models')
+    parser.add_argument('--batch-sizes', default='1,10,100,1000,10000,100000')
+    parser.add_argument('--repeats', type=int, default=5)
+    args = parser.parse_args()
+
+    preprocessor = DataPreprocessor().load(os.path.join(args.models_dir, 'preprocessor.pkl'))
+    predictor = ShelfLifePredictor().load(os.path.join(args.models_dir, 'shelf_life_predictor.pkl'))
+    engine = predictor.get_engine()
+    print(f"Model: {type(predictor.model).__name__} (native engine: {engine.is_native()})")
+
+    batch_sizes = [int(size) for size in args.batch_sizes.split(',')]
+    requests = pd.DataFrame(sample_requests(max(batch_sizes)))
+    features = FeatureEngineer().transform(preprocessor.transform(requests))[engine.feature_names]
+
+    print(f"\n{'Batch':<10} {'sklearn (ms)':<14} {'engine (ms)':<14} {'speedup':<10} {'rows/s (engine)':<16}")
+    print("-" * 66)
+    for size in batch_sizes:
+        X = features.iloc[:size]
+        X_values = X.to_numpy()
+
+        repeats = args.repeats if size < 100000 else 1
+        sklearn_time = best_time(lambda: predictor.model.predict(X), repeats)
+        engine_time = best_time(lambda: engine.predict(X_values), repeats)
+        print(f"{size:<10} {sklearn_time * 1000:<14.3f} {engine_time * 1000:<14.3f} "
+              f"{sklearn_time / engine_time:<10.1f} {size / engine_time:<16.0f}")
+
+
+if __name__ == '__main__':
+    main()
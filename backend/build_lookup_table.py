@@ -0,0 +1,55 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import argparse
+import time
+
+from src.preprocessing.preprocessor import DataPreprocessor
+from src.feature_engineering.engineer import FeatureEngineer
+from src.models.predictor import ShelfLifePredictor
+from src.inference.lookup_table import ShelfLifeLookupTable
+
+
+def parse_range(value):
+    start, stop, step = (float(part) for part in value.split(':'))
+    return start, stop, step
+
+
+def build_lookup_table():
+    parser = argparse.ArgumentParser(description='Sample the trained model onto a lookup-table grid')
+    parser.add_argument('--models-dir', default='models')
+    parser.add_argument('--output', default='models/lookup_table.pkl')
+    parser.add_argument('--temperature', type=parse_range, default=(-20.0, 40.0, 1.0), help='start:stop:step')
+    parser.add_argument('--humidity', type=parse_range, default=(0.0, 100.0, 2.5), help='start:stop:step')
+    parser.add_argument('--days', type=parse_range, default=(0.0, 200.0, 1.0), help='start:stop:step')
+    parser.add_argument('--validation-samples', type=int, default=20000)
+    args = parser.parse_args()
+
+    artifacts = [os.path.join(args.models_dir, 'shelf_life_predictor.pkl'),
+                 os.path.join(args.models_dir, 'preprocessor.pkl')]
+    model = ShelfLifePredictor().load(artifacts[0])
+    preprocessor = DataPreprocessor().load(artifacts[1])
+
+    print("Building lookup table...")
+    start = time.perf_counter()
+    table = ShelfLifeLookupTable(args.temperature, args.humidity, args.days).build(
+        preprocessor, FeatureEngineer(), model, validation_samples=args.validation_samples
+    )
+    print(f"Grid shape: {table.tables.shape} ({table.tables.nbytes / 1e6:.1f} MB)")
+    print(f"Build time: {time.perf_counter() - start:.1f}s")
+
+    if table.error_report:
+        report = table.error_report
+        print(f"\nInterpolation error vs model ({report['samples']} random points):")
+        print(f"  Max:  {report['max_abs_error']:.3f} days")
+        print(f"  P99:  {report['p99_abs_error']:.3f} days")
+        print(f"  Mean: {report['mean_abs_error']:.3f} days")
+
+    table.save(args.output, artifacts=artifacts)
+    print(f"\nLookup table saved: {args.output}")
+    return table
+
+
+if __name__ == '__main__':
+    build_lookup_table()
@@ -0,0 +1,48 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import argparse
+import time
+
+from src.datasets.synthetic import SyntheticShelfLifeGenerator
+from src.datasets.writers import ChunkWriter, is_parquet
+
+
+def generate_dataset():
+    parser = argparse.ArgumentParser(description='Generate a synthetic dataset with the food_shelf_life.csv schema')
+    parser.add_argument('output', help='Output file; written as Parquet if it ends in .parquet, CSV otherwise')
+    parser.add_argument('--rows', type=int, default=1000000)
+    parser.add_argument('--chunk-size', type=int, default=500000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--excursion-rate', type=float, default=0.1,
+                        help='Share of rows stored above their ideal temperature')
+    parser.add_argument('--noise', type=float, default=0.5, help='Standard deviation of the label noise in days')
+    args = parser.parse_args()
+
+    if is_parquet(args.output):
+        try:
+            import pyarrow
+        except ImportError:
+            parser.error("Parquet files need pyarrow (pip install pyarrow)")
+
+    generator = SyntheticShelfLifeGenerator(seed=args.seed, excursion_rate=args.excursion_rate, noise=args.noise)
+
+    print(f"Generating {args.rows} rows (seed {args.seed}) in chunks of {args.chunk_size}...")
+    writer = ChunkWriter(args.output)
+    start = time.perf_counter()
+    rows = 0
+    try:
+        for chunk in generator.chunks(args.rows, args.chunk_size):
+            writer.write(chunk)
+            rows += len(chunk)
+            elapsed = time.perf_counter() - start
+            print(f"  {rows} rows written ({rows / elapsed:.0f} rows/s)")
+    finally:
+        writer.close()
+
+    print(f"\nDataset saved to: {args.output}")
+
+
+if __name__ == '__main__':
+    generate_dataset()
@@ -0,0 +1,101 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import argparse
+import multiprocessing
+import time
+from collections import deque
+
+import pandas as pd
+
+from src.inference.runtime import load_inference_pipeline
+from src.datasets.writers import ChunkWriter, is_parquet
+from src.models.execution import ExecutionPolicy
+
+worker_pipeline = None
+
+
+def read_chunks(path, chunk_size):
+    if is_parquet(path):
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunk_size)
+
+
+def init_worker(models_dir, lookup_table, workers, feature_dtype='float64'):
+    global worker_pipeline
+    # Each worker process gets its share of the cores for sklearn's threads
+    worker_pipeline = load_inference_pipeline(
+        models_dir, lookup_table=lookup_table, execution_policy=ExecutionPolicy(workers=workers),
+        feature_dtype=feature_dtype
+    )
+
+
+def score_chunk(chunk):
+    results = worker_pipeline.predict_frame(chunk)
+    return pd.concat([chunk, results], axis=1)
+
+
+def score_chunks(chunks, workers, models_dir, lookup_table, feature_dtype='float64'):
+    if workers <= 1:
+        init_worker(models_dir, lookup_table, 1, feature_dtype)
+        for chunk in chunks:
+            yield score_chunk(chunk)
+        return
+
+    # At most two chunks per worker are in flight, so memory stays bounded
+    # however large the input is, and results are collected in submission
+    # order so the output rows line up with the input.
+    with multiprocessing.Pool(workers, initializer=init_worker, initargs=(models_dir, lookup_table, workers, feature_dtype)) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.apply_async(score_chunk, (chunk,)))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().get()
+        while pending:
+            yield pending.popleft().get()
+
+
+def score():
+    parser = argparse.ArgumentParser(description='Score an inventory CSV or Parquet file in chunks')
+    parser.add_argument('input', help='CSV or Parquet (.parquet) file with food_type, temperature, humidity, storage_type and days_stored columns')
+    parser.add_argument('output', help='Output file; written as Parquet if it ends in .parquet, CSV otherwise')
+    parser.add_argument('--models-dir', default='models')
+    parser.add_argument('--lookup-table', default=None, help='Lookup table file built by build_lookup_table.py')
+    parser.add_argument('--chunk-size', type=int, default=50000)
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--float32', action='store_true',
+                        help='Build features in float32 (half the memory; see benchmarks/float32_drift.py)')
+    args = parser.parse_args()
+
+    if is_parquet(args.input) or is_parquet(args.output):
+        try:
+            import pyarrow
+        except ImportError:
+            parser.error("Parquet files need pyarrow (pip install pyarrow)")
+
+    print(f"Scoring {args.input} with {args.workers} worker(s), {args.chunk_size} rows per chunk...")
+    writer = ChunkWriter(args.output)
+    start = time.perf_counter()
+    rows = 0
+    try:
+        for scored in score_chunks(read_chunks(args.input, args.chunk_size), args.workers,
+                                   args.models_dir, args.lookup_table, 'float32' if args.float32 else 'float64'):
+            writer.write(scored)
+            rows += len(scored)
+            elapsed = time.perf_counter() - start
+            print(f"  {rows} rows scored ({rows / elapsed:.0f} rows/s)")
+    finally:
+        writer.close()
+
+    elapsed = time.perf_counter() - start
+    print(f"\nScored {rows} rows in {elapsed:.1f}s ({rows / elapsed if elapsed else 0:.0f} rows/s)")
+    print(f"Results saved to: {args.output}")
+
+
+if __name__ == '__main__':
+    score()
@@ -0,0 +1,193 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import argparse
+import gc
+import signal
+import socket
+import time
+
+from werkzeug.serving import ThreadedWSGIServer
+
+import api
+from src.inference.batcher import PredictionBatcher
+
+
+WARMUP_ITEMS = [
+    {'food_type': 'dairy', 'temperature': 4.0, 'humidity': 65.0, 'storage_type': 'refrigerator', 'days_stored': 2.0},
+    {'food_type': 'meat', 'temperature': -18.0, 'humidity': 60.0, 'storage_type': 'freezer', 'days_stored': 30.0},
+    {'food_type': 'bakery', 'temperature': 22.0, 'humidity': 55.0, 'storage_type': 'pantry', 'days_stored': 3.0}
+]
+
+
+def large_batch():
+    # More rows than the flat engine handles, so the batch goes through the
+    # sklearn estimator
+    rows = api.pipeline.model.engine_max_batch + 1
+    return (WARMUP_ITEMS * (rows // len(WARMUP_ITEMS) + 1))[:rows]
+
+
+def read_memory(pid):
+    fields = {}
+    try:
+        with open(f'/proc/{pid}/smaps_rollup') as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) >= 2 and parts[0].endswith(':') and parts[1].isdigit():
+                    fields[parts[0][:-1]] = int(parts[1]) / 1024
+    except OSError:
+        return None
+
+    return {
+        'rss_mb': fields.get('Rss', 0.0),
+        'pss_mb': fields.get('Pss', 0.0),
+        'shared_mb': fields.get('Shared_Clean', 0.0) + fields.get('Shared_Dirty', 0.0),
+        'private_mb': fields.get('Private_Clean', 0.0) + fields.get('Private_Dirty', 0.0)
+    }
+
+
+def print_memory_report(parent_pid, worker_pids):
+    print(f"\n{'Process':<16} {'RSS (MB)':<10} {'Shared (MB)':<12} {'Private (MB)':<13} {'PSS (MB)':<10}")
+    print("-" * 63)
+    total_pss = 0.0
+    for name, pid in [('parent', parent_pid)] + [(f'worker {pid}', pid) for pid in worker_pids]:
+        memory = read_memory(pid)
+        if memory is None:
+            print(f"{name:<16} unavailable")
+            continue
+        total_pss += memory['pss_mb']
+        print(f"{name:<16} {memory['rss_mb']:<10.1f} {memory['shared_mb']:<12.1f} "
+              f"{memory['private_mb']:<13.1f} {memory['pss_mb']:<10.1f}")
+    print(f"Total PSS: {total_pss:.1f} MB")
+    sys.stdout.flush()
+
+
+def load_and_warm():
+    api.load_pipeline()
+    if api.pipeline is None:
+        raise RuntimeError("Pipeline failed to load")
+
+    # Compile the tree engine and lookup tables, and unpickle the sklearn
+    # estimator that large batches use, in the parent so workers inherit
+    # them instead of building private copies.
+    api.pipeline.model.get_engine()
+    api.pipeline.model.model
+    api.pipeline.predict(WARMUP_ITEMS)
+    api.pipeline.predict(large_batch())
+    for item in WARMUP_ITEMS:
+        api.pipeline.predict_single(**item)
+    if api.pipeline.cache is not None:
+        api.pipeline.cache.clear()
+
+    # Threads do not survive fork, so each worker starts its own batcher
+    batcher_settings = None
+    if api.batcher is not None:
+        batcher_settings = (api.batcher.max_wait, api.batcher.max_batch_size)
+        api.batcher.close()
+        api.batcher = None
+
+    gc.collect()
+    # Keep the loaded objects out of future collections so the garbage
+    # collector does not write to (and un-share) their pages in the workers.
+    gc.freeze()
+    return batcher_settings
+
+
+def run_worker(listener, batcher_settings, ready):
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+
+    # Serve one large batch before reporting ready, so the memory report
+    # shows what the sklearn path costs each worker
+    try:
+        api.pipeline.predict(large_batch())
+    finally:
+        os.write(ready, b'1')
+
+    if batcher_settings is not None:
+        max_wait, max_batch_size = batcher_settings
+        api.batcher = PredictionBatcher(api.pipeline, max_wait=max_wait, max_batch_size=max_batch_size)
+
+    host, port = listener.getsockname()[:2]
+    server = ThreadedWSGIServer(host, port, api.app, fd=listener.fileno())
+    server.serve_forever()
+
+
+def spawn_worker(listener, batcher_settings, ready):
+    pid = os.fork()
+    if pid == 0:
+        try:
+            run_worker(listener, batcher_settings, ready)
+        finally:
+            os._exit(0)
+    return pid
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Pre-fork API server sharing one loaded model across workers')
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=int(os.getenv('PORT', 5001)))
+    parser.add_argument('--workers', type=int, default=int(os.getenv('WEB_WORKERS') or os.cpu_count() or 1))
+    parser.add_argument('--report-interval', type=float, default=0,
+                        help='Seconds between memory reports (0 reports once after startup)')
+    args = parser.parse_args()
+
+    if not hasattr(os, 'fork'):
+        raise SystemExit("serve.py needs os.fork(); use api.py or asgi.py on this platform")
+
+    # The model's thread budget is this machine's cores split across the
+    # workers actually forked (api.py reads WEB_WORKERS when it loads)
+    os.environ['WEB_WORKERS'] = str(args.workers)
+    batcher_settings = load_and_warm()
+
+    listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    listener.bind((args.host, args.port))
+    listener.listen(1024)
+
+    ready_read, ready_write = os.pipe()
+    workers = set(spawn_worker(listener, batcher_settings, ready_write) for _ in range(args.workers))
+    print(f"Serving on http://{args.host}:{args.port} with {args.workers} workers")
+
+    stopping = False
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in workers:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    warmed = 0
+    while warmed < len(workers):
+        warmed += len(os.read(ready_read, len(workers) - warmed))
+    print_memory_report(os.getpid(), sorted(workers))
+    next_report = time.time() + args.report_interval if args.report_interval else None
+
+    while workers:
+        try:
+            pid, status = os.waitpid(-1, os.WNOHANG)
+        except ChildProcessError:
+            break
+
+        if pid:
+            workers.discard(pid)
+            if not stopping:
+                print(f"Worker {pid} exited with status {status}, restarting")
+                workers.add(spawn_worker(listener, batcher_settings, ready_write))
+            continue
+
+        if next_report and time.time() >= next_report:
+            print_memory_report(os.getpid(), sorted(workers))
+            next_report = time.time() + args.report_interval
+        time.sleep(0.5)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,126 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import numpy as np
+import pandas as pd
+
+from src.preprocessing.preprocessor import DataPreprocessor
+from src.feature_engineering.engineer import FeatureEngineer
+
+TARGET_COLUMN = 'remaining_shelf_life'
+CACHE_FORMAT = 1
+HASH_BLOCK_SIZE = 1 << 20
+
+
+def read_training_data(filepaths, deduplicate=False):
+    dfs = [pd.read_csv(filepath) for filepath in filepaths]
+    df = pd.concat(dfs, ignore_index=True) if len(dfs) > 1 else dfs[0]
+    if deduplicate:
+        df = df.drop_duplicates()
+    return df.drop(TARGET_COLUMN, axis=1), df[TARGET_COLUMN]
+
+
+def build_features(filepaths, deduplicate=False):
+    X, y = read_training_data(filepaths, deduplicate)
+    preprocessor = DataPreprocessor()
+    X_processed = preprocessor.fit_transform(X)
+    feature_engineer = FeatureEngineer()
+    return feature_engineer.transform(X_processed), y, preprocessor, feature_engineer
+
+
+class FeatureCache:
+    # Engineered training features on disk, keyed on the bytes of the input
+    # CSVs and the preprocessor and feature engineer versions. Each entry is
+    # a directory holding the column-major feature matrix, target and index
+    # as .npy files, loaded memory-mapped, plus the fitted preprocessor the
+    # training scripts save next to the model.
+    def __init__(self, cache_dir='data/feature_cache', mmap_mode='r'):
+        self.cache_dir = cache_dir
+        self.mmap_mode = mmap_mode
+
+    def make_key(self, filepaths, deduplicate=False):
+        digest = hashlib.sha256()
+        digest.update(json.dumps({
+            'format': CACHE_FORMAT,
+            'preprocessor': DataPreprocessor.VERSION,
+            'feature_engineer': FeatureEngineer.VERSION,
+            'files': len(filepaths),
+            'deduplicate': deduplicate
+        }, sort_keys=True).encode())
+        for filepath in filepaths:
+            file_digest = hashlib.sha256()
+            with open(filepath, 'rb') as f:
+                for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b''):
+                    file_digest.update(block)
+            digest.update(file_digest.digest())
+        return digest.hexdigest()
+
+    def load(self, key):
+        path = os.path.join(self.cache_dir, key)
+        if not os.path.exists(os.path.join(path, 'meta.json')):
+            return None
+
+        with open(os.path.join(path, 'meta.json')) as f:
+            meta = json.load(f)
+        X = np.load(os.path.join(path, 'X.npy'), mmap_mode=self.mmap_mode)
+        index = pd.Index(np.load(os.path.join(path, 'index.npy')))
+        y = pd.Series(np.load(os.path.join(path, 'y.npy'), mmap_mode=self.mmap_mode), index=index,
+                      name=meta['target'], copy=False)
+        X_featured = pd.DataFrame({
+            col: X[:, j].astype(dtype, copy=False) for j, (col, dtype) in enumerate(zip(meta['columns'], meta['dtypes']))
+        }, index=index, copy=False)
+        preprocessor = DataPreprocessor().load(os.path.join(path, 'preprocessor.pkl'))
+        return X_featured, y, preprocessor, FeatureEngineer()
+
+    def save(self, key, X_featured, y, preprocessor):
+        # Written to a temporary directory and renamed into place, so
+        # concurrent runs never see a partial entry
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp = tempfile.mkdtemp(prefix=f'.{key}.', dir=self.cache_dir)
+        try:
+            np.save(os.path.join(tmp, 'X.npy'), np.asfortranarray(X_featured.to_numpy(dtype=np.float64)))
+            np.save(os.path.join(tmp, 'y.npy'), y.to_numpy())
+            np.save(os.path.join(tmp, 'index.npy'), X_featured.index.to_numpy())
+            preprocessor.save(os.path.join(tmp, 'preprocessor.pkl'))
+            with open(os.path.join(tmp, 'meta.json'), 'w') as f:
+                json.dump({
+                    'columns': X_featured.columns.tolist(),
+                    'dtypes': [str(dtype) for dtype in X_featured.dtypes],
+                    'target': y.name,
+                    'rows': len(X_featured)
+                }, f, indent=2)
+            os.rename(tmp, os.path.join(self.cache_dir, key))
+        except OSError:
+            # Another run stored the same key first
+            shutil.rmtree(tmp, ignore_errors=True)
+            if not os.path.exists(os.path.join(self.cache_dir, key, 'meta.json')):
+                raise
+
+    def clear(self):
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+
+def load_features(filepaths, deduplicate=False, cache_dir=None):
+    # Engineered features, target, fitted preprocessor and feature engineer
+    # for one or more training CSVs (concatenated in order). Set
+    # FEATURE_CACHE_DIR to an empty string to always rebuild.
+    if isinstance(filepaths, str):
+        filepaths = [filepaths]
+    if cache_dir is None:
+        cache_dir = os.getenv('FEATURE_CACHE_DIR', 'data/feature_cache')
+    if not cache_dir:
+        return build_features(filepaths, deduplicate)
+
+    cache = FeatureCache(cache_dir)
+    key = cache.make_key(filepaths, deduplicate)
+    cached = cache.load(key)
+    if cached is not None:
+        print(f"Loaded cached features {key[:12]} ({len(cached[0])} rows)")
+        return cached
+
+    X_featured, y, preprocessor, feature_engineer = build_features(filepaths, deduplicate)
+    cache.save(key, X_featured, y, preprocessor)
+    print(f"Cached features {key[:12]} in {cache_dir}")
+    return X_featured, y, preprocessor, feature_engineer
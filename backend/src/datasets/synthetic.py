@@ -0,0 +1,127 @@
+import numpy as np
+import pandas as pd
+
+from src.feature_engineering.engineer import FeatureEngineer
+from src.rules.interpreter import RuleBasedInterpreter, FOOD_TYPES, STORAGE_TYPES, SEVERITY_FACTORS
+
+COLUMNS = ['food_type', 'temperature', 'humidity', 'storage_type', 'days_stored', 'remaining_shelf_life']
+
+# How often each storage type is used when the food keeps in it; storage
+# types where the food has no shelf life at all (dairy in the pantry) are rare
+STORAGE_WEIGHTS = {'refrigerator': 0.6, 'freezer': 0.25, 'pantry': 0.15}
+UNSUITABLE_STORAGE_WEIGHT = 0.03
+
+TEMPERATURE_SPREAD = {'refrigerator': 1.5, 'freezer': 3.0, 'pantry': 3.0}
+HUMIDITY_SPREAD = 7.0
+
+# Shelf life lost per degree above the storage type's ideal temperature
+TEMPERATURE_DECAY = {'refrigerator': 0.93, 'freezer': 0.97, 'pantry': 0.95}
+HUMIDITY_DECAY = 0.98
+
+BLOCK_SIZE = 65536
+
+
+class SyntheticShelfLifeGenerator:
+    def __init__(self, seed=42, excursion_rate=0.1, noise=0.5):
+        self.seed = seed
+        self.excursion_rate = excursion_rate
+        self.noise = noise
+        self.feature_engineer = FeatureEngineer()
+        self.rule_interpreter = RuleBasedInterpreter()
+        self._build_tables()
+        self._cached_block = (None, None)
+
+    def _build_tables(self):
+        base_shelf = self.feature_engineer.food_type_base_shelf
+        food_rules = self.rule_interpreter.food_rules
+        storage_rules = self.rule_interpreter.storage_rules
+
+        self.base_shelf = np.array(
+            [[base_shelf[food][storage] for storage in STORAGE_TYPES] for food in FOOD_TYPES], dtype=float
+        )
+        weights = np.where(self.base_shelf > 0, [STORAGE_WEIGHTS[storage] for storage in STORAGE_TYPES],
+                           UNSUITABLE_STORAGE_WEIGHT)
+        self.storage_cdf = np.cumsum(weights / weights.sum(axis=1, keepdims=True), axis=1)
+
+        self.ideal_temp = np.array([storage_rules[storage]['ideal_temp'] for storage in STORAGE_TYPES], dtype=float)
+        self.temp_spread = np.array([TEMPERATURE_SPREAD[storage] for storage in STORAGE_TYPES])
+        self.temp_decay = np.array([TEMPERATURE_DECAY[storage] for storage in STORAGE_TYPES])
+
+        # Typical humidity sits between the storage type's ideal and the
+        # highest humidity the food tolerates (fruit and vegetable drawers run
+        # humid, bread bins dry), keeping most rows inside the tolerance
+        ideal_humidity = np.array([storage_rules[storage]['ideal_humidity'] for storage in STORAGE_TYPES], dtype=float)
+        max_humidity = np.array([food_rules[food]['max_humidity'] for food in FOOD_TYPES], dtype=float)
+        self.max_humidity = max_humidity
+        self.humidity_mean = np.minimum((ideal_humidity[None, :] + max_humidity[:, None]) / 2, max_humidity[:, None] - 8)
+
+    def block(self, index):
+        # Every block of BLOCK_SIZE rows has its own seed, so row i of a
+        # dataset is the same whatever chunk size it is written with
+        if self._cached_block[0] == index:
+            return self._cached_block[1]
+
+        rng = np.random.default_rng([self.seed, index])
+        n = BLOCK_SIZE
+
+        food_codes = rng.integers(len(FOOD_TYPES), size=n)
+        storage_codes = (rng.random(n)[:, None] > self.storage_cdf[food_codes]).sum(axis=1)
+        storage_codes = np.minimum(storage_codes, len(STORAGE_TYPES) - 1)
+
+        temperature = self.ideal_temp[storage_codes] + rng.normal(0, 1, n) * self.temp_spread[storage_codes]
+        # Door left open, power cut, warm delivery van
+        excursion = rng.random(n) < self.excursion_rate
+        temperature[excursion] += rng.uniform(3, 15, excursion.sum())
+        temperature = np.round(temperature, 1)
+
+        humidity = self.humidity_mean[food_codes, storage_codes] + rng.normal(0, HUMIDITY_SPREAD, n)
+        humidity = np.clip(np.round(humidity), 20, 100)
+
+        base_shelf = self.base_shelf[food_codes, storage_codes]
+        days_stored = np.floor(rng.random(n) * (base_shelf + 1)).astype(np.int64)
+
+        # Warm or humid storage shortens the shelf life, and anything the rule
+        # interpreter flags loses the same share it does at inference time
+        warm_degrees = np.maximum(temperature - self.ideal_temp[storage_codes], 0)
+        humid_points = np.maximum(humidity - self.max_humidity[food_codes], 0)
+        _, severity = self.rule_interpreter.check_extreme_conditions_batch(
+            food_codes, storage_codes, temperature, humidity, days_stored
+        )
+        shelf_life = (
+            base_shelf * self.temp_decay[storage_codes] ** warm_degrees *
+            HUMIDITY_DECAY ** humid_points * SEVERITY_FACTORS[severity]
+        )
+        remaining = np.round(shelf_life - days_stored + rng.normal(0, self.noise, n))
+        # The collected data never goes further past expiry than a day
+        remaining = np.maximum(remaining, -1).astype(np.int64)
+
+        frame = pd.DataFrame({
+            'food_type': pd.Categorical.from_codes(food_codes, FOOD_TYPES).astype(str),
+            'temperature': temperature,
+            'humidity': humidity.astype(np.int64),
+            'storage_type': pd.Categorical.from_codes(storage_codes, STORAGE_TYPES).astype(str),
+            'days_stored': days_stored,
+            'remaining_shelf_life': remaining
+        }, columns=COLUMNS)
+        self._cached_block = (index, frame)
+        return frame
+
+    def rows(self, start, n_rows):
+        pieces = []
+        position = start
+        stop = start + n_rows
+        while position < stop:
+            index, offset = divmod(position, BLOCK_SIZE)
+            take = min(BLOCK_SIZE - offset, stop - position)
+            pieces.append(self.block(index).iloc[offset:offset + take])
+            position += take
+        if not pieces:
+            return pd.DataFrame(columns=COLUMNS)
+        return pd.concat(pieces, ignore_index=True) if len(pieces) > 1 else pieces[0].reset_index(drop=True)
+
+    def chunks(self, n_rows, chunk_size=100000):
+        for start in range(0, n_rows, chunk_size):
+            yield self.rows(start, min(chunk_size, n_rows - start))
+
+    def generate(self, n_rows):
+        return self.rows(0, n_rows)
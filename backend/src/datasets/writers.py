@@ -0,0 +1,26 @@
+def is_parquet(path):
+    return path.lower().endswith(('.parquet', '.pq'))
+
+
+class ChunkWriter:
+    def __init__(self, path):
+        self.path = path
+        self.parquet_writer = None
+        self.wrote_header = False
+
+    def write(self, df):
+        if is_parquet(self.path):
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            if self.parquet_writer is None:
+                self.parquet_writer = pq.ParquetWriter(self.path, table.schema)
+            self.parquet_writer.write_table(table)
+        else:
+            df.to_csv(self.path, mode='a' if self.wrote_header else 'w', header=not self.wrote_header, index=False)
+            self.wrote_header = True
+
+    def close(self):
+        if self.parquet_writer is not None:
+            self.parquet_writer.close()
@@ -1,8 +1,21 @@
 import pandas as pd
 import numpy as np
 
+FOOD_TYPE_LABELS = ['bakery', 'dairy', 'fruits', 'meat', 'seafood', 'vegetables']
+STORAGE_TYPE_LABELS = ['freezer', 'pantry', 'refrigerator']
+
+# Per storage type, in STORAGE_TYPE_LABELS order
+IDEAL_TEMPERATURES = np.array([-18.0, 20.0, 4.0])
+EXTREME_TEMPERATURES = np.array([-5.0, 30.0, 10.0])
+
+INPUT_COLUMNS = ['food_type', 'storage_type', 'temperature', 'humidity', 'days_stored']
+INTEGER_FEATURES = ['base_shelf_life', 'is_extreme_temp', 'is_extreme_humidity']
+
 
 class FeatureEngineer:
+    # Bump when the engineered features change, like DataPreprocessor.VERSION
+    VERSION = 1
+
     def __init__(self):
         self.food_type_base_shelf = {
             'dairy': {'refrigerator': 7, 'freezer': 90, 'pantry': 0},
@@ -13,6 +26,7 @@ class FeatureEngineer:
             'seafood': {'refrigerator': 2, 'freezer': 180, 'pantry': 0}
         }
         self.is_fitted = False
+        self._base_shelf_table = None
 
     def _get_food_type_label(self, food_type_encoded):
         food_types = ['bakery', 'dairy', 'fruits', 'meat', 'seafood', 'vegetables']
@@ -26,7 +40,108 @@ class FeatureEngineer:
             return storage_types[storage_type_encoded]
         return 'refrigerator'
 
+    def _get_base_shelf_table(self):
+        if self._base_shelf_table is None:
+            self._base_shelf_table = np.array([
+                [self.food_type_base_shelf.get(food, {}).get(storage, 7) for storage in STORAGE_TYPE_LABELS]
+                for food in FOOD_TYPE_LABELS
+            ], dtype=np.float64)
+        return self._base_shelf_table
+
+    def _decode_codes(self, codes, n_labels, default):
+        # Same mapping as _get_food_type_label/_get_storage_type_label: codes
+        # past the end of the label list fall back to the default label
+        codes = np.asarray(codes)
+        return np.where(codes < n_labels, codes, default).astype(np.intp)
+
+    def transform_arrays(self, food_type, storage_type, temperature, humidity, days_stored, out=None, columns=None):
+        # Array version of transform(): encoded categorical codes and
+        # preprocessed numeric arrays in, the get_feature_names() matrix out.
+        # Columns are filled in place in a column-major buffer, and every
+        # value is computed with the same floating-point operations in the
+        # same order as the pandas code, so results are bit-identical.
+        # `columns` gives the buffer column of each feature when the caller
+        # lays the buffer out in another order (the model's); inputs that
+        # already sit in their buffer columns are not copied.
+        n = len(temperature)
+        if out is None:
+            out = np.empty((n, len(self.get_feature_names())), dtype=np.float64, order='F')
+        if columns is None:
+            columns = range(len(self.get_feature_names()))
+
+        food_index = self._decode_codes(food_type, len(FOOD_TYPE_LABELS), FOOD_TYPE_LABELS.index('dairy'))
+        storage_index = self._decode_codes(storage_type, len(STORAGE_TYPE_LABELS), STORAGE_TYPE_LABELS.index('refrigerator'))
+
+        (food_col, storage_col, temp, hum, days, base, temp_dev, hum_dev, progress, degradation,
+         interaction, extreme_temp, extreme_humidity, remaining_ratio, temp_sq, hum_sq, product,
+         days_ratio) = (out[:, j] for j in columns)
+
+        for target, values in ((food_col, food_type), (storage_col, storage_type), (temp, temperature),
+                               (hum, humidity), (days, days_stored)):
+            if not np.may_share_memory(target, values):
+                target[:] = values
+
+        base[:] = self._get_base_shelf_table()[food_index, storage_index]
+        has_shelf = base > 0
+
+        np.subtract(temp, IDEAL_TEMPERATURES[storage_index], out=temp_dev)
+        np.abs(temp_dev, out=temp_dev)
+        np.subtract(hum, 65, out=hum_dev)
+        np.abs(hum_dev, out=hum_dev)
+
+        days_ratio.fill(1.0)
+        np.divide(days, base, out=days_ratio, where=has_shelf)
+        np.clip(days_ratio, 0, 2, out=progress)
+
+        remaining_ratio.fill(0.0)
+        np.subtract(base, days, out=remaining_ratio, where=has_shelf)
+        np.divide(remaining_ratio, base, out=remaining_ratio, where=has_shelf)
+
+        # (temp_dev / 10) * 0.5 + (hum_dev / 20) * 0.3 + progress * 0.2, with
+        # the other output columns as scratch space before they are filled
+        np.divide(temp_dev, 10, out=degradation)
+        degradation *= 0.5
+        np.divide(hum_dev, 20, out=interaction)
+        interaction *= 0.3
+        degradation += interaction
+        np.multiply(progress, 0.2, out=interaction)
+        degradation += interaction
+
+        np.multiply(temp, hum, out=product)
+        np.divide(product, 100, out=interaction)
+        np.multiply(temp, temp, out=temp_sq)
+        np.multiply(hum, hum, out=hum_sq)
+
+        is_fridge = storage_index == STORAGE_TYPE_LABELS.index('refrigerator')
+        extreme_temp[:] = (temp > EXTREME_TEMPERATURES[storage_index]) | (is_fridge & (temp < 0))
+        np.greater(hum, 90, out=extreme_humidity)
+
+        self.is_fitted = True
+        return out
+
     def transform(self, X):
+        has_codes = 'food_type' in X.columns and 'storage_type' in X.columns
+        if not has_codes or any(X[col].dtype.kind not in 'iu' for col in INPUT_COLUMNS[:2]) or \
+                any(col not in X.columns or X[col].dtype.kind != 'f' for col in INPUT_COLUMNS[2:]):
+            # Anything other than the preprocessor's output (integer codes,
+            # float numerics) goes through the column-by-column version so
+            # dtypes and edge cases stay exactly as they were
+            return self.transform_pandas(X)
+
+        features = self.transform_arrays(
+            X['food_type'].to_numpy(), X['storage_type'].to_numpy(), X['temperature'].to_numpy(),
+            X['humidity'].to_numpy(), X['days_stored'].to_numpy()
+        )
+        names = self.get_feature_names()
+        new_columns = {}
+        for j in range(len(INPUT_COLUMNS), len(names)):
+            values = features[:, j]
+            new_columns[names[j]] = values.astype(np.int64) if names[j] in INTEGER_FEATURES else values
+        return X.assign(**new_columns)
+
+    def transform_pandas(self, X):
+        # The original column-by-column implementation; transform_arrays()
+        # is checked against it by tests/test_feature_engineering.py
         X = X.copy()
 
         if 'food_type' in X.columns and 'storage_type' in X.columns:
@@ -98,6 +213,54 @@ class FeatureEngineer:
         self.is_fitted = True
         return X
 
+    def fill_row(self, out, food_type, storage_type, temperature, humidity, days_stored):
+        food_label = self._get_food_type_label(food_type)
+        storage_label = self._get_storage_type_label(storage_type)
+        base_shelf = self.food_type_base_shelf.get(food_label, {}).get(storage_label, 7)
+
+        if storage_label == 'refrigerator':
+            temp_deviation = abs(temperature - 4)
+        elif storage_label == 'freezer':
+            temp_deviation = abs(temperature - (-18))
+        else:
+            temp_deviation = abs(temperature - 20)
+
+        humidity_deviation = abs(humidity - 65)
+
+        if base_shelf > 0:
+            storage_days_ratio = days_stored / base_shelf
+            days_remaining_ratio = (base_shelf - days_stored) / base_shelf
+        else:
+            storage_days_ratio = 1.0
+            days_remaining_ratio = 0
+        storage_progress = min(max(storage_days_ratio, 0), 2)
+
+        is_extreme_temp = (
+            storage_label == 'refrigerator' and (temperature > 10 or temperature < 0) or
+            storage_label == 'freezer' and temperature > -5 or
+            storage_label == 'pantry' and temperature > 30
+        )
+
+        out[0] = food_type
+        out[1] = storage_type
+        out[2] = temperature
+        out[3] = humidity
+        out[4] = days_stored
+        out[5] = base_shelf
+        out[6] = temp_deviation
+        out[7] = humidity_deviation
+        out[8] = storage_progress
+        out[9] = (temp_deviation / 10) * 0.5 + (humidity_deviation / 20) * 0.3 + (storage_progress * 0.2)
+        out[10] = temperature * humidity / 100
+        out[11] = int(is_extreme_temp)
+        out[12] = int(humidity > 90)
+        out[13] = days_remaining_ratio
+        out[14] = temperature * temperature
+        out[15] = humidity * humidity
+        out[16] = temperature * humidity
+        out[17] = storage_days_ratio
+        return out
+
     def get_feature_names(self):
         return [
             'food_type', 'storage_type', 'temperature', 'humidity', 'days_stored',
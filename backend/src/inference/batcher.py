@@ -0,0 +1,140 @@
+import bisect
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+
+class PredictionBatcher:
+    def __init__(self, pipeline, max_wait=0.002, max_batch_size=64,
+                 wait_buckets_ms=(0.1, 0.25, 0.5, 1, 2, 5, 10, 25, 50, 100)):
+        self.pipeline = pipeline
+        self.max_wait = max_wait
+        self.max_batch_size = max_batch_size
+
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self.batch_size_counts = {}
+        self.wait_buckets_ms = list(wait_buckets_ms)
+        self.wait_bucket_counts = [0] * (len(self.wait_buckets_ms) + 1)
+        self.wait_sum_ms = 0.0
+        self.wait_max_ms = 0.0
+        self.requests = 0
+        self.batches = 0
+
+        self._thread = threading.Thread(target=self._run, name='prediction-batcher', daemon=True)
+        self._thread.start()
+
+    def predict_single(self, food_type, temperature, humidity, storage_type, days_stored, timeout=None):
+        cache = self.pipeline.cache
+        key = None
+        if cache is not None:
+            key = cache.make_key(food_type, temperature, humidity, storage_type, days_stored)
+            if key is not None:
+                result = cache.get(key)
+                if result is not None:
+                    return result
+
+        future = self.submit({
+            'food_type': food_type,
+            'temperature': temperature,
+            'humidity': humidity,
+            'storage_type': storage_type,
+            'days_stored': days_stored
+        })
+        result = future.result(timeout)
+
+        if key is not None:
+            cache.put(key, result)
+        return result
+
+    def submit(self, item):
+        future = Future()
+        self._queue.put((item, future, time.perf_counter()))
+        return future
+
+    def close(self):
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self):
+        while True:
+            entry = self._queue.get()
+            if entry is None:
+                return
+
+            batch = [entry]
+            deadline = time.perf_counter() + self.max_wait
+            closing = False
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    entry = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if entry is None:
+                    closing = True
+                    break
+                batch.append(entry)
+
+            self._process(batch)
+            if closing:
+                return
+
+    def _process(self, batch):
+        started = time.perf_counter()
+        self._record(len(batch), [(started - enqueued) * 1000 for _, _, enqueued in batch])
+
+        items = [item for item, _, _ in batch]
+        try:
+            results = self.pipeline.predict(items)
+            if isinstance(results, dict):
+                results = [results]
+        except Exception:
+            # Score items one by one so a single bad item only fails its own request
+            for item, future, _ in batch:
+                try:
+                    future.set_result(self.pipeline.predict(item))
+                except Exception as e:
+                    future.set_exception(e)
+            return
+
+        for (_, future, _), result in zip(batch, results):
+            future.set_result(result)
+
+    def _record(self, batch_size, waits_ms):
+        with self._lock:
+            self.batches += 1
+            self.requests += batch_size
+            self.batch_size_counts[batch_size] = self.batch_size_counts.get(batch_size, 0) + 1
+            for wait in waits_ms:
+                self.wait_bucket_counts[bisect.bisect_left(self.wait_buckets_ms, wait)] += 1
+                self.wait_sum_ms += wait
+                self.wait_max_ms = max(self.wait_max_ms, wait)
+
+    def stats(self):
+        with self._lock:
+            cumulative = []
+            total = 0
+            for count in self.wait_bucket_counts:
+                total += count
+                cumulative.append(total)
+
+            return {
+                'max_wait_ms': self.max_wait * 1000,
+                'max_batch_size': self.max_batch_size,
+                'requests': self.requests,
+                'batches': self.batches,
+                'mean_batch_size': self.requests / self.batches if self.batches else 0.0,
+                'batch_size_counts': dict(sorted(self.batch_size_counts.items())),
+                'queue_wait_ms': {
+                    'buckets': [
+                        {'le': bound, 'count': count}
+                        for bound, count in zip(self.wait_buckets_ms + ['+Inf'], cumulative)
+                    ],
+                    'mean': self.wait_sum_ms / self.requests if self.requests else 0.0,
+                    'max': self.wait_max_ms
+                }
+            }
@@ -0,0 +1,188 @@
+import numpy as np
+import pandas as pd
+import joblib
+import hashlib
+import os
+
+HASH_BLOCK_SIZE = 1 << 20
+
+
+def hash_artifacts(filepaths):
+    # Content hash of the model artifacts a table is sampled from; the order
+    # of the paths does not matter
+    file_digests = []
+    for filepath in filepaths:
+        digest = hashlib.sha256()
+        with open(filepath, 'rb') as f:
+            for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b''):
+                digest.update(block)
+        file_digests.append(digest.hexdigest())
+    return hashlib.sha256(''.join(sorted(file_digests)).encode()).hexdigest()
+
+
+class ShelfLifeLookupTable:
+    def __init__(self, temperature_range=(-20.0, 40.0, 1.0), humidity_range=(0.0, 100.0, 2.5),
+                 days_range=(0.0, 200.0, 1.0)):
+        self.axes = [
+            self._make_axis(*temperature_range),
+            self._make_axis(*humidity_range),
+            self._make_axis(*days_range)
+        ]
+        self.food_types = []
+        self.storage_types = []
+        self.food_codes = {}
+        self.storage_codes = {}
+        self.tables = None
+        self.error_report = None
+        self.artifact_hash = None
+
+    def _make_axis(self, start, stop, step):
+        size = int(round((stop - start) / step)) + 1
+        return (float(start), float(step), size)
+
+    def _axis_values(self, axis):
+        start, step, size = axis
+        return start + step * np.arange(size)
+
+    def _model_predict(self, preprocessor, feature_engineer, model, df):
+        return model.predict(feature_engineer.transform(preprocessor.transform(df)))
+
+    def build(self, preprocessor, feature_engineer, model, validation_samples=20000, random_state=42):
+        self.food_types = [str(c) for c in preprocessor.label_encoders['food_type'].classes_]
+        self.storage_types = [str(c) for c in preprocessor.label_encoders['storage_type'].classes_]
+        self.food_codes = {name: i for i, name in enumerate(self.food_types)}
+        self.storage_codes = {name: i for i, name in enumerate(self.storage_types)}
+
+        temps, hums, days = np.meshgrid(*[self._axis_values(axis) for axis in self.axes], indexing='ij')
+        grid_shape = temps.shape
+        self.tables = np.empty((len(self.food_types), len(self.storage_types)) + grid_shape, dtype=np.float32)
+
+        for i, food_type in enumerate(self.food_types):
+            for j, storage_type in enumerate(self.storage_types):
+                df = pd.DataFrame({
+                    'food_type': food_type,
+                    'temperature': temps.ravel(),
+                    'humidity': hums.ravel(),
+                    'storage_type': storage_type,
+                    'days_stored': days.ravel()
+                })
+                predictions = self._model_predict(preprocessor, feature_engineer, model, df)
+                self.tables[i, j] = predictions.reshape(grid_shape)
+
+        if validation_samples:
+            self.error_report = self.validate(
+                preprocessor, feature_engineer, model, validation_samples, random_state
+            )
+        return self
+
+    def validate(self, preprocessor, feature_engineer, model, n_samples=20000, random_state=42):
+        rng = np.random.default_rng(random_state)
+        df = pd.DataFrame({
+            'food_type': rng.choice(self.food_types, n_samples),
+            'temperature': rng.uniform(*self._axis_bounds(self.axes[0]), n_samples),
+            'humidity': rng.uniform(*self._axis_bounds(self.axes[1]), n_samples),
+            'storage_type': rng.choice(self.storage_types, n_samples),
+            'days_stored': rng.uniform(*self._axis_bounds(self.axes[2]), n_samples)
+        })
+
+        expected = self._model_predict(preprocessor, feature_engineer, model, df)
+        interpolated = self.predict_batch(
+            df['food_type'], df['temperature'], df['humidity'], df['storage_type'], df['days_stored']
+        )
+        errors = np.abs(interpolated - expected)
+
+        return {
+            'samples': int(n_samples),
+            'max_abs_error': float(errors.max()),
+            'mean_abs_error': float(errors.mean()),
+            'p99_abs_error': float(np.percentile(errors, 99))
+        }
+
+    def _axis_bounds(self, axis):
+        start, step, size = axis
+        return start, start + step * (size - 1)
+
+    def predict(self, food_type, temperature, humidity, storage_type, days_stored):
+        corners = []
+        for value, (start, step, size) in zip((temperature, humidity, days_stored), self.axes):
+            position = (float(value) - start) / step
+            if not 0 <= position <= size - 1:
+                return None
+            index = min(int(position), size - 2)
+            corners.append((index, position - index))
+
+        (i, fi), (j, fj), (k, fk) = corners
+        table = self.tables[
+            self.food_codes.get(str(food_type), 0),
+            self.storage_codes.get(str(storage_type), 0)
+        ]
+        cube = table[i:i + 2, j:j + 2, k:k + 2].tolist()
+
+        c00 = cube[0][0][0] + (cube[0][0][1] - cube[0][0][0]) * fk
+        c01 = cube[0][1][0] + (cube[0][1][1] - cube[0][1][0]) * fk
+        c10 = cube[1][0][0] + (cube[1][0][1] - cube[1][0][0]) * fk
+        c11 = cube[1][1][0] + (cube[1][1][1] - cube[1][1][0]) * fk
+        c0 = c00 + (c01 - c00) * fj
+        c1 = c10 + (c11 - c10) * fj
+        return c0 + (c1 - c0) * fi
+
+    def predict_batch(self, food_types, temperatures, humidities, storage_types, days_stored):
+        food_codes = pd.Series(np.asarray(food_types, dtype=str)).map(self.food_codes).fillna(0).to_numpy(dtype=np.intp)
+        storage_codes = pd.Series(np.asarray(storage_types, dtype=str)).map(self.storage_codes).fillna(0).to_numpy(dtype=np.intp)
+
+        indices = []
+        fractions = []
+        in_range = np.ones(len(food_codes), dtype=bool)
+        for values, (start, step, size) in zip((temperatures, humidities, days_stored), self.axes):
+            position = (np.asarray(values, dtype=float) - start) / step
+            in_range &= (position >= 0) & (position <= size - 1)
+            index = np.clip(np.floor(np.nan_to_num(position)), 0, size - 2).astype(np.intp)
+            indices.append(index)
+            fractions.append(position - index)
+
+        (i, j, k), (fi, fj, fk) = indices, fractions
+        table = self.tables
+
+        def corner(di, dj, dk):
+            return table[food_codes, storage_codes, i + di, j + dj, k + dk].astype(np.float64)
+
+        c00 = corner(0, 0, 0) + (corner(0, 0, 1) - corner(0, 0, 0)) * fk
+        c01 = corner(0, 1, 0) + (corner(0, 1, 1) - corner(0, 1, 0)) * fk
+        c10 = corner(1, 0, 0) + (corner(1, 0, 1) - corner(1, 0, 0)) * fk
+        c11 = corner(1, 1, 0) + (corner(1, 1, 1) - corner(1, 1, 0)) * fk
+        c0 = c00 + (c01 - c00) * fj
+        c1 = c10 + (c11 - c10) * fj
+        predictions = c0 + (c1 - c0) * fi
+
+        predictions[~in_range] = np.nan
+        return predictions
+
+    def save(self, filepath, artifacts=None):
+        # artifacts: paths of the predictor and preprocessor the table was
+        # built from, so load() can tell when they have been retrained
+        if artifacts:
+            self.artifact_hash = hash_artifacts(artifacts)
+        joblib.dump({
+            'axes': self.axes,
+            'food_types': self.food_types,
+            'storage_types': self.storage_types,
+            'tables': self.tables,
+            'error_report': self.error_report,
+            'artifact_hash': self.artifact_hash
+        }, f'{filepath}.tmp')
+        os.replace(f'{filepath}.tmp', filepath)
+
+    def load(self, filepath, mmap_mode=None, artifacts=None):
+        data = joblib.load(filepath, mmap_mode=mmap_mode)
+        artifact_hash = data.get('artifact_hash')
+        if artifacts and artifact_hash != hash_artifacts(artifacts):
+            raise ValueError(f"Lookup table {filepath} was not built from the current model artifacts")
+        self.artifact_hash = artifact_hash
+        self.axes = data['axes']
+        self.food_types = data['food_types']
+        self.storage_types = data['storage_types']
+        self.food_codes = {name: i for i, name in enumerate(self.food_types)}
+        self.storage_codes = {name: i for i, name in enumerate(self.storage_types)}
+        self.tables = data['tables']
+        self.error_report = data['error_report']
+        return self
@@ -0,0 +1,144 @@
+import bisect
+import threading
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+BATCH_SIZE_BUCKETS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 50000, 100000)
+
+
+def format_labels(names, values, extra=''):
+    pairs = []
+    for name, value in zip(names, values):
+        value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        pairs.append(f'{name}="{value}"')
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Histogram:
+    def __init__(self, name, help_text, buckets, label_names):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = list(buckets)
+        self.label_names = list(label_names)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self):
+        with self._lock:
+            snapshot = {labels: (list(counts), total, count) for labels, (counts, total, count) in self._series.items()}
+
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} histogram']
+        for label_values, (counts, total, count) in sorted(snapshot.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + [float('inf')], counts):
+                cumulative += bucket_count
+                labels = format_labels(self.label_names, label_values, f'le="{format_value(bound)}"')
+                lines.append(f'{self.name}_bucket{labels} {cumulative}')
+            labels = format_labels(self.label_names, label_values)
+            lines.append(f'{self.name}_sum{labels} {format_value(total)}')
+            lines.append(f'{self.name}_count{labels} {count}')
+        return lines
+
+
+class Counter:
+    def __init__(self, name, help_text, label_names):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = list(label_names)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount, *label_values):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def render(self):
+        with self._lock:
+            snapshot = dict(self._values)
+
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} counter']
+        for label_values, value in sorted(snapshot.items()):
+            lines.append(f'{self.name}{format_labels(self.label_names, label_values)} {format_value(value)}')
+        return lines
+
+
+def render_sample(name, help_text, metric_type, value):
+    return [f'# HELP {name} {help_text}', f'# TYPE {name} {metric_type}', f'{name} {format_value(value)}']
+
+
+class InferenceMetrics:
+    def __init__(self):
+        self.stage_duration = Histogram(
+            'shelf_life_stage_duration_seconds', 'Time spent in each inference stage',
+            LATENCY_BUCKETS, ['path', 'stage']
+        )
+        self.request_duration = Histogram(
+            'shelf_life_request_duration_seconds', 'HTTP request latency by route',
+            LATENCY_BUCKETS, ['route', 'method', 'status']
+        )
+        self.batch_size = Histogram(
+            'shelf_life_batch_size_rows', 'Rows per inference pipeline call',
+            BATCH_SIZE_BUCKETS, ['path']
+        )
+        self.rows_scored = Counter('shelf_life_rows_scored_total', 'Rows scored by the inference pipeline', ['path'])
+
+    def observe_stage(self, path, stage, seconds):
+        self.stage_duration.observe(seconds, path, stage)
+
+    def observe_batch(self, path, rows):
+        self.batch_size.observe(rows, path)
+        self.rows_scored.inc(rows, path)
+
+    def observe_request(self, route, method, status, seconds):
+        self.request_duration.observe(seconds, route, method, str(status))
+
+    def render(self, cache_stats=None, batcher_stats=None):
+        lines = []
+        for metric in (self.stage_duration, self.request_duration, self.batch_size, self.rows_scored):
+            lines.extend(metric.render())
+
+        if cache_stats is not None:
+            for key in ('hits', 'misses', 'evictions', 'expirations'):
+                lines.extend(render_sample(
+                    f'shelf_life_prediction_cache_{key}_total', f'Prediction cache {key}', 'counter', cache_stats[key]
+                ))
+            lines.extend(render_sample(
+                'shelf_life_prediction_cache_entries', 'Entries in the prediction cache', 'gauge', cache_stats['size']
+            ))
+
+        if batcher_stats is not None:
+            lines.extend(render_sample(
+                'shelf_life_batcher_requests_total', 'Requests coalesced by the batcher', 'counter', batcher_stats['requests']
+            ))
+            lines.extend(render_sample(
+                'shelf_life_batcher_batches_total', 'Batches run by the batcher', 'counter', batcher_stats['batches']
+            ))
+            # The batcher keeps its own queue-wait histogram in milliseconds
+            name = 'shelf_life_batcher_queue_wait_seconds'
+            lines.extend([f'# HELP {name} Time requests waited in the batcher queue', f'# TYPE {name} histogram'])
+            for bucket in batcher_stats['queue_wait_ms']['buckets']:
+                bound = '+Inf' if bucket['le'] == '+Inf' else format_value(bucket['le'] / 1000)
+                lines.append(f'{name}_bucket{{le="{bound}"}} {bucket["count"]}')
+            lines.append(f"{name}_sum {format_value(batcher_stats['queue_wait_ms']['mean'] * batcher_stats['requests'] / 1000)}")
+            lines.append(f"{name}_count {batcher_stats['requests']}")
+
+        return '\n'.join(lines) + '\n'
@@ -1,92 +1,328 @@
 import numpy as np
 import pandas as pd
 import os
+import threading
+import time
+
+from src.rules.interpreter import FOOD_TYPES, STORAGE_TYPES, SEVERITY_LEVELS, SAFETY_CLASSES
+
+# Rows per float64 block when features are stored as float32
+FEATURE_BLOCK_ROWS = 65536
 
 
 class InferencePipeline:
-    def __init__(self, preprocessor, feature_engineer, model, rule_interpreter):
+    def __init__(self, preprocessor, feature_engineer, model, rule_interpreter, fast_single=True, cache=None,
+                 lookup_table=None, metrics=None, feature_dtype=np.float64):
         self.preprocessor = preprocessor
         self.feature_engineer = feature_engineer
         self.model = model
         self.rule_interpreter = rule_interpreter
+        self.fast_single = fast_single
+        self.cache = cache
+        self.lookup_table = lookup_table
+        self.metrics = metrics
+        # float32 halves the batch feature buffer (see _model_predict)
+        self.feature_dtype = np.dtype(feature_dtype)
+        self._buffers = threading.local()
+        self._model_order = None
+        self._batch_layout = None
+
+    def reload(self, preprocessor=None, model=None, lookup_table=None):
+        if preprocessor is not None:
+            self.preprocessor = preprocessor
+        if model is not None:
+            self.model = model
+        if lookup_table is not None or preprocessor is not None or model is not None:
+            self.lookup_table = lookup_table
+        self._buffers = threading.local()
+        self._model_order = None
+        self._batch_layout = None
+        if self.cache is not None:
+            self.cache.clear()
+        return self
 
     def predict(self, input_data):
+        columns, predictions, food_codes, storage_codes, rules = self._evaluate(input_data)
+        start = time.perf_counter()
+        # Plain Python values for the result dicts, so they serialize as JSON
+        # (numpy integer scalars do not).
+        temperature_values = columns['temperature'].tolist()
+        humidity_values = columns['humidity'].tolist()
+        days_values = columns['days_stored'].tolist()
+
+        adjusted_predictions = rules['adjusted_prediction']
+        feature_importance = self.model.get_feature_importance(5)
+
+        results = []
+
+        for i, pred in enumerate(predictions):
+            food_type = FOOD_TYPES[food_codes[i]]
+            storage_type = STORAGE_TYPES[storage_codes[i]]
+            temperature = temperature_values[i]
+            humidity = humidity_values[i]
+
+            result = {
+                'food_type': food_type,
+                'storage_type': storage_type,
+                'temperature': temperature,
+                'humidity': humidity,
+                'days_stored': days_values[i],
+                'predicted_remaining_days': round(float(adjusted_predictions[i]), 2),
+                'raw_prediction': round(float(pred), 2),
+                'safety_classification': SAFETY_CLASSES[rules['safety'][i]],
+                'issues': self.rule_interpreter.describe_issues(
+                    rules['issue_mask'][i], food_type, temperature, humidity
+                ),
+                'severity': SEVERITY_LEVELS[rules['severity'][i]],
+                'recommendations': self.rule_interpreter.describe_recommendations(
+                    rules['recommendation_mask'][i]
+                ),
+                'feature_importance': dict(feature_importance)
+            }
+
+            results.append(result)
+
+        self._timed('batch', 'format', start)
+        if len(results) == 1:
+            return results[0]
+        return results
+
+    def predict_frame(self, input_data):
+        # Same scoring as predict(), returned as columns instead of one dict
+        # per row; issues and recommendations are joined with "; ".
+        columns, predictions, food_codes, storage_codes, rules = self._evaluate(input_data)
+
+        issue_masks = rules['issue_mask']
+        issues = np.full(len(predictions), '', dtype=object)
+        temperatures = columns['temperature'].tolist()
+        humidities = columns['humidity'].tolist()
+        for i in np.flatnonzero(issue_masks):
+            issues[i] = '; '.join(self.rule_interpreter.describe_issues(
+                issue_masks[i], FOOD_TYPES[food_codes[i]], temperatures[i], humidities[i]
+            ))
+
+        recommendation_masks = rules['recommendation_mask']
+        recommendation_text = {
+            mask: '; '.join(self.rule_interpreter.describe_recommendations(mask))
+            for mask in np.unique(recommendation_masks).tolist()
+        }
+
+        return pd.DataFrame({
+            'predicted_remaining_days': np.round(rules['adjusted_prediction'], 2),
+            'raw_prediction': np.round(predictions, 2),
+            'safety_classification': np.asarray(SAFETY_CLASSES, dtype=object)[rules['safety']],
+            'severity': np.asarray(SEVERITY_LEVELS, dtype=object)[rules['severity']],
+            'issues': issues,
+            'recommendations': [recommendation_text[mask] for mask in recommendation_masks.tolist()]
+        }, index=columns['temperature'].index)
+
+    def _evaluate(self, input_data):
         if isinstance(input_data, dict):
             df = pd.DataFrame([input_data])
         elif isinstance(input_data, list):
             df = pd.DataFrame(input_data)
         else:
-            df = input_data.copy()
+            df = input_data
 
+        # The caller's frame is only read: missing columns are filled in this
+        # dict rather than on a copy of the frame
         required_columns = ['food_type', 'temperature', 'humidity', 'storage_type', 'days_stored']
-        for col in required_columns:
-            if col not in df.columns:
-                df[col] = 0
+        columns = {
+            col: df[col] if col in df.columns else pd.Series(0, index=df.index)
+            for col in required_columns
+        }
 
-        df_processed = self.preprocessor.transform(df)
-        df_featured = self.feature_engineer.transform(df_processed)
+        if self.lookup_table is not None:
+            start = time.perf_counter()
+            predictions = self.lookup_table.predict_batch(
+                columns['food_type'], columns['temperature'], columns['humidity'],
+                columns['storage_type'], columns['days_stored']
+            )
+            self._timed('batch', 'lookup_table', start)
+            missing = np.isnan(predictions)
+            if missing.any():
+                predictions[missing] = self._model_predict(
+                    {col: values.to_numpy()[missing] for col, values in columns.items()}
+                )
+        else:
+            # Extra columns (ids, notes) are carried through but never reach the model
+            predictions = self._model_predict({col: values.to_numpy() for col, values in columns.items()})
 
-        predictions = self.model.predict(df_featured)
+        start = time.perf_counter()
+        food_codes = self.rule_interpreter.encode_food_types(columns['food_type'].astype(str).to_numpy())
+        storage_codes = self.rule_interpreter.encode_storage_types(columns['storage_type'].astype(str).to_numpy())
+        rules = self.rule_interpreter.evaluate_batch(
+            food_codes, storage_codes, columns['temperature'].to_numpy(), columns['humidity'].to_numpy(),
+            columns['days_stored'].to_numpy(), predictions
+        )
+        self._timed('batch', 'rules', start)
+        if self.metrics is not None:
+            self.metrics.observe_batch('batch', len(df))
+        return columns, predictions, food_codes, storage_codes, rules
 
-        results = []
+    def _model_predict(self, columns):
+        # One feature buffer per batch, laid out in the model's column order
+        # and column-major: the preprocessor and the feature engineer write
+        # their columns straight into it, and the model reads it as is.
+        buffer_columns, n_model_features = self._get_batch_layout()
+        n_rows = len(columns['temperature'])
+        features = np.empty((n_rows, len(buffer_columns)), dtype=self.feature_dtype, order='F')
 
-        for i, pred in enumerate(predictions):
-            food_type_str = str(df['food_type'].iloc[i])
-            storage_type_str = str(df['storage_type'].iloc[i])
-            
-            food_type = food_type_str if food_type_str in ['dairy', 'meat', 'vegetables', 'fruits', 'bakery', 'seafood'] else 'dairy'
-            storage_type = storage_type_str if storage_type_str in ['refrigerator', 'freezer', 'pantry'] else 'refrigerator'
-            
-            temperature = df['temperature'].iloc[i]
-            humidity = df['humidity'].iloc[i]
-            days_stored = df['days_stored'].iloc[i]
-
-            issues, severity = self.rule_interpreter.check_extreme_conditions(
-                food_type, storage_type, temperature, humidity, days_stored
-            )
+        if self.feature_dtype == np.float64:
+            durations = self._fill_features(columns, features)
+        else:
+            # Features are still computed in float64, a block at a time, and
+            # only stored in the narrower buffer. sklearn's trees round float64
+            # input to float32 the same way, so tree models predict exactly
+            # what they do on the float64 path.
+            block = np.empty((min(n_rows, FEATURE_BLOCK_ROWS), len(buffer_columns)), dtype=np.float64, order='F')
+            durations = [0.0, 0.0]
+            for start in range(0, n_rows, FEATURE_BLOCK_ROWS):
+                stop = min(start + FEATURE_BLOCK_ROWS, n_rows)
+                block_durations = self._fill_features(
+                    {col: values[start:stop] for col, values in columns.items()}, block[:stop - start]
+                )
+                features[start:stop] = block[:stop - start]
+                durations = [total + extra for total, extra in zip(durations, block_durations)]
 
-            adjusted_prediction = self.rule_interpreter.adjust_prediction(
-                pred, issues, severity, days_stored
-            )
+        if self.metrics is not None:
+            self.metrics.observe_stage('batch', 'preprocess', durations[0])
+            self.metrics.observe_stage('batch', 'feature_engineering', durations[1])
+        start = time.perf_counter()
+        predictions = self.model.predict_array(features[:, :n_model_features])
+        self._timed('batch', 'model', start)
+        return predictions
 
-            safety_class = self.rule_interpreter.classify_safety(
-                adjusted_prediction, days_stored, issues
-            )
+    def _fill_features(self, columns, features):
+        buffer_columns, _ = self._get_batch_layout()
+        column = dict(zip(self.feature_engineer.get_feature_names(), buffer_columns))
+        inputs = tuple(features[:, column[name]] for name in
+                       ('food_type', 'temperature', 'humidity', 'storage_type', 'days_stored'))
 
-            recommendations = self.rule_interpreter.get_recommendations(
-                food_type, storage_type, temperature, humidity, adjusted_prediction
-            )
+        start = time.perf_counter()
+        self.preprocessor.transform_arrays(
+            columns['food_type'], columns['temperature'], columns['humidity'], columns['storage_type'],
+            columns['days_stored'], out=inputs
+        )
+        preprocessed = time.perf_counter()
+        food_codes, temperature, humidity, storage_codes, days_stored = inputs
+        self.feature_engineer.transform_arrays(
+            food_codes, storage_codes, temperature, humidity, days_stored, out=features, columns=buffer_columns
+        )
+        return preprocessed - start, time.perf_counter() - preprocessed
 
-            result = {
+    def _get_batch_layout(self):
+        # Buffer column of each engineered feature: the model's features come
+        # first in the model's order, any it does not use after them
+        if self._batch_layout is None:
+            feature_names = self.feature_engineer.get_feature_names()
+            model_order = self.model.get_feature_order() or feature_names
+            order = list(model_order) + [name for name in feature_names if name not in model_order]
+            self._batch_layout = ([order.index(name) for name in feature_names], len(model_order))
+        return self._batch_layout
+
+    def _timed(self, path, stage, start):
+        # Records the time since start for one stage and returns the current
+        # time, so consecutive stages can be chained; free when metrics is None
+        now = time.perf_counter()
+        if self.metrics is not None:
+            self.metrics.observe_stage(path, stage, now - start)
+        return now
+
+    def predict_single(self, food_type, temperature, humidity, storage_type, days_stored):
+        if self.cache is None:
+            return self._predict_single(food_type, temperature, humidity, storage_type, days_stored)
+
+        key = self.cache.make_key(food_type, temperature, humidity, storage_type, days_stored)
+        if key is None:
+            return self._predict_single(food_type, temperature, humidity, storage_type, days_stored)
+
+        result = self.cache.get(key)
+        if result is None:
+            result = self._predict_single(food_type, temperature, humidity, storage_type, days_stored)
+            self.cache.put(key, result)
+        return result
+
+    def _predict_single(self, food_type, temperature, humidity, storage_type, days_stored):
+        if not self.fast_single:
+            input_data = {
                 'food_type': food_type,
-                'storage_type': storage_type,
                 'temperature': temperature,
                 'humidity': humidity,
-                'days_stored': days_stored,
-                'predicted_remaining_days': round(float(adjusted_prediction), 2),
-                'raw_prediction': round(float(pred), 2),
-                'safety_classification': safety_class,
-                'issues': issues,
-                'severity': severity,
-                'recommendations': recommendations,
-                'feature_importance': self.model.get_feature_importance(5)
+                'storage_type': storage_type,
+                'days_stored': days_stored
             }
+            return self.predict(input_data)
 
-            results.append(result)
+        pred = None
+        start = time.perf_counter()
+        if self.lookup_table is not None:
+            pred = self.lookup_table.predict(food_type, temperature, humidity, storage_type, days_stored)
+            start = self._timed('single', 'lookup_table', start)
 
-        if len(results) == 1:
-            return results[0]
-        return results
+        if pred is None:
+            features, model_input = self._get_row_buffers()
+            food_code, temp_scaled, humidity_scaled, storage_code, days_scaled = self.preprocessor.transform_row(
+                food_type, temperature, humidity, storage_type, days_stored
+            )
+            start = self._timed('single', 'preprocess', start)
+            self.feature_engineer.fill_row(
+                features, food_code, storage_code, temp_scaled, humidity_scaled, days_scaled
+            )
+            model_input[0] = features[self._model_order]
+            start = self._timed('single', 'feature_engineering', start)
+            pred = self.model.predict_array(model_input)[0]
+            start = self._timed('single', 'model', start)
 
-    def predict_single(self, food_type, temperature, humidity, storage_type, days_stored):
-        input_data = {
+        food_type = str(food_type)
+        storage_type = str(storage_type)
+        food_type = food_type if food_type in FOOD_TYPES else 'dairy'
+        storage_type = storage_type if storage_type in STORAGE_TYPES else 'refrigerator'
+
+        issues, severity = self.rule_interpreter.check_extreme_conditions(
+            food_type, storage_type, temperature, humidity, days_stored
+        )
+        adjusted_prediction = self.rule_interpreter.adjust_prediction(
+            pred, issues, severity, days_stored
+        )
+        safety_class = self.rule_interpreter.classify_safety(
+            adjusted_prediction, days_stored, issues
+        )
+        recommendations = self.rule_interpreter.get_recommendations(
+            food_type, storage_type, temperature, humidity, adjusted_prediction
+        )
+        start = self._timed('single', 'rules', start)
+
+        result = {
             'food_type': food_type,
+            'storage_type': storage_type,
             'temperature': temperature,
             'humidity': humidity,
-            'storage_type': storage_type,
-            'days_stored': days_stored
+            'days_stored': days_stored,
+            'predicted_remaining_days': round(float(adjusted_prediction), 2),
+            'raw_prediction': round(float(pred), 2),
+            'safety_classification': safety_class,
+            'issues': issues,
+            'severity': severity,
+            'recommendations': recommendations,
+            'feature_importance': self.model.get_feature_importance(5)
         }
-        return self.predict(input_data)
+        self._timed('single', 'format', start)
+        if self.metrics is not None:
+            self.metrics.observe_batch('single', 1)
+        return result
+
+    def _get_row_buffers(self):
+        if self._model_order is None:
+            feature_names = self.feature_engineer.get_feature_names()
+            model_order = self.model.get_feature_order() or feature_names
+            self._model_order = np.array([feature_names.index(name) for name in model_order])
+
+        buffers = self._buffers
+        if not hasattr(buffers, 'features'):
+            buffers.features = np.zeros(len(self.feature_engineer.get_feature_names()), dtype=np.float64)
+            buffers.model_input = np.zeros((1, len(self._model_order)), dtype=np.float64)
+        return buffers.features, buffers.model_input
 
     def explain_prediction(self, result):
         explanation = []
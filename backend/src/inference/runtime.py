@@ -0,0 +1,29 @@
+import os
+
+from src.preprocessing.preprocessor import DataPreprocessor
+from src.feature_engineering.engineer import FeatureEngineer
+from src.models.predictor import ShelfLifePredictor
+from src.inference.pipeline import InferencePipeline
+from src.rules.interpreter import RuleBasedInterpreter
+
+
+# Inference-only entry point: everything imported here avoids sklearn and
+# the HTTP service clients at import time, so CLI scoring and short-lived
+# processes start without the training stack. sklearn is still imported on
+# demand by code paths that need the fitted estimators (large batches that
+# miss the lookup table, or models the flat engine cannot compile).
+def load_inference_pipeline(models_dir='models', mmap_mode='r', lookup_table=None, execution_policy=None,
+                            **pipeline_kwargs):
+    preprocessor = DataPreprocessor().load(os.path.join(models_dir, 'preprocessor.pkl'), mmap_mode=mmap_mode)
+    model = ShelfLifePredictor(execution_policy=execution_policy).load(
+        os.path.join(models_dir, 'shelf_life_predictor.pkl'), mmap_mode=mmap_mode
+    )
+
+    if isinstance(lookup_table, str):
+        from src.inference.lookup_table import ShelfLifeLookupTable
+        lookup_table = ShelfLifeLookupTable().load(lookup_table, mmap_mode=mmap_mode)
+
+    return InferencePipeline(
+        preprocessor, FeatureEngineer(), model, RuleBasedInterpreter(),
+        lookup_table=lookup_table, **pipeline_kwargs
+    )
@@ -0,0 +1,94 @@
+import json
+import shutil
+import tempfile
+
+NDJSON_MIMETYPE = 'application/x-ndjson'
+
+
+class NDJSONPredictionStream:
+    def __init__(self, pipeline, chunk_size=1000, dumps=json.dumps):
+        self.pipeline = pipeline
+        self.chunk_size = chunk_size
+        self.dumps = dumps
+        self.line_number = 0
+        self.rows = []
+
+    def add(self, line):
+        # Buffers one input line and returns a full chunk of parsed rows once
+        # chunk_size rows are pending, otherwise None.
+        self.line_number += 1
+        row = self.parse(self.line_number, line)
+        if row is not None:
+            self.rows.append(row)
+        if len(self.rows) >= self.chunk_size:
+            return self.flush()
+        return None
+
+    def flush(self):
+        rows, self.rows = self.rows, []
+        return rows
+
+    def parse(self, line_number, line):
+        if isinstance(line, bytes):
+            line = line.decode('utf-8', errors='replace')
+        line = line.strip()
+        if not line:
+            return None
+        try:
+            item = json.loads(line)
+        except ValueError as e:
+            return line_number, None, f"Invalid JSON: {e}"
+        if not isinstance(item, dict):
+            return line_number, None, "Each line must be a JSON object"
+        return line_number, item, None
+
+    def score(self, rows):
+        # Scores one chunk of parsed rows and returns the encoded output lines,
+        # one per input row in input order. If the chunk fails as a whole, the
+        # rows are retried one by one so a single bad row only fails itself.
+        valid = [row for row in rows if row[2] is None]
+        results = {}
+        if valid:
+            try:
+                predictions = self.pipeline.predict([item for _, item, _ in valid])
+                if isinstance(predictions, dict):
+                    predictions = [predictions]
+                for (line_number, _, _), result in zip(valid, predictions):
+                    results[line_number] = result
+            except Exception:
+                for line_number, item, _ in valid:
+                    try:
+                        results[line_number] = self.pipeline.predict([item])
+                    except Exception as e:
+                        results[line_number] = {'line': line_number, 'error': str(e)}
+
+        output = []
+        for line_number, _, error in rows:
+            result = results[line_number] if error is None else {'line': line_number, 'error': error}
+            output.append((self.dumps(result) + '\n').encode('utf-8'))
+        return output
+
+    def stream_upload(self, body):
+        # The upload is spooled to a temporary file before any results are
+        # written. Most HTTP clients only read the response once the request
+        # body is sent, so streaming results while the body is still arriving
+        # would deadlock on large uploads once the socket buffers fill.
+        upload = tempfile.TemporaryFile()
+        shutil.copyfileobj(body, upload)
+        return self.stream_file(upload)
+
+    def stream_file(self, upload):
+        try:
+            upload.seek(0)
+            yield from self.stream(upload)
+        finally:
+            upload.close()
+
+    def stream(self, lines):
+        for line in lines:
+            rows = self.add(line)
+            if rows:
+                yield b''.join(self.score(rows))
+        rows = self.flush()
+        if rows:
+            yield b''.join(self.score(rows))
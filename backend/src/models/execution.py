@@ -0,0 +1,77 @@
+import math
+import os
+import threading
+from contextlib import contextmanager
+
+import numpy as np
+from joblib import parallel_config
+
+# Fitted sub-estimators of sklearn meta-estimators, plus the estimators that
+# FlatTreeEnsemble blocks fall back to
+NESTED_ESTIMATOR_ATTRIBUTES = [
+    'estimators_', 'final_estimator_', 'best_estimator_', 'estimator_', 'steps',
+    'root', 'members', 'estimator', 'final_estimator'
+]
+
+
+class ExecutionPolicy:
+    def __init__(self, max_threads=None, workers=1, min_rows_per_job=5000):
+        self.max_threads = max_threads or os.cpu_count() or 1
+        self.workers = workers
+        self.min_rows_per_job = min_rows_per_job
+        self._active = 0
+        self._lock = threading.Lock()
+
+    def thread_budget(self, active=1):
+        # The cores are shared by every worker process on the machine and by
+        # every prediction running concurrently inside this one.
+        return max(1, self.max_threads // max(1, self.workers * active))
+
+    def n_jobs_for(self, n_rows, active=1):
+        jobs = math.ceil(n_rows / self.min_rows_per_job) if self.min_rows_per_job else self.max_threads
+        return max(1, min(self.thread_budget(active), jobs))
+
+    @contextmanager
+    def limit(self, n_rows):
+        with self._lock:
+            self._active += 1
+            active = self._active
+        try:
+            # joblib's config is thread-local, so concurrent requests can each
+            # get their own degree of parallelism from the same estimator.
+            # Prediction parallelism is always thread-based; loky would also
+            # refuse to start inside multiprocessing workers.
+            with parallel_config(backend='threading', n_jobs=self.n_jobs_for(n_rows, active)):
+                yield
+        finally:
+            with self._lock:
+                self._active -= 1
+
+    def configure(self, estimator):
+        # Fitted estimators keep the n_jobs they were trained with (usually -1).
+        # sklearn estimators get n_jobs=None so the per-call joblib config in
+        # limit() decides; estimators with their own thread pools (xgboost,
+        # lightgbm) are capped at this process's share of the cores.
+        seen = set()
+        stack = [estimator]
+        while stack:
+            est = stack.pop()
+            if est is None or isinstance(est, str) or id(est) in seen:
+                continue
+            seen.add(id(est))
+
+            if isinstance(est, (list, tuple, np.ndarray)):
+                stack.extend(np.ravel(np.asarray(est, dtype=object)) if isinstance(est, np.ndarray) else est)
+                continue
+
+            if hasattr(est, 'get_params') and 'n_jobs' in est.get_params(deep=False):
+                if type(est).__module__.startswith('sklearn.'):
+                    est.n_jobs = None
+                else:
+                    est.set_params(n_jobs=self.thread_budget())
+
+            for attr in NESTED_ESTIMATOR_ATTRIBUTES:
+                nested = getattr(est, attr, None)
+                if nested is not None:
+                    stack.append(nested)
+        return estimator
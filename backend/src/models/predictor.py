@@ -1,35 +1,103 @@
-from sklearn.ensemble import RandomForestRegressor
-from sklearn.model_selection import train_test_split, cross_val_score, GridSearchCV
-from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
 import numpy as np
+import pandas as pd
 import joblib
 import os
+import pickle
 
+from src.models.tree_engine import FlatTreeEnsemble
+from src.models.execution import ExecutionPolicy
 
+PARAM_GRID = {
+    'n_estimators': [50, 100, 200],
+    'max_depth': [5, 10, 15, 20],
+    'min_samples_split': [2, 5, 10],
+    'min_samples_leaf': [1, 2, 4]
+}
+
+
+# sklearn is imported inside the methods that fit or score a model, so loading
+# a saved predictor for inference does not pay for importing it.
 class ShelfLifePredictor:
-    def __init__(self, n_estimators=100, max_depth=10, random_state=42):
-        self.model = RandomForestRegressor(
-            n_estimators=n_estimators,
-            max_depth=max_depth,
-            random_state=random_state,
-            n_jobs=-1
-        )
+    def __init__(self, n_estimators=100, max_depth=10, random_state=42, use_engine=True, engine_max_batch=512,
+                 execution_policy=None):
+        self.model = None
+        self.model_params = {
+            'n_estimators': n_estimators,
+            'max_depth': max_depth,
+            'random_state': random_state,
+            'n_jobs': -1
+        }
         self.is_trained = False
         self.feature_importance = None
         self.best_params = None
+        self.use_engine = use_engine
+        self.engine_max_batch = engine_max_batch
+        self.execution_policy = execution_policy or ExecutionPolicy()
+        self._engine = None
+
+    @property
+    def model(self):
+        # Artifacts saved by save() keep the estimator as a pickled byte array
+        # that is only unpickled when something needs the sklearn object.
+        if self._model is None and self._model_blob is not None:
+            self._model = self.execution_policy.configure(pickle.loads(memoryview(self._model_blob)))
+            self._model_blob = None
+        return self._model
+
+    @model.setter
+    def model(self, value):
+        self._model = value
+        self._model_blob = None
+        self._engine = None
+
+    def build_model(self):
+        from sklearn.ensemble import RandomForestRegressor
+        return RandomForestRegressor(**self.model_params)
 
     def train(self, X_train, y_train):
+        if self.model is None:
+            self.model = self.build_model()
         self.model.fit(X_train, y_train)
         self.is_trained = True
+        self._engine = None
         self.feature_importance = dict(zip(X_train.columns, self.model.feature_importances_))
         return self
 
+    def get_engine(self):
+        if self._engine is None:
+            self._engine = FlatTreeEnsemble(self.model)
+        return self._engine
+
     def predict(self, X):
         if not self.is_trained:
             raise ValueError("Model must be trained before prediction")
-        return self.model.predict(X)
+        # The flattened engine avoids sklearn's per-call overhead, which is
+        # what dominates small batches; sklearn's compiled traversal is faster
+        # once the batch is large.
+        if self.use_engine and len(X) <= self.engine_max_batch and self.get_engine().is_native():
+            return self.get_engine().predict(X)
+        with self.execution_policy.limit(len(X)):
+            return self.model.predict(X)
+
+    def get_feature_order(self):
+        names = self.get_engine().feature_names
+        if names is None and self.feature_importance:
+            names = list(self.feature_importance)
+        return None if names is None else list(names)
+
+    def predict_array(self, X):
+        # X holds the features in get_feature_order() order; same dispatch
+        # as predict(), without the DataFrame column selection and copies
+        if not self.is_trained:
+            raise ValueError("Model must be trained before prediction")
+        if self.use_engine and len(X) <= self.engine_max_batch:
+            return self.get_engine().predict(X)
+        with self.execution_policy.limit(len(X)):
+            return self.model.predict(pd.DataFrame(X, columns=self.get_feature_order(), copy=False))
 
     def evaluate(self, X_test, y_test):
+        from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+
         predictions = self.predict(X_test)
 
         mae = mean_absolute_error(y_test, predictions)
@@ -47,32 +115,37 @@ class ShelfLifePredictor:
         return metrics
 
     def cross_validate(self, X, y, cv=5):
-        scores = cross_val_score(self.model, X, y, cv=cv, scoring='neg_mean_absolute_error')
+        from sklearn.model_selection import cross_val_score
+
+        model = self.model if self.model is not None else self.build_model()
+        scores = cross_val_score(model, X, y, cv=cv, scoring='neg_mean_absolute_error')
         return {
             'mean_mae': -scores.mean(),
             'std_mae': scores.std(),
             'cv_scores': (-scores).tolist()
         }
 
-    def hyperparameter_tune(self, X_train, y_train):
-        param_grid = {
-            'n_estimators': [50, 100, 200],
-            'max_depth': [5, 10, 15, 20],
-            'min_samples_split': [2, 5, 10],
-            'min_samples_leaf': [1, 2, 4]
-        }
+    def hyperparameter_tune(self, X_train, y_train, search=None):
+        # search='halving' races the grid with successive halving over the
+        # number of trees; defaults to HYPERPARAMETER_SEARCH (full grid)
+        from sklearn.ensemble import RandomForestRegressor
+        from src.training.search import make_search, default_search_mode
+        from src.training.resources import TrainingScheduler
 
-        grid_search = GridSearchCV(
+        grid_search = make_search(
             RandomForestRegressor(random_state=42, n_jobs=-1),
-            param_grid,
+            PARAM_GRID,
+            mode=search or default_search_mode(),
             cv=5,
             scoring='neg_mean_absolute_error',
             n_jobs=-1
         )
 
+        TrainingScheduler().configure(grid_search)
         grid_search.fit(X_train, y_train)
         self.model = grid_search.best_estimator_
         self.is_trained = True
+        self._engine = None
         self.feature_importance = dict(zip(X_train.columns, self.model.feature_importances_))
         self.best_params = grid_search.best_params_
         
@@ -90,17 +163,43 @@ class ShelfLifePredictor:
         return dict(sorted_importance[:top_n])
 
     def save(self, filepath):
+        # The engine is stored as plain arrays (with a format version), not as
+        # a pickled object, so artifacts do not depend on the engine's classes
         model_data = {
-            'model': self.model,
+            'model_blob': np.frombuffer(pickle.dumps(self.model, protocol=pickle.HIGHEST_PROTOCOL), dtype=np.uint8),
+            'engine_state': self.get_engine().get_state() if self.is_trained else None,
             'is_trained': self.is_trained,
             'feature_importance': self.feature_importance,
             'best_params': self.best_params
         }
-        joblib.dump(model_data, filepath)
-
-    def load(self, filepath):
-        model_data = joblib.load(filepath)
-        self.model = model_data['model']
+        # Write to a new file and swap it in, so processes that have the old
+        # artifact memory-mapped keep reading the old inode.
+        tmp_path = f'{filepath}.tmp'
+        joblib.dump(model_data, tmp_path)
+        os.replace(tmp_path, filepath)
+
+    def load(self, filepath, mmap_mode=None):
+        model_data = joblib.load(filepath, mmap_mode=mmap_mode)
+        if not isinstance(model_data, dict):
+            # train_*.py scripts other than train.py save the bare estimator
+            model_data = {
+                'model': model_data,
+                'is_trained': True,
+                'feature_importance': dict(zip(
+                    getattr(model_data, 'feature_names_in_', []),
+                    getattr(model_data, 'feature_importances_', [])
+                )),
+                'best_params': None
+            }
+
+        if 'model_blob' in model_data:
+            self.model = None
+            self._model_blob = model_data['model_blob']
+        else:
+            self.model = self.execution_policy.configure(model_data['model'])
+        # Without a usable engine state (older artifacts, another format
+        # version, non-native models) get_engine() builds it from the model
+        self._engine = FlatTreeEnsemble.from_state(model_data.get('engine_state'))
         self.is_trained = model_data['is_trained']
         self.feature_importance = model_data['feature_importance']
         self.best_params = model_data['best_params']
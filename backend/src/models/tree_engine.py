@@ -0,0 +1,308 @@
+import numpy as np
+import pandas as pd
+
+# Bump when the layout of get_state() changes; artifacts with another version
+# rebuild the engine from the estimator instead
+ENGINE_FORMAT = 1
+
+TREE_ARRAYS = ['feature', 'threshold', 'children', 'value', 'is_leaf', 'roots']
+
+
+class FlatTreeBlock:
+    def __init__(self, trees, weights, average=False):
+        features, thresholds, children, values, leaves, roots = [], [], [], [], [], []
+        offset = 0
+        for tree in trees:
+            tree_ = tree.tree_
+            is_leaf = tree_.children_left == -1
+            node_ids = np.arange(tree_.node_count)
+
+            features.append(np.where(is_leaf, 0, tree_.feature))
+            thresholds.append(np.where(is_leaf, np.inf, tree_.threshold))
+            # children[2 * node] is the left child and children[2 * node + 1]
+            # the right one, so a split is a single gather on (x > threshold).
+            left = np.where(is_leaf, node_ids, tree_.children_left) + offset
+            right = np.where(is_leaf, node_ids, tree_.children_right) + offset
+            children.append(np.column_stack([left, right]).ravel())
+            values.append(tree_.value[:, 0, 0])
+            leaves.append(is_leaf)
+            roots.append(offset)
+            offset += tree_.node_count
+
+        self.feature = np.concatenate(features).astype(np.int32)
+        self.threshold = np.concatenate(thresholds).astype(np.float64)
+        self.children = np.concatenate(children).astype(np.int32)
+        self.value = np.concatenate(values).astype(np.float64)
+        self.is_leaf = np.concatenate(leaves)
+        self.roots = np.array(roots, dtype=np.int32)
+        self.weights = weights
+        self.average = average
+
+    def get_state(self):
+        state = {name: getattr(self, name) for name in TREE_ARRAYS}
+        state.update({'kind': 'trees', 'weights': self.weights, 'average': self.average})
+        return state
+
+    @classmethod
+    def from_state(cls, state):
+        block = cls.__new__(cls)
+        for name in TREE_ARRAYS:
+            setattr(block, name, state[name])
+        block.weights = state['weights']
+        block.average = state['average']
+        return block
+
+    def leaf_values(self, X):
+        n_rows, n_features = X.shape
+        n_trees = len(self.roots)
+        flat_X = X.ravel()
+
+        # One entry per (row, tree) pair; entries are dropped as soon as they
+        # reach a leaf so deep trees do not make every row pay for their depth.
+        nodes = np.tile(self.roots, n_rows)
+        row_offsets = np.repeat(np.arange(n_rows, dtype=np.int32) * n_features, n_trees)
+        positions = np.arange(n_rows * n_trees, dtype=np.int32)
+        leaf_nodes = np.empty(n_rows * n_trees, dtype=np.int32)
+
+        while len(nodes):
+            done = self.is_leaf.take(nodes)
+            if done.any():
+                leaf_nodes[positions[done]] = nodes[done]
+                active = ~done
+                nodes, row_offsets, positions = nodes[active], row_offsets[active], positions[active]
+
+            x = flat_X.take(row_offsets + self.feature.take(nodes))
+            nodes = self.children.take(2 * nodes + (x > self.threshold.take(nodes)))
+
+        return self.value.take(leaf_nodes).reshape(n_rows, n_trees)
+
+    def predict(self, X, X64):
+        leaf_values = self.leaf_values(X)
+        # Accumulate tree by tree, in the same order as sklearn, so the result
+        # is bit-for-bit identical to the estimator's own predict.
+        predictions = np.zeros(X.shape[0], dtype=np.float64)
+        for t in range(leaf_values.shape[1]):
+            if self.weights is None:
+                predictions += leaf_values[:, t]
+            else:
+                predictions += self.weights * leaf_values[:, t]
+        if self.average:
+            predictions /= leaf_values.shape[1]
+        return predictions
+
+
+class GradientBoostingBlock:
+    def __init__(self, estimator, feature_names):
+        self.trees = FlatTreeBlock(estimator.estimators_[:, 0], estimator.learning_rate)
+        from sklearn.dummy import DummyRegressor
+
+        # A fitted DummyRegressor is kept as its constant so that a compiled
+        # block can be unpickled without importing sklearn.
+        self.init = estimator.init_
+        if isinstance(self.init, DummyRegressor):
+            self.init = float(np.ravel(self.init.constant_)[0])
+
+    def get_state(self):
+        if not isinstance(self.init, (str, float)):
+            return None
+        return {'kind': 'gradient_boosting', 'trees': self.trees.get_state(), 'init': self.init}
+
+    @classmethod
+    def from_state(cls, state):
+        block = cls.__new__(cls)
+        block.trees = FlatTreeBlock.from_state(state['trees'])
+        block.init = state['init']
+        return block
+
+    def predict(self, X, X64):
+        if isinstance(self.init, str) and self.init == 'zero':
+            predictions = np.zeros(X.shape[0], dtype=np.float64)
+        elif isinstance(self.init, float):
+            predictions = np.full(X.shape[0], self.init, dtype=np.float64)
+        else:
+            # sklearn fits and calls the init estimator on its float32 input
+            predictions = np.asarray(self.init.predict(X), dtype=np.float64).ravel()
+        leaf_values = self.trees.leaf_values(X)
+        for t in range(leaf_values.shape[1]):
+            predictions += self.trees.weights * leaf_values[:, t]
+        return predictions
+
+
+class VotingBlock:
+    def __init__(self, estimator, feature_names):
+        self.members = [compile_block(est, feature_names) for est in estimator.estimators_]
+        self.weights = estimator._weights_not_none
+
+    def get_state(self):
+        members = [member.get_state() for member in self.members]
+        if any(member is None for member in members):
+            return None
+        return {'kind': 'voting', 'members': members, 'weights': self.weights}
+
+    @classmethod
+    def from_state(cls, state):
+        block = cls.__new__(cls)
+        block.members = [block_from_state(member) for member in state['members']]
+        block.weights = state['weights']
+        return block
+
+    def predict(self, X, X64):
+        member_predictions = np.asarray([member.predict(X, X64) for member in self.members]).T
+        return np.average(member_predictions, axis=1, weights=self.weights)
+
+
+class StackingBlock:
+    def __init__(self, estimator, feature_names):
+        self.members = [
+            compile_block(est, feature_names) for est in estimator.estimators_ if est != 'drop'
+        ]
+        self.final_estimator = estimator.final_estimator_
+        self.passthrough = estimator.passthrough
+
+    def get_state(self):
+        # Linear final estimators (Ridge, LinearRegression, ...) are kept as
+        # their coefficients; anything else needs the sklearn object
+        final = self.final_estimator
+        members = [member.get_state() for member in self.members]
+        if any(member is None for member in members) or not is_linear_model(final):
+            return None
+        return {
+            'kind': 'stacking', 'members': members, 'passthrough': self.passthrough,
+            'coef': np.asarray(final.coef_, dtype=np.float64), 'intercept': final.intercept_
+        }
+
+    @classmethod
+    def from_state(cls, state):
+        block = cls.__new__(cls)
+        block.members = [block_from_state(member) for member in state['members']]
+        block.final_estimator = LinearBlock(state['coef'], state['intercept'])
+        block.passthrough = state['passthrough']
+        return block
+
+    def predict(self, X, X64):
+        meta_features = [member.predict(X, X64).reshape(-1, 1) for member in self.members]
+        if self.passthrough:
+            meta_features.append(X64)
+        return self.final_estimator.predict(np.hstack(meta_features))
+
+
+class LinearBlock:
+    def __init__(self, coef, intercept):
+        self.coef = coef
+        self.intercept = intercept
+
+    def predict(self, X):
+        # Same operation as sklearn's LinearModel.predict on dense input
+        return X @ self.coef.T + self.intercept
+
+
+def is_linear_model(estimator):
+    from sklearn.linear_model._base import LinearModel
+    return (isinstance(estimator, LinearModel) and type(estimator).predict is LinearModel.predict
+            and np.ndim(estimator.coef_) == 1)
+
+
+class EstimatorBlock:
+    def __init__(self, estimator, feature_names):
+        self.estimator = estimator
+        self.feature_names = feature_names
+
+    def get_state(self):
+        return None
+
+    def predict(self, X, X64):
+        if self.feature_names is not None and hasattr(self.estimator, 'feature_names_in_'):
+            return self.estimator.predict(pd.DataFrame(X64, columns=self.feature_names))
+        return self.estimator.predict(X64)
+
+
+def compile_block(estimator, feature_names=None):
+    from sklearn.tree import DecisionTreeRegressor
+    from sklearn.ensemble import (
+        RandomForestRegressor, ExtraTreesRegressor, GradientBoostingRegressor,
+        VotingRegressor, StackingRegressor
+    )
+
+    if getattr(estimator, 'n_outputs_', 1) != 1:
+        return EstimatorBlock(estimator, feature_names)
+    if isinstance(estimator, (RandomForestRegressor, ExtraTreesRegressor)):
+        return FlatTreeBlock(estimator.estimators_, None, average=True)
+    if isinstance(estimator, DecisionTreeRegressor):
+        return FlatTreeBlock([estimator], None)
+    if isinstance(estimator, GradientBoostingRegressor):
+        return GradientBoostingBlock(estimator, feature_names)
+    if isinstance(estimator, VotingRegressor):
+        return VotingBlock(estimator, feature_names)
+    if isinstance(estimator, StackingRegressor):
+        return StackingBlock(estimator, feature_names)
+    return EstimatorBlock(estimator, feature_names)
+
+
+BLOCK_TYPES = {
+    'trees': FlatTreeBlock,
+    'gradient_boosting': GradientBoostingBlock,
+    'voting': VotingBlock,
+    'stacking': StackingBlock
+}
+
+
+def block_from_state(state):
+    return BLOCK_TYPES[state['kind']].from_state(state)
+
+
+class FlatTreeEnsemble:
+    def __init__(self, estimator, chunk_size=2048):
+        self.feature_names = getattr(estimator, 'feature_names_in_', None)
+        if self.feature_names is not None:
+            self.feature_names = list(self.feature_names)
+        self.root = compile_block(estimator, self.feature_names)
+        self.chunk_size = chunk_size
+
+    def is_native(self):
+        return not isinstance(self.root, EstimatorBlock)
+
+    def get_state(self):
+        # Plain NumPy arrays, numbers and lists, so an artifact holding the
+        # engine loads (and memory-maps) without this module's classes; None
+        # when part of the model only runs through sklearn
+        root = self.root.get_state()
+        if root is None:
+            return None
+        return {'version': ENGINE_FORMAT, 'feature_names': self.feature_names, 'chunk_size': self.chunk_size,
+                'root': root}
+
+    @classmethod
+    def from_state(cls, state):
+        if not isinstance(state, dict) or state.get('version') != ENGINE_FORMAT:
+            return None
+        engine = cls.__new__(cls)
+        engine.feature_names = state['feature_names']
+        engine.root = block_from_state(state['root'])
+        engine.chunk_size = state['chunk_size']
+        return engine
+
+    def predict(self, X):
+        if isinstance(X, pd.DataFrame):
+            if self.feature_names is not None:
+                X = X[self.feature_names]
+            X = X.to_numpy(dtype=np.float64)
+        X = np.asarray(X)
+        if X.dtype != np.float32:
+            X = np.asarray(X, dtype=np.float64)
+
+        if X.shape[0] <= self.chunk_size:
+            return self._predict_chunk(X)
+
+        predictions = np.empty(X.shape[0], dtype=np.float64)
+        for start in range(0, X.shape[0], self.chunk_size):
+            stop = start + self.chunk_size
+            predictions[start:stop] = self._predict_chunk(X[start:stop])
+        return predictions
+
+    def _predict_chunk(self, X):
+        # Trees split on float32 features, as sklearn's do; blocks that hand
+        # off to sklearn estimators get float64. Conversions happen per chunk,
+        # so a float32 or column-major feature matrix is never copied whole.
+        X32 = np.ascontiguousarray(X, dtype=np.float32)
+        X64 = np.asarray(X, dtype=np.float64)
+        return self.root.predict(X32, X64)
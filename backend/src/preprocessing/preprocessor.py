@@ -1,20 +1,60 @@
 import pandas as pd
 import numpy as np
-from sklearn.preprocessing import StandardScaler, LabelEncoder
-from sklearn.impute import SimpleImputer
 import joblib
 import os
+import pickle
 
 
+# The fitted sklearn objects are only needed by fit() and transform_sklearn();
+# the transforms used for inference work from plain tables compiled at
+# fit/load time, so saved preprocessors keep the sklearn state as a pickled
+# byte array that is unpickled (and sklearn imported) on first use.
 class DataPreprocessor:
+    # Bump when fit() or transform() output changes; cached training
+    # features (src/datasets/feature_cache.py) are keyed on it
+    VERSION = 1
+
     def __init__(self):
-        self.label_encoders = {}
-        self.scaler = StandardScaler()
-        self.imputer = SimpleImputer(strategy='median')
+        self._state_blob = None
+        self._label_encoders = {}
+        self._scaler = None
+        self._imputer = None
         self.feature_columns = None
         self.is_fitted = False
+        self._row_tables = None
+        self._compiled = None
+
+    def _unpack_state(self):
+        if self._state_blob is not None:
+            state = pickle.loads(memoryview(self._state_blob))
+            self._state_blob = None
+            self._label_encoders = state['label_encoders']
+            self._scaler = state['scaler']
+            self._imputer = state['imputer']
+
+    @property
+    def label_encoders(self):
+        self._unpack_state()
+        return self._label_encoders
+
+    @property
+    def scaler(self):
+        self._unpack_state()
+        return self._scaler
+
+    @property
+    def imputer(self):
+        self._unpack_state()
+        return self._imputer
 
     def fit(self, X):
+        from sklearn.preprocessing import StandardScaler, LabelEncoder
+        from sklearn.impute import SimpleImputer
+
+        self._state_blob = None
+        self._label_encoders = {}
+        self._scaler = StandardScaler()
+        self._imputer = SimpleImputer(strategy='median')
         self.feature_columns = X.columns.tolist()
         categorical_cols = ['food_type', 'storage_type']
         numerical_cols = ['temperature', 'humidity', 'days_stored']
@@ -30,12 +70,78 @@ class DataPreprocessor:
         X[numerical_cols] = self.imputer.fit_transform(X[numerical_cols])
         self.scaler.fit(X[numerical_cols])
         self.is_fitted = True
+        self._row_tables = None
+        self.compile()
         return self
 
+    def compile(self):
+        # Code tables for the categoricals and one constant per numeric column
+        # for missing values, which get (median - mean) / scale directly. Both
+        # reproduce the sklearn transforms bit for bit: present values go
+        # through the same subtraction and division as StandardScaler.
+        tables = self._row_tables or self._build_row_tables()
+        self._compiled = {
+            'classes': {col: pd.Index(list(codes)) for col, codes in tables['codes'].items()},
+            'means': tables['means'],
+            'scales': tables['scales'],
+            'fills': [
+                (median - mean) / scale
+                for median, mean, scale in zip(tables['medians'], tables['means'], tables['scales'])
+            ]
+        }
+        return self._compiled
+
+    def _encode(self, col, values, out=None):
+        # LabelEncoder codes of str(value), with unseen values mapped to the
+        # first class, as transform_sklearn() does
+        classes = self._compiled['classes'][col]
+        values = np.asarray(values)
+        codes = classes.get_indexer(values)
+        unmatched = codes < 0
+        if unmatched.any():
+            codes[unmatched] = classes.get_indexer(values[unmatched].astype(str))
+            codes[codes < 0] = 0
+        if out is None:
+            return codes
+        out[:] = codes
+        return out
+
+    def _scale(self, j, values, out=None):
+        # Impute and scale in one pass over the column
+        values = np.asarray(values)
+        if values.dtype.kind not in 'biuf':
+            values = values.astype(np.float64)
+        out = np.subtract(values, self._compiled['means'][j], out=out)
+        out /= self._compiled['scales'][j]
+        out[np.isnan(values)] = self._compiled['fills'][j]
+        return out
+
     def transform(self, X):
         if not self.is_fitted:
             raise ValueError("Preprocessor must be fitted before transform")
 
+        compiled = self._compiled or self.compile()
+        X = X.copy()
+        categorical_cols = ['food_type', 'storage_type']
+        numerical_cols = ['temperature', 'humidity', 'days_stored']
+
+        for col in categorical_cols:
+            if col in X.columns and col in compiled['classes']:
+                X[col] = self._encode(col, X[col].to_numpy())
+
+        numerics = X[numerical_cols]
+        for j, col in enumerate(numerical_cols):
+            X[col] = self._scale(j, numerics[col].to_numpy())
+
+        return X
+
+    def transform_sklearn(self, X):
+        # The original transform through the fitted LabelEncoders,
+        # SimpleImputer and StandardScaler; benchmarks/preprocessing.py checks
+        # the compiled transform() against it
+        if not self.is_fitted:
+            raise ValueError("Preprocessor must be fitted before transform")
+
         X = X.copy()
         categorical_cols = ['food_type', 'storage_type']
         numerical_cols = ['temperature', 'humidity', 'days_stored']
@@ -54,25 +160,94 @@ class DataPreprocessor:
 
         return X
 
+    def _build_row_tables(self):
+        codes = {}
+        for col, le in self.label_encoders.items():
+            codes[col] = {str(cls): i for i, cls in enumerate(le.classes_)}
+
+        self._row_tables = {
+            'codes': codes,
+            'medians': self.imputer.statistics_.tolist(),
+            'means': self.scaler.mean_.tolist(),
+            'scales': self.scaler.scale_.tolist()
+        }
+        return self._row_tables
+
+    def transform_row(self, food_type, temperature, humidity, storage_type, days_stored):
+        if not self.is_fitted:
+            raise ValueError("Preprocessor must be fitted before transform")
+
+        tables = self._row_tables or self._build_row_tables()
+        food_codes = tables['codes'].get('food_type', {})
+        storage_codes = tables['codes'].get('storage_type', {})
+
+        numerics = []
+        for j, value in enumerate((temperature, humidity, days_stored)):
+            value = float(value)
+            if value != value:
+                value = tables['medians'][j]
+            numerics.append((value - tables['means'][j]) / tables['scales'][j])
+
+        return (
+            food_codes.get(str(food_type), 0),
+            numerics[0],
+            numerics[1],
+            storage_codes.get(str(storage_type), 0),
+            numerics[2]
+        )
+
+    def transform_arrays(self, food_type, temperature, humidity, storage_type, days_stored, out=None):
+        # Column version of transform() for batch inference: `out` is a tuple
+        # of five 1-D arrays (usually columns of the caller's feature buffer)
+        # that receive the codes and the imputed, scaled numerics, so the
+        # input is never copied into an intermediate DataFrame.
+        if not self.is_fitted:
+            raise ValueError("Preprocessor must be fitted before transform")
+
+        self._compiled or self.compile()
+        if out is None:
+            out = tuple(np.empty(len(temperature), dtype=np.float64) for _ in range(5))
+        food_out, temp_out, humidity_out, storage_out, days_out = out
+
+        self._encode('food_type', food_type, food_out)
+        self._encode('storage_type', storage_type, storage_out)
+        for j, (values, target) in enumerate(((temperature, temp_out), (humidity, humidity_out), (days_stored, days_out))):
+            self._scale(j, values, target)
+
+        return out
+
     def fit_transform(self, X):
         return self.fit(X).transform(X)
 
     def save(self, filepath):
-        joblib.dump({
+        state = {
             'label_encoders': self.label_encoders,
             'scaler': self.scaler,
-            'imputer': self.imputer,
+            'imputer': self.imputer
+        }
+        joblib.dump({
+            'state_blob': np.frombuffer(pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL), dtype=np.uint8),
+            'row_tables': (self._row_tables or self._build_row_tables()) if self.is_fitted else None,
             'feature_columns': self.feature_columns,
             'is_fitted': self.is_fitted
         }, filepath)
 
-    def load(self, filepath):
-        data = joblib.load(filepath)
-        self.label_encoders = data['label_encoders']
-        self.scaler = data['scaler']
-        self.imputer = data['imputer']
+    def load(self, filepath, mmap_mode=None):
+        data = joblib.load(filepath, mmap_mode=mmap_mode)
+        if 'state_blob' in data:
+            self._state_blob = data['state_blob']
+            self._row_tables = data['row_tables']
+        else:
+            self._state_blob = None
+            self._label_encoders = data['label_encoders']
+            self._scaler = data['scaler']
+            self._imputer = data['imputer']
+            self._row_tables = None
         self.feature_columns = data['feature_columns']
         self.is_fitted = data['is_fitted']
+        self._compiled = None
+        if self.is_fitted:
+            self.compile()
         return self
 
 
@@ -1,6 +1,35 @@
 import numpy as np
 
 
+FOOD_TYPES = ['bakery', 'dairy', 'fruits', 'meat', 'seafood', 'vegetables']
+STORAGE_TYPES = ['freezer', 'pantry', 'refrigerator']
+
+SEVERITY_LEVELS = ['none', 'medium', 'high', 'critical']
+SAFETY_CLASSES = ['Safe', 'Consume Soon', 'Expired']
+SEVERITY_FACTORS = np.array([1.0, 0.7, 0.5, 0.3])
+
+ISSUE_TEMP_DANGER = 1
+ISSUE_TEMP_ABOVE_MAX = 2
+ISSUE_HUMIDITY_ABOVE_MAX = 4
+ISSUE_REFRIGERATOR_TOO_WARM = 8
+ISSUE_FREEZER_TOO_WARM = 16
+ISSUE_PANTRY_HUMID = 32
+
+REC_CONSUME_NOW = 1
+REC_LOWER_FRIDGE_TEMP = 2
+REC_REDUCE_HUMIDITY = 4
+REC_MOVE_COOLER = 8
+REC_MONITOR = 16
+
+RECOMMENDATION_MESSAGES = [
+    (REC_CONSUME_NOW, 'Consume immediately or discard'),
+    (REC_LOWER_FRIDGE_TEMP, 'Lower refrigerator temperature to 2-4°C'),
+    (REC_REDUCE_HUMIDITY, 'Reduce humidity to prevent mold growth'),
+    (REC_MOVE_COOLER, 'Move to cooler location or refrigerate'),
+    (REC_MONITOR, 'Monitor closely for signs of spoilage')
+]
+
+
 class RuleBasedInterpreter:
     def __init__(self):
         self.food_rules = {
@@ -130,3 +159,128 @@ class RuleBasedInterpreter:
             recommendations.append('Monitor closely for signs of spoilage')
 
         return recommendations
+
+    def encode_food_types(self, food_types):
+        codes = np.full(len(food_types), FOOD_TYPES.index('dairy'), dtype=np.int8)
+        for code, name in enumerate(FOOD_TYPES):
+            codes[np.asarray(food_types) == name] = code
+        return codes
+
+    def encode_storage_types(self, storage_types):
+        codes = np.full(len(storage_types), STORAGE_TYPES.index('refrigerator'), dtype=np.int8)
+        for code, name in enumerate(STORAGE_TYPES):
+            codes[np.asarray(storage_types) == name] = code
+        return codes
+
+    def _food_rule_table(self, key):
+        default = self.food_rules['dairy']
+        return np.array([self.food_rules.get(name, default)[key] for name in FOOD_TYPES], dtype=float)
+
+    def check_extreme_conditions_batch(self, food_codes, storage_codes, temperature, humidity, days_stored):
+        temperature = np.asarray(temperature, dtype=float)
+        humidity = np.asarray(humidity, dtype=float)
+
+        danger_temp = self._food_rule_table('danger_zone_temp')[food_codes]
+        max_temp = self._food_rule_table('max_temp')[food_codes]
+        max_humidity = self._food_rule_table('max_humidity')[food_codes]
+
+        is_fridge = storage_codes == STORAGE_TYPES.index('refrigerator')
+        is_freezer = storage_codes == STORAGE_TYPES.index('freezer')
+        is_pantry = storage_codes == STORAGE_TYPES.index('pantry')
+
+        temp_danger = temperature > danger_temp
+        temp_above_max = ~temp_danger & (temperature > max_temp)
+        humidity_above_max = humidity > max_humidity
+        fridge_too_warm = is_fridge & (temperature > 8)
+        freezer_too_warm = is_freezer & (temperature > -5)
+        pantry_humid = is_pantry & (humidity > 70)
+
+        issue_mask = (
+            temp_danger * ISSUE_TEMP_DANGER |
+            temp_above_max * ISSUE_TEMP_ABOVE_MAX |
+            humidity_above_max * ISSUE_HUMIDITY_ABOVE_MAX |
+            fridge_too_warm * ISSUE_REFRIGERATOR_TOO_WARM |
+            freezer_too_warm * ISSUE_FREEZER_TOO_WARM |
+            pantry_humid * ISSUE_PANTRY_HUMID
+        ).astype(np.int16)
+
+        # Each scalar rule only raises the severity, so the batch result is the
+        # highest level triggered by any rule.
+        severity = np.zeros(len(temperature), dtype=np.int8)
+        severity[pantry_humid] = 1
+        severity[temp_above_max | humidity_above_max | freezer_too_warm] = 2
+        severity[temp_danger | fridge_too_warm] = 3
+
+        return issue_mask, severity
+
+    def adjust_prediction_batch(self, predicted_days, severity_codes):
+        factors = SEVERITY_FACTORS[severity_codes]
+        adjusted = np.asarray(predicted_days, dtype=float) * factors
+        adjusted = np.where(adjusted > 0, adjusted, 0.0)
+        return adjusted, factors
+
+    def classify_safety_batch(self, remaining_days):
+        remaining_days = np.asarray(remaining_days, dtype=float)
+        safety = np.zeros(len(remaining_days), dtype=np.int8)
+        safety[remaining_days <= 7] = 1
+        safety[remaining_days <= 0] = 2
+        return safety
+
+    def get_recommendations_batch(self, food_codes, storage_codes, temperature, humidity, remaining_days):
+        temperature = np.asarray(temperature, dtype=float)
+        humidity = np.asarray(humidity, dtype=float)
+        remaining_days = np.asarray(remaining_days, dtype=float)
+
+        is_fridge = storage_codes == STORAGE_TYPES.index('refrigerator')
+        is_pantry = storage_codes == STORAGE_TYPES.index('pantry')
+
+        return (
+            (remaining_days <= 2) * REC_CONSUME_NOW |
+            ((temperature > 10) & is_fridge) * REC_LOWER_FRIDGE_TEMP |
+            (humidity > 80) * REC_REDUCE_HUMIDITY |
+            (is_pantry & (temperature > 25)) * REC_MOVE_COOLER |
+            ((remaining_days > 0) & (remaining_days <= 5)) * REC_MONITOR
+        ).astype(np.int16)
+
+    def evaluate_batch(self, food_codes, storage_codes, temperature, humidity, days_stored, predicted_days):
+        issue_mask, severity = self.check_extreme_conditions_batch(
+            food_codes, storage_codes, temperature, humidity, days_stored
+        )
+        adjusted, factors = self.adjust_prediction_batch(predicted_days, severity)
+        safety = self.classify_safety_batch(adjusted)
+        recommendation_mask = self.get_recommendations_batch(
+            food_codes, storage_codes, temperature, humidity, adjusted
+        )
+        return {
+            'severity': severity,
+            'adjustment_factor': factors,
+            'adjusted_prediction': adjusted,
+            'safety': safety,
+            'issue_mask': issue_mask,
+            'recommendation_mask': recommendation_mask
+        }
+
+    def describe_issues(self, issue_mask, food_type, temperature, humidity):
+        if not issue_mask:
+            return []
+
+        rules = self.food_rules.get(food_type, self.food_rules['dairy'])
+        issues = []
+
+        if issue_mask & ISSUE_TEMP_DANGER:
+            issues.append(f'Temperature ({temperature}°C) exceeds danger zone threshold ({rules["danger_zone_temp"]}°C)')
+        elif issue_mask & ISSUE_TEMP_ABOVE_MAX:
+            issues.append(f'Temperature ({temperature}°C) above recommended maximum ({rules["max_temp"]}°C)')
+        if issue_mask & ISSUE_HUMIDITY_ABOVE_MAX:
+            issues.append(f'Humidity ({humidity}%) above recommended maximum ({rules["max_humidity"]}%)')
+        if issue_mask & ISSUE_REFRIGERATOR_TOO_WARM:
+            issues.append('Refrigerator temperature too high - rapid bacterial growth risk')
+        if issue_mask & ISSUE_FREEZER_TOO_WARM:
+            issues.append('Freezer temperature too high - food not properly frozen')
+        if issue_mask & ISSUE_PANTRY_HUMID:
+            issues.append('High pantry humidity - mold growth risk')
+
+        return issues
+
+    def describe_recommendations(self, recommendation_mask):
+        return [message for flag, message in RECOMMENDATION_MESSAGES if recommendation_mask & flag]
@@ -1,4 +1,6 @@
+import asyncio
 import requests
+import httpx
 import os
 from dotenv import load_dotenv
 
@@ -8,73 +10,104 @@ load_dotenv()
 class OpenRouterChatService:
     def __init__(self):
         self.api_key = os.getenv('OPENROUTER_API_KEY')
-        self.base_url = 'https://openrouter.ai/api/v1'
+        self.base_url = os.getenv('OPENROUTER_BASE_URL', 'https://openrouter.ai/api/v1')
         self.model = 'anthropic/claude-3-haiku'
+        self.explanation_questions = [
+            "What are the main factors affecting this prediction?",
+            "What should I do with this food item?",
+            "How can I extend the shelf life of similar items?"
+        ]
 
-    def chat(self, message, context=None):
-        if not self.api_key:
-            return {'error': 'OpenRouter API key not configured'}
-
-        try:
-            system_prompt = """You are a food safety and storage expert AI assistant. 
+    def _build_request(self, message, context=None):
+        system_prompt = """You are a food safety and storage expert AI assistant. 
             Help users with questions about food storage, safety, and shelf life predictions.
             Provide clear, practical advice based on food safety guidelines.
             Always prioritize safety - when in doubt, recommend discarding food.
             Keep responses concise and actionable."""
 
-            messages = [
-                {'role': 'system', 'content': system_prompt}
-            ]
-
-            if context:
-                messages.append({
-                    'role': 'user',
-                    'content': f"Context: {context}\n\nQuestion: {message}"
-                })
-            else:
-                messages.append({
-                    'role': 'user',
-                    'content': message
-                })
+        messages = [
+            {'role': 'system', 'content': system_prompt}
+        ]
 
-            headers = {
-                'Authorization': f'Bearer {self.api_key}',
-                'Content-Type': 'application/json',
-                'HTTP-Referer': 'http://localhost:3000',
-                'X-Title': 'Food Shelf Life Predictor'
+        if context:
+            messages.append({
+                'role': 'user',
+                'content': f"Context: {context}\n\nQuestion: {message}"
+            })
+        else:
+            messages.append({
+                'role': 'user',
+                'content': message
+            })
+
+        headers = {
+            'Authorization': f'Bearer {self.api_key}',
+            'Content-Type': 'application/json',
+            'HTTP-Referer': 'http://localhost:3000',
+            'X-Title': 'Food Shelf Life Predictor'
+        }
+
+        data = {
+            'model': self.model,
+            'messages': messages,
+            'max_tokens': 500,
+            'temperature': 0.7
+        }
+
+        return f'{self.base_url}/chat/completions', headers, data
+
+    def _parse_response(self, response):
+        if response.status_code == 200:
+            result = response.json()
+            return {
+                'success': True,
+                'response': result['choices'][0]['message']['content']
             }
-
-            data = {
-                'model': self.model,
-                'messages': messages,
-                'max_tokens': 500,
-                'temperature': 0.7
+        else:
+            return {
+                'error': f'API request failed with status {response.status_code}',
+                'message': response.text
             }
 
+    def chat(self, message, context=None):
+        if not self.api_key:
+            return {'error': 'OpenRouter API key not configured'}
+
+        try:
+            url, headers, data = self._build_request(message, context)
+
             response = requests.post(
-                f'{self.base_url}/chat/completions',
+                url,
                 headers=headers,
                 json=data,
                 timeout=30
             )
 
-            if response.status_code == 200:
-                result = response.json()
-                return {
-                    'success': True,
-                    'response': result['choices'][0]['message']['content']
-                }
+            return self._parse_response(response)
+
+        except Exception as e:
+            return {'error': str(e)}
+
+    async def achat(self, message, context=None, client=None):
+        if not self.api_key:
+            return {'error': 'OpenRouter API key not configured'}
+
+        try:
+            url, headers, data = self._build_request(message, context)
+
+            if client is None:
+                async with httpx.AsyncClient() as client:
+                    response = await client.post(url, headers=headers, json=data, timeout=30)
             else:
-                return {
-                    'error': f'API request failed with status {response.status_code}',
-                    'message': response.text
-                }
+                response = await client.post(url, headers=headers, json=data, timeout=30)
+
+            return self._parse_response(response)
 
         except Exception as e:
             return {'error': str(e)}
 
-    def get_prediction_explanation(self, prediction_result):
-        context = f"""
+    def _prediction_context(self, prediction_result):
+        return f"""
         Food Type: {prediction_result['food_type']}
         Storage Type: {prediction_result['storage_type']}
         Temperature: {prediction_result['temperature']}°C
@@ -84,14 +117,11 @@ class OpenRouterChatService:
         Safety Classification: {prediction_result['safety_classification']}
         """
 
-        questions = [
-            "What are the main factors affecting this prediction?",
-            "What should I do with this food item?",
-            "How can I extend the shelf life of similar items?"
-        ]
+    def get_prediction_explanation(self, prediction_result):
+        context = self._prediction_context(prediction_result)
 
         explanation = []
-        for question in questions:
+        for question in self.explanation_questions:
             response = self.chat(question, context)
             if response.get('success'):
                 explanation.append({
@@ -101,7 +131,21 @@ class OpenRouterChatService:
 
         return explanation
 
-    def get_storage_advice(self, food_type, storage_conditions):
+    async def aget_prediction_explanation(self, prediction_result, client=None):
+        context = self._prediction_context(prediction_result)
+
+        # The questions are independent, so ask them concurrently
+        responses = await asyncio.gather(*[
+            self.achat(question, context, client) for question in self.explanation_questions
+        ])
+
+        return [
+            {'question': question, 'answer': response['response']}
+            for question, response in zip(self.explanation_questions, responses)
+            if response.get('success')
+        ]
+
+    def _storage_advice_request(self, food_type, storage_conditions):
         message = f"What are the best storage practices for {food_type}?"
 
         context = f"""
@@ -111,8 +155,16 @@ class OpenRouterChatService:
         - Humidity: {storage_conditions.get('humidity', 'unknown')}%
         """
 
+        return message, context
+
+    def get_storage_advice(self, food_type, storage_conditions):
+        message, context = self._storage_advice_request(food_type, storage_conditions)
         return self.chat(message, context)
 
+    async def aget_storage_advice(self, food_type, storage_conditions, client=None):
+        message, context = self._storage_advice_request(food_type, storage_conditions)
+        return await self.achat(message, context, client)
+
     def get_safety_guidelines(self, food_type):
         message = f"What are the key safety guidelines for storing {food_type}? How can I tell if it has gone bad?"
         return self.chat(message)
@@ -1,4 +1,5 @@
 import requests
+import httpx
 import os
 from dotenv import load_dotenv
 
@@ -8,41 +9,66 @@ load_dotenv()
 class ElevenLabsVoiceService:
     def __init__(self):
         self.api_key = os.getenv('ELEVENLABS_API_KEY')
-        self.base_url = 'https://api.elevenlabs.io/v1'
+        self.base_url = os.getenv('ELEVENLABS_BASE_URL', 'https://api.elevenlabs.io/v1')
         self.voice_id = '21m00Tcm4TlvDq8ikWAM'
 
+    def _build_tts_request(self, text, voice_id=None):
+        url = f'{self.base_url}/text-to-speech/{voice_id or self.voice_id}'
+        headers = {
+            'Accept': 'audio/mpeg',
+            'Content-Type': 'application/json',
+            'xi-api-key': self.api_key
+        }
+        data = {
+            'text': text,
+            'model_id': 'eleven_monolingual_v1',
+            'voice_settings': {
+                'stability': 0.5,
+                'similarity_boost': 0.75
+            }
+        }
+        return url, headers, data
+
+    def _parse_tts_response(self, response):
+        if response.status_code == 200:
+            return {
+                'success': True,
+                'audio_data': response.content
+            }
+        else:
+            return {
+                'error': f'API request failed with status {response.status_code}',
+                'message': response.text
+            }
+
     def text_to_speech(self, text, voice_id=None):
         if not self.api_key:
             return {'error': 'ElevenLabs API key not configured'}
 
         try:
-            url = f'{self.base_url}/text-to-speech/{voice_id or self.voice_id}'
-            headers = {
-                'Accept': 'audio/mpeg',
-                'Content-Type': 'application/json',
-                'xi-api-key': self.api_key
-            }
-            data = {
-                'text': text,
-                'model_id': 'eleven_monolingual_v1',
-                'voice_settings': {
-                    'stability': 0.5,
-                    'similarity_boost': 0.75
-                }
-            }
+            url, headers, data = self._build_tts_request(text, voice_id)
 
             response = requests.post(url, headers=headers, json=data, timeout=30)
 
-            if response.status_code == 200:
-                return {
-                    'success': True,
-                    'audio_data': response.content
-                }
+            return self._parse_tts_response(response)
+
+        except Exception as e:
+            return {'error': str(e)}
+
+    async def atext_to_speech(self, text, voice_id=None, client=None):
+        if not self.api_key:
+            return {'error': 'ElevenLabs API key not configured'}
+
+        try:
+            url, headers, data = self._build_tts_request(text, voice_id)
+
+            if client is None:
+                async with httpx.AsyncClient() as client:
+                    response = await client.post(url, headers=headers, json=data, timeout=30)
             else:
-                return {
-                    'error': f'API request failed with status {response.status_code}',
-                    'message': response.text
-                }
+                response = await client.post(url, headers=headers, json=data, timeout=30)
+
+            return self._parse_tts_response(response)
 
         except Exception as e:
             return {'error': str(e)}
@@ -51,6 +77,10 @@ class ElevenLabsVoiceService:
         explanation_text = self._format_explanation(prediction_result)
         return self.text_to_speech(explanation_text)
 
+    async def agenerate_explanation_audio(self, prediction_result, client=None):
+        explanation_text = self._format_explanation(prediction_result)
+        return await self.atext_to_speech(explanation_text, client=client)
+
     def _format_explanation(self, result):
         text = f"For your {result['food_type']} stored in the {result['storage_type']}, "
         text += f"at {result['temperature']} degrees Celsius and {result['humidity']} percent humidity, "
@@ -0,0 +1,319 @@
+import hashlib
+import importlib
+import json
+import os
+import time
+import joblib
+import numpy as np
+
+from src.datasets.feature_cache import FeatureCache, load_features
+from src.models.predictor import ShelfLifePredictor
+from src.training.search import make_search, default_search_mode
+from src.training.resources import TrainingScheduler
+
+DEFAULT_SPLIT = {'test_size': 0.15, 'random_state': 42, 'folds': 5}
+LOWER_IS_BETTER = {'mae', 'rmse'}
+
+
+def import_object(path):
+    module, _, name = path.rpartition('.')
+    return getattr(importlib.import_module(module), name)
+
+
+def stage_key(*parts):
+    return hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def score_predictions(y_true, y_pred):
+    from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+
+    mae = mean_absolute_error(y_true, y_pred)
+    return {
+        'mae': mae,
+        'rmse': float(np.sqrt(mean_squared_error(y_true, y_pred))),
+        'r2': r2_score(y_true, y_pred),
+        'accuracy': max(0, (1 - mae / 90) * 100)
+    }
+
+
+class StageStore:
+    # Outputs of each training stage, one joblib file per stage and key
+    def __init__(self, cache_dir='data/training_cache'):
+        self.cache_dir = cache_dir
+
+    def path(self, stage, key):
+        return os.path.join(self.cache_dir, stage, f'{key}.pkl')
+
+    def get(self, stage, key):
+        path = self.path(stage, key)
+        if self.cache_dir and os.path.exists(path):
+            return joblib.load(path)
+        return None
+
+    def put(self, stage, key, value):
+        if not self.cache_dir:
+            return value
+        path = self.path(stage, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        joblib.dump(value, tmp_path)
+        os.replace(tmp_path, path)
+        return value
+
+
+class TrainingPipeline:
+    # load -> split -> tune base models -> ensembles -> evaluate -> save,
+    # driven by a JSON config (see configs/). Every stage's output is stored
+    # under a key hashed from its own config section and the keys of the
+    # stages it depends on, so a rerun only recomputes what changed: editing
+    # an ensemble refits its final estimator from the stored out-of-fold
+    # predictions without touching the tuned base models.
+    def __init__(self, config, cache_dir='data/training_cache', rebuild=(), scheduler=None):
+        self.config = config
+        self.store = StageStore(cache_dir)
+        self.rebuild = set(rebuild)
+        self.scheduler = scheduler or TrainingScheduler()
+        self.timings = []
+
+    @classmethod
+    def from_file(cls, filepath, **kwargs):
+        with open(filepath) as f:
+            return cls(json.load(f), **kwargs)
+
+    def _run_stage(self, stage, name, key, compute):
+        start = time.perf_counter()
+        result = None if stage in self.rebuild else self.store.get(stage, key)
+        reused = result is not None
+        if not reused:
+            result = self.store.put(stage, key, compute())
+        elapsed = time.perf_counter() - start
+        self.timings.append({'stage': stage, 'name': name, 'key': key, 'reused': reused, 'seconds': elapsed})
+        print(f"  {stage:<9} {name:<12} {'reused' if reused else 'computed':<9} {elapsed:8.2f}s  {key[:12]}")
+        return result
+
+    def load_data(self):
+        data = self.config['data']
+        files = data['files'] if isinstance(data['files'], list) else [data['files']]
+        if data.get('skip_missing'):
+            files = [filepath for filepath in files if os.path.exists(filepath)]
+        deduplicate = data.get('deduplicate', False)
+        X, y, preprocessor, _ = load_features(files, deduplicate=deduplicate)
+        return X, y, preprocessor, FeatureCache().make_key(files, deduplicate)
+
+    def split(self, features_key, n_rows):
+        config = {**DEFAULT_SPLIT, **self.config.get('split', {})}
+
+        def compute():
+            from sklearn.model_selection import train_test_split, KFold
+
+            train, test = train_test_split(
+                np.arange(n_rows), test_size=config['test_size'], random_state=config['random_state']
+            )
+            # Fold of each training row, in the order KFold(cv) and
+            # StackingRegressor(cv=n) use when given an integer cv
+            folds = np.empty(len(train), dtype=np.int64)
+            for fold, (_, val) in enumerate(KFold(config['folds']).split(train)):
+                folds[val] = fold
+            return {'train': train, 'test': test, 'folds': folds}
+
+        key = stage_key('split', features_key, config)
+        return self._run_stage('split', 'train/test', key, compute), key
+
+    def available_models(self):
+        models = {}
+        for name, spec in self.config['models'].items():
+            try:
+                import_object(spec['estimator'])
+            except ImportError:
+                if not spec.get('optional'):
+                    raise
+                print(f"  {name}: {spec['estimator']} not available, skipping")
+                continue
+            models[name] = spec
+        return models
+
+    def search_mode(self, spec):
+        if not spec.get('search'):
+            return None
+        return spec['search'].get('mode', default_search_mode())
+
+    def build_search(self, spec, cv):
+        estimator = import_object(spec['estimator'])(**spec.get('params', {}))
+        search = spec.get('search')
+        if not search:
+            return None, estimator
+        return make_search(
+            estimator, search['space'],
+            mode=self.search_mode(spec),
+            n_iter=None if search.get('type', 'random') == 'grid' else search.get('n_iter', 10),
+            cv=cv,
+            scoring=search.get('scoring', 'neg_mean_absolute_error'),
+            n_jobs=search.get('n_jobs', -1),
+            random_state=search.get('random_state', 42),
+            **search.get('halving', {})
+        ), estimator
+
+    def tune(self, name, spec, split, split_key, X_train, y_train, X_test):
+        def compute():
+            from sklearn.base import clone
+            from sklearn.model_selection import PredefinedSplit, cross_val_predict
+
+            cv = PredefinedSplit(split['folds'])
+            search, estimator = self.build_search(spec, cv)
+            if search is not None:
+                with self.scheduler.phase(f'{name} search', search):
+                    search.fit(X_train, y_train)
+                best, best_params, cv_mae = search.best_estimator_, search.best_params_, -search.best_score_
+            else:
+                with self.scheduler.phase(f'{name} fit', estimator):
+                    best, best_params, cv_mae = estimator.fit(X_train, y_train), {}, None
+            # Out-of-fold predictions of the tuned configuration, the inputs a
+            # stacking ensemble's final estimator is fitted on
+            with self.scheduler.phase(f'{name} out-of-fold'):
+                fold_estimator = clone(best)
+                oof = cross_val_predict(fold_estimator, X_train, y_train, cv=cv,
+                                        n_jobs=self.scheduler.split_tasks(cv.get_n_splits(), fold_estimator))
+            return {
+                'estimator': best,
+                'best_params': best_params,
+                'cv_mae': cv_mae,
+                'oof': oof,
+                'test_pred': best.predict(X_test)
+            }
+
+        key = stage_key('model', split_key, spec, self.search_mode(spec), library_versions(spec['estimator']))
+        return self._run_stage('model', name, key, compute), key
+
+    def ensemble(self, name, spec, models, model_keys, X_train, y_train, X_test):
+        members = [member for member in spec.get('members', list(models)) if member in models]
+
+        def compute():
+            if spec['type'] == 'voting':
+                estimator = assemble_voting(
+                    {member: models[member]['estimator'] for member in members}, X_train, spec.get('weights')
+                )
+            elif spec['type'] == 'stacking':
+                final_spec = spec.get('final_estimator', {'estimator': 'sklearn.linear_model.Ridge'})
+                final_estimator = import_object(final_spec['estimator'])(**final_spec.get('params', {}))
+                X_meta = np.column_stack([models[member]['oof'] for member in members])
+                if spec.get('passthrough'):
+                    X_meta = np.hstack([X_meta, X_train.to_numpy()])
+                final_estimator.fit(X_meta, y_train)
+                estimator = assemble_stacking(
+                    {member: models[member]['estimator'] for member in members}, final_estimator, X_train,
+                    spec.get('passthrough', False)
+                )
+            else:
+                raise ValueError(f"Unknown ensemble type: {spec['type']}")
+            return {'estimator': estimator, 'test_pred': estimator.predict(X_test)}
+
+        key = stage_key('ensemble', spec, {member: model_keys[member] for member in members})
+        return self._run_stage('ensemble', name, key, compute)
+
+    def run(self):
+        print("Loading features...")
+        X, y, preprocessor, features_key = self.load_data()
+        print(f"Dataset size: {X.shape[0]} samples, {X.shape[1]} features\n")
+
+        print("Stages:")
+        split, split_key = self.split(features_key, len(X))
+        X_train, X_test = X.iloc[split['train']], X.iloc[split['test']]
+        y_train, y_test = y.iloc[split['train']], y.iloc[split['test']]
+
+        models, model_keys = {}, {}
+        for name, spec in self.available_models().items():
+            models[name], model_keys[name] = self.tune(name, spec, split, split_key, X_train, y_train, X_test)
+
+        ensembles = {}
+        for name, spec in self.config.get('ensembles', {}).items():
+            ensembles[name] = self.ensemble(name, spec, models, model_keys, X_train, y_train, X_test)
+
+        candidates = {**models, **ensembles}
+        results = {name: score_predictions(y_test, result['test_pred']) for name, result in candidates.items()}
+        selection = self.config.get('selection', {})
+        metric = selection.get('metric', 'r2')
+        eligible = selection.get('candidates', list(candidates))
+        best_name = min(
+            (name for name in eligible if name in results),
+            key=lambda name: results[name][metric] if metric in LOWER_IS_BETTER else -results[name][metric]
+        )
+
+        print(f"\nTraining set: {len(X_train)} samples, test set: {len(X_test)} samples\n")
+        print(f"{'Model':<20} {'CV MAE':<10} {'MAE':<10} {'RMSE':<10} {'R2':<10} {'Accuracy':<10}")
+        print("-" * 70)
+        for name, scores in results.items():
+            cv_mae = candidates[name].get('cv_mae')
+            cv_text = f"{cv_mae:.3f}" if cv_mae is not None else '-'
+            marker = ' *' if name == best_name else ''
+            accuracy = f"{scores['accuracy']:.1f}%"
+            print(f"{name:<20} {cv_text:<10} {scores['mae']:<10.3f} {scores['rmse']:<10.3f} {scores['r2']:<10.4f} "
+                  f"{accuracy:<10}{marker}")
+
+        if self.scheduler.phases:
+            self.scheduler.print_report()
+
+        best = candidates[best_name]['estimator']
+        output = self.config.get('output', {})
+        models_dir = output.get('models_dir', 'models')
+        if output.get('save', True):
+            os.makedirs(models_dir, exist_ok=True)
+            predictor = ShelfLifePredictor()
+            predictor.model = best
+            predictor.is_trained = True
+            predictor.feature_importance = dict(zip(X.columns, getattr(best, 'feature_importances_', [])))
+            predictor.best_params = candidates[best_name].get('best_params')
+            predictor.save(os.path.join(models_dir, 'shelf_life_predictor.pkl'))
+            preprocessor.save(os.path.join(models_dir, 'preprocessor.pkl'))
+            print(f"\nBest model: {best_name} ({metric}={results[best_name][metric]:.4f}), saved to {models_dir}/")
+
+        return {
+            'best': best_name,
+            'metric': metric,
+            'results': results,
+            'best_params': {name: result.get('best_params') for name, result in models.items()},
+            'stages': self.timings,
+            'phases': self.scheduler.phases
+        }
+
+
+def library_versions(estimator_path):
+    import sklearn
+
+    versions = {'sklearn': sklearn.__version__}
+    package = estimator_path.split('.')[0]
+    versions[package] = getattr(importlib.import_module(package), '__version__', None)
+    return versions
+
+
+def _set_fitted_members(ensemble, members, X_train):
+    from sklearn.utils import Bunch
+
+    ensemble.estimators_ = list(members.values())
+    ensemble.named_estimators_ = Bunch(**members)
+    if hasattr(X_train, 'columns'):
+        ensemble.feature_names_in_ = np.asarray(X_train.columns, dtype=object)
+    return ensemble
+
+
+def assemble_voting(members, X_train, weights=None):
+    # The VotingRegressor fit() would produce from these members, without
+    # refitting clones of them
+    from sklearn.ensemble import VotingRegressor
+
+    ensemble = VotingRegressor(estimators=list(members.items()), weights=weights)
+    return _set_fitted_members(ensemble, members, X_train)
+
+
+def assemble_stacking(members, final_estimator, X_train, passthrough=False):
+    # A fitted StackingRegressor from already fitted members and a final
+    # estimator fitted on their out-of-fold predictions. With the same folds
+    # this is what StackingRegressor(cv=folds).fit() computes.
+    from sklearn.ensemble import StackingRegressor
+
+    ensemble = StackingRegressor(
+        estimators=list(members.items()), final_estimator=final_estimator, passthrough=passthrough
+    )
+    _set_fitted_members(ensemble, members, X_train)
+    ensemble.stack_method_ = ['predict'] * len(members)
+    ensemble.final_estimator_ = final_estimator
+    return ensemble
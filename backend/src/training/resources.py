@@ -0,0 +1,149 @@
+import math
+import os
+import time
+from contextlib import contextmanager
+
+from threadpoolctl import threadpool_limits
+
+# Constructor parameters through which sklearn meta-estimators hold the
+# estimators they fit
+NESTED_PARAMS = ['estimator', 'estimators', 'final_estimator', 'base_estimator']
+
+
+def available_cores():
+    cores = int(os.getenv('TRAINING_CORES') or 0)
+    if cores:
+        return cores
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def process_tree_cpu_time():
+    # CPU seconds used by this process, its finished children and, on Linux,
+    # its live descendants (joblib's loky workers stay alive between calls)
+    times = os.times()
+    total = times.user + times.system + times.children_user + times.children_system
+    if not os.path.isdir('/proc'):
+        return total
+
+    tick = os.sysconf('SC_CLK_TCK')
+    parents, cpu = {}, {}
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat') as f:
+                fields = f.read().rsplit(')', 1)[1].split()
+        except OSError:
+            continue
+        pid = int(entry)
+        parents[pid] = int(fields[1])
+        cpu[pid] = (int(fields[11]) + int(fields[12])) / tick
+
+    descendants, stack = [], [os.getpid()]
+    while stack:
+        parent = stack.pop()
+        children = [pid for pid, ppid in parents.items() if ppid == parent]
+        descendants.extend(children)
+        stack.extend(children)
+    return total + sum(cpu[pid] for pid in descendants)
+
+
+def count_tasks(estimator, cores):
+    # Independent fits an estimator's own n_jobs parallelizes over
+    from sklearn.model_selection import ParameterGrid
+    from sklearn.model_selection._search import BaseSearchCV
+
+    if isinstance(estimator, BaseSearchCV):
+        cv = estimator.cv
+        n_splits = cv if isinstance(cv, int) else 5 if cv is None else cv.get_n_splits()
+        candidates = getattr(estimator, 'n_candidates', None) or getattr(estimator, 'n_iter', None)
+        if not isinstance(candidates, int):
+            candidates = len(ParameterGrid(estimator.param_grid)) if hasattr(estimator, 'param_grid') else cores
+        return candidates * n_splits
+    params = estimator.get_params(deep=False)
+    if 'estimators' in params:
+        return len(params['estimators'])
+    # n_estimators is None by default in xgboost >= 2.0
+    n = params.get('n_estimators')
+    return n if isinstance(n, int) else cores
+
+
+class TrainingScheduler:
+    # Splits a core budget across nested parallelism so search workers x
+    # the estimator threads inside each fit never exceed `cores`. Each level
+    # gets an explicit n_jobs (n_jobs=-1 at every level means cores squared
+    # threads). With an explicit n_jobs, joblib also caps the native thread
+    # pools (BLAS, OpenMP) of its loky workers at their share; threadpoolctl
+    # caps this process's. phase() times each step and reports its CPU
+    # utilization.
+    def __init__(self, cores=None):
+        self.cores = cores or available_cores()
+        self.phases = []
+
+    def split(self, tasks, cores=None):
+        # Workers first: whole fits parallelize better than the trees of one
+        # forest, and leftover cores go to the threads inside each fit
+        cores = cores or self.cores
+        workers = max(1, min(tasks, cores))
+        return workers, max(1, cores // workers)
+
+    def configure(self, estimator, cores=None):
+        cores = cores or self.cores
+        if estimator is None or isinstance(estimator, str) or not hasattr(estimator, 'get_params'):
+            return estimator
+        params = estimator.get_params(deep=False)
+        tasks = count_tasks(estimator, cores)
+        if 'n_jobs' in params:
+            workers, inner = self.split(tasks, cores)
+            if 'final_estimator' in params:
+                # StackingRegressor hands its n_jobs to both its loop over
+                # the members and each member's cross_val_predict
+                workers = max(1, min(tasks, math.isqrt(cores)))
+                inner = max(1, cores // (workers * workers))
+            estimator.set_params(n_jobs=workers)
+        else:
+            inner = cores
+
+        for name in NESTED_PARAMS:
+            nested = params.get(name)
+            if isinstance(nested, list):
+                for member in nested:
+                    self.configure(member[1] if isinstance(member, tuple) else member, inner)
+            else:
+                self.configure(nested, inner)
+        return estimator
+
+    def split_tasks(self, tasks, estimator):
+        # n_jobs for a function that fits `estimator` `tasks` times (cross_val_score,
+        # cross_val_predict), with the estimator limited to its share
+        workers, inner = self.split(tasks)
+        self.configure(estimator, inner)
+        return workers
+
+    @contextmanager
+    def phase(self, name, estimator=None):
+        if estimator is not None:
+            self.configure(estimator)
+        start_cpu = process_tree_cpu_time()
+        start = time.perf_counter()
+        try:
+            with threadpool_limits(limits=self.cores):
+                yield estimator
+        finally:
+            elapsed = time.perf_counter() - start
+            cpu = process_tree_cpu_time() - start_cpu
+            utilization = cpu / (elapsed * self.cores) if elapsed > 0 else 0.0
+            self.phases.append({'phase': name, 'seconds': elapsed, 'cpu_seconds': cpu, 'utilization': utilization})
+            print(f"  [{name}] {elapsed:.1f}s wall, {cpu:.1f}s CPU, {utilization:.0%} of {self.cores} cores")
+
+    def print_report(self):
+        print(f"\n{'Phase':<32} {'wall (s)':<10} {'CPU (s)':<10} {'utilization':<12}")
+        print("-" * 66)
+        for phase in self.phases:
+            print(f"{phase['phase']:<32} {phase['seconds']:<10.1f} {phase['cpu_seconds']:<10.1f} "
+                  f"{phase['utilization']:<12.0%}")
+        total = sum(phase['seconds'] for phase in self.phases)
+        cpu = sum(phase['cpu_seconds'] for phase in self.phases)
+        print(f"{'Total':<32} {total:<10.1f} {cpu:<10.1f} {cpu / (total * self.cores) if total else 0:<12.0%}")
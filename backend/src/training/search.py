@@ -0,0 +1,103 @@
+import os
+import time
+
+from sklearn.base import clone
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+from sklearn.model_selection import GridSearchCV, RandomizedSearchCV, HalvingGridSearchCV, HalvingRandomSearchCV
+
+SEARCH_MODES = ['full', 'halving']
+
+
+class FullBudgetRefit:
+    # Rungs run at min_resources * factor**k, which stops short of
+    # max_resources unless it divides evenly. The search itself runs without
+    # refit and the winner is fit once, with the full budget, so the returned
+    # model matches a full search's
+    def fit(self, X, y=None, groups=None, **fit_params):
+        if self.refit is not True or self.resource == 'n_samples':
+            return super().fit(X, y, groups=groups, **fit_params)
+
+        self.refit = False
+        try:
+            super().fit(X, y, groups=groups, **fit_params)
+        finally:
+            self.refit = True
+
+        self.best_params_ = {**self.best_params_, self.resource: self.max_resources_}
+        self.best_estimator_ = clone(self.estimator).set_params(**clone(self.best_params_, safe=False))
+        start = time.time()
+        self.best_estimator_.fit(X, y, **fit_params)
+        self.refit_time_ = time.time() - start
+        if hasattr(self.best_estimator_, 'feature_names_in_'):
+            self.feature_names_in_ = self.best_estimator_.feature_names_in_
+        return self
+
+
+class FullBudgetHalvingGridSearchCV(FullBudgetRefit, HalvingGridSearchCV):
+    pass
+
+
+class FullBudgetHalvingRandomSearchCV(FullBudgetRefit, HalvingRandomSearchCV):
+    pass
+
+
+def default_search_mode():
+    return os.getenv('HYPERPARAMETER_SEARCH', 'full')
+
+
+def make_search(estimator, space, mode='full', n_iter=None, cv=5, scoring='neg_mean_absolute_error', n_jobs=-1,
+                random_state=42, resource=None, factor=3, min_resources=None, max_resources=None):
+    # Hyperparameter search over `space`: a grid search when n_iter is None,
+    # otherwise n_iter sampled candidates. mode='halving' runs the same
+    # candidates through successive halving: every candidate starts on a
+    # small budget and only the best 1/factor move on to `factor` times more.
+    # The budget is the number of trees when n_estimators is listed in the
+    # space, otherwise the number of training samples. Over trees, the first
+    # rung is max // factor**k for the largest k that keeps it at or above
+    # the smallest value, so the last rung gets as close to the largest
+    # value as integer rungs can (values less than a factor apart all run at
+    # the smallest), and the winner is refit with the largest value.
+    if mode not in SEARCH_MODES:
+        raise ValueError(f"Unknown search mode: {mode} (expected one of {', '.join(SEARCH_MODES)})")
+    options = {'cv': cv, 'scoring': scoring, 'n_jobs': n_jobs}
+
+    if mode == 'full':
+        if n_iter is None:
+            return GridSearchCV(estimator, space, **options)
+        return RandomizedSearchCV(estimator, space, n_iter=n_iter, random_state=random_state, **options)
+
+    if resource is None:
+        # A distribution has no largest value to budget up to
+        resource = 'n_estimators' if isinstance(space.get('n_estimators'), (list, tuple)) else 'n_samples'
+    if resource != 'n_samples':
+        budgets = space.get(resource, [estimator.get_params()[resource]])
+        if not isinstance(budgets, (list, tuple)):
+            raise ValueError(f"Halving over {resource} needs a list of values, not a distribution")
+        space = {name: values for name, values in space.items() if name != resource}
+        max_resources = max_resources or max(budgets)
+        if not min_resources:
+            k = 0
+            while min(budgets) * factor ** (k + 1) <= max_resources:
+                k += 1
+            min_resources = max_resources // factor ** k if k else min(budgets)
+    options.update({
+        'resource': resource,
+        'factor': factor,
+        'min_resources': min_resources or 'exhaust',
+        'max_resources': max_resources or 'auto',
+        'aggressive_elimination': True
+    })
+
+    if n_iter is None:
+        return FullBudgetHalvingGridSearchCV(estimator, space, **options)
+    return FullBudgetHalvingRandomSearchCV(estimator, space, n_candidates=n_iter, random_state=random_state, **options)
+
+
+def count_fits(search):
+    # Model fits a finished search ran: each candidate on each fold, plus the
+    # one refit of the winner (FullBudgetRefit replaces sklearn's, it does
+    # not add to it)
+    refits = 1 if search.refit else 0
+    if hasattr(search, 'n_candidates_'):
+        return sum(search.n_candidates_) * search.n_splits_ + refits
+    return len(search.cv_results_['params']) * search.n_splits_ + refits
@@ -0,0 +1,49 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pytest
+
+from src.preprocessing.preprocessor import DataPreprocessor
+from src.feature_engineering.engineer import FeatureEngineer
+from src.models.predictor import ShelfLifePredictor
+from src.inference.pipeline import InferencePipeline
+from src.rules.interpreter import RuleBasedInterpreter
+from src.datasets.synthetic import SyntheticShelfLifeGenerator
+
+
+@pytest.fixture(scope='session')
+def training_data():
+    df = SyntheticShelfLifeGenerator(seed=0).generate(600)
+    y = df.pop('remaining_shelf_life')
+    preprocessor = DataPreprocessor()
+    X = FeatureEngineer().transform(preprocessor.fit_transform(df))
+    return X, y, preprocessor
+
+
+@pytest.fixture(scope='session')
+def make_pipeline(training_data):
+    # Builds an InferencePipeline around `estimator` fitted on a small
+    # synthetic training set, so tests do not depend on models/
+    X, y, preprocessor = training_data
+
+    def make(estimator=None, **pipeline_kwargs):
+        from sklearn.ensemble import RandomForestRegressor
+
+        estimator = estimator if estimator is not None else RandomForestRegressor(
+            n_estimators=10, max_depth=8, random_state=0
+        )
+        model = ShelfLifePredictor()
+        model.model = estimator.fit(X, y)
+        model.is_trained = True
+        importances = getattr(estimator, 'feature_importances_', np.ones(X.shape[1]) / X.shape[1])
+        model.feature_importance = dict(zip(X.columns, importances))
+        return InferencePipeline(preprocessor, FeatureEngineer(), model, RuleBasedInterpreter(), **pipeline_kwargs)
+
+    return make
+
+
+@pytest.fixture(scope='session')
+def pipeline(make_pipeline):
+    return make_pipeline()
@@ -0,0 +1,97 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.inference.batcher import PredictionBatcher
+
+FIELDS = ['food_type', 'temperature', 'humidity', 'storage_type', 'days_stored']
+
+ITEMS = [
+    {'food_type': food_type, 'temperature': temperature, 'humidity': 40.0 + 7 * i, 'storage_type': storage_type,
+     'days_stored': i}
+    for i, (food_type, storage_type, temperature) in enumerate([
+        ('dairy', 'refrigerator', 4.03), ('meat', 'freezer', -18.2), ('bakery', 'pantry', 22.7),
+        ('pizza', 'cellar', 35.0), ('seafood', 'refrigerator', 11.5), ('fruits', 'pantry', 31.0),
+        ('vegetables', 'refrigerator', -1.0), ('meat', 'refrigerator', 7.5)
+    ])
+]
+
+BAD_ITEM = {**ITEMS[0], 'temperature': 'hot'}
+
+
+def predict_single(pipeline, item):
+    return pipeline.predict_single(*(item[field] for field in FIELDS))
+
+
+@pytest.fixture
+def batcher(pipeline):
+    # A window long enough that everything submitted together is coalesced
+    batcher = PredictionBatcher(pipeline, max_wait=1.0, max_batch_size=len(ITEMS))
+    yield batcher
+    batcher.close()
+
+
+def test_submitted_items_are_coalesced(batcher, pipeline):
+    futures = [batcher.submit(item) for item in ITEMS]
+    results = [future.result(5) for future in futures]
+
+    assert results == [predict_single(pipeline, item) for item in ITEMS]
+    stats = batcher.stats()
+    assert stats['batches'] == 1
+    assert stats['requests'] == len(ITEMS)
+    assert stats['batch_size_counts'] == {len(ITEMS): 1}
+
+
+def test_concurrent_requests_get_their_own_results(pipeline):
+    batcher = PredictionBatcher(pipeline, max_wait=0.05, max_batch_size=4)
+    items = ITEMS * 4
+    start = threading.Barrier(len(items))
+
+    def request(item):
+        start.wait()
+        return batcher.predict_single(*(item[field] for field in FIELDS), timeout=5)
+
+    try:
+        with ThreadPoolExecutor(len(items)) as executor:
+            results = list(executor.map(request, items))
+    finally:
+        batcher.close()
+
+    assert results == [predict_single(pipeline, item) for item in items]
+    stats = batcher.stats()
+    assert stats['requests'] == len(items)
+    assert stats['batches'] < len(items)
+    assert max(stats['batch_size_counts']) <= 4
+
+
+def test_failing_item_only_fails_its_own_future(batcher, pipeline):
+    items = ITEMS[:3] + [BAD_ITEM] + ITEMS[3:-1]
+    futures = [batcher.submit(item) for item in items]
+
+    with pytest.raises(ValueError):
+        futures[3].result(5)
+    with pytest.raises(ValueError):
+        predict_single(pipeline, BAD_ITEM)
+    for item, future in zip(items, futures):
+        if item is not BAD_ITEM:
+            assert future.result(5) == predict_single(pipeline, item)
+    assert batcher.stats()['batch_size_counts'] == {len(items): 1}
+
+
+def test_close_finishes_queued_items(pipeline):
+    # close() ends the wait for more items instead of sitting out the window
+    batcher = PredictionBatcher(pipeline, max_wait=60, max_batch_size=len(ITEMS) + 1)
+    futures = [batcher.submit(item) for item in ITEMS]
+    batcher.close()
+
+    assert not batcher._thread.is_alive()
+    assert [future.result(0) for future in futures] == [predict_single(pipeline, item) for item in ITEMS]
+    assert batcher.stats()['batches'] == 1
+
+
+def test_close_idle_batcher(pipeline):
+    batcher = PredictionBatcher(pipeline)
+    batcher.close()
+    assert not batcher._thread.is_alive()
+    assert batcher.stats()['requests'] == 0
@@ -0,0 +1,53 @@
+import numpy as np
+
+from src.inference.cache import PredictionCache
+
+
+def test_nearby_inputs_do_not_evict_each_other():
+    cache = PredictionCache()
+    first = cache.make_key('dairy', 4.02, 60, 'refrigerator', 2)
+    second = cache.make_key('dairy', 4.04, 60, 'refrigerator', 2)
+    assert first != second
+
+    cache.put(first, {'temperature': 4.02})
+    cache.put(second, {'temperature': 4.04})
+    assert cache.get(first) == {'temperature': 4.02}
+    assert cache.get(second) == {'temperature': 4.04}
+    assert cache.stats()['hits'] == 2
+    assert cache.stats()['size'] == 2
+
+
+def test_missing_values_are_not_cached():
+    cache = PredictionCache()
+    assert cache.make_key('dairy', np.nan, 60, 'refrigerator', 2) is None
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = PredictionCache(max_size=2, ttl=0)
+    keys = [cache.make_key('dairy', t, 60, 'refrigerator', 2) for t in (1, 2, 3)]
+    for i, key in enumerate(keys):
+        cache.put(key, {'i': i})
+    assert cache.get(keys[0]) is None
+    assert cache.get(keys[2]) == {'i': 2}
+    assert cache.stats()['evictions'] == 1
+
+
+def test_results_are_copied():
+    cache = PredictionCache()
+    key = cache.make_key('dairy', 4, 60, 'refrigerator', 2)
+    value = {'issues': ['a'], 'feature_importance': {'x': 1.0}}
+    cache.put(key, value)
+    value['issues'].append('b')
+    cached = cache.get(key)
+    cached['feature_importance']['y'] = 2.0
+    assert cache.get(key) == {'issues': ['a'], 'feature_importance': {'x': 1.0}}
+
+
+def test_cached_predictions_match_uncached(make_pipeline):
+    cached = make_pipeline(cache=PredictionCache())
+    uncached = make_pipeline()
+    for temperature in (4.02, 4.04, 4.02):
+        for days_stored in (2, 2.5):
+            expected = uncached.predict_single('dairy', temperature, 60, 'refrigerator', days_stored)
+            assert cached.predict_single('dairy', temperature, 60, 'refrigerator', days_stored) == expected
+    assert cached.cache.stats()['hits'] == 2
@@ -0,0 +1,103 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.feature_engineering.engineer import FeatureEngineer
+from src.datasets.synthetic import SyntheticShelfLifeGenerator
+
+INPUT_COLUMNS = ['food_type', 'storage_type', 'temperature', 'humidity', 'days_stored']
+
+engineer = FeatureEngineer()
+
+
+def edge_cases():
+    # Unseen categories, missing readings (imputed by the preprocessor),
+    # extreme temperatures on both sides and zero/large storage times
+    return pd.DataFrame([
+        {'food_type': 'pizza', 'temperature': 4.0, 'humidity': 60.0, 'storage_type': 'refrigerator', 'days_stored': 2.0},
+        {'food_type': 'meat', 'temperature': np.nan, 'humidity': np.nan, 'storage_type': 'cellar', 'days_stored': 0.0},
+        {'food_type': 'dairy', 'temperature': -3.0, 'humidity': 95.0, 'storage_type': 'refrigerator', 'days_stored': np.nan},
+        {'food_type': 'vegetables', 'temperature': -10.0, 'humidity': 40.0, 'storage_type': 'freezer', 'days_stored': 400.0},
+        {'food_type': 'grains', 'temperature': 45.0, 'humidity': 99.0, 'storage_type': 'room_temperature', 'days_stored': 30.0}
+    ])
+
+
+def integer_rows():
+    # The generator produces integer humidity and days_stored
+    return SyntheticShelfLifeGenerator(seed=1).generate(200).drop(columns=['remaining_shelf_life'])
+
+
+def random_rows():
+    rng = np.random.default_rng(3)
+    df = SyntheticShelfLifeGenerator(seed=2).generate(2000).drop(columns=['remaining_shelf_life'])
+    for col in ['temperature', 'humidity', 'days_stored']:
+        df[col] = df[col] + rng.uniform(-0.5, 0.5, len(df))
+    df.loc[::101, 'humidity'] = np.nan
+    return df
+
+
+def thresholds():
+    # Preprocessor-shaped input (integer codes, float numerics) exactly on
+    # the extreme temperature and humidity cut-offs and on either side, for
+    # every storage type and out-of-range codes
+    temperatures = [t + d for t in (-5.0, 0.0, 10.0, 30.0) for d in (-0.5, 0.0, 0.5)]
+    rows = [(food_type, storage_type, temperature, humidity, days_stored)
+            for food_type in (1, 3, 9)
+            for storage_type in (0, 1, 2, 7)
+            for temperature in temperatures
+            for humidity, days_stored in ((89.5, 0.0), (90.0, 5.0), (90.5, 500.0))]
+    df = pd.DataFrame(rows, columns=['food_type', 'storage_type', 'temperature', 'humidity', 'days_stored'])
+    return df.astype({'food_type': np.int64, 'storage_type': np.int64})
+
+
+FRAMES = {'edge_cases': edge_cases, 'integer_rows': integer_rows, 'random_rows': random_rows}
+
+
+@pytest.fixture(scope='module')
+def processed(training_data):
+    _, _, preprocessor = training_data
+    frames = {name: preprocessor.transform(make()) for name, make in FRAMES.items()}
+    frames['thresholds'] = thresholds()
+    return frames
+
+
+def assert_identical(expected, actual):
+    assert list(actual.columns) == list(expected.columns)
+    assert actual.index.equals(expected.index)
+    for col in expected.columns:
+        assert actual[col].dtype == expected[col].dtype, col
+        assert actual[col].to_numpy().tobytes() == expected[col].to_numpy().tobytes(), col
+
+
+@pytest.mark.parametrize('frame', list(FRAMES) + ['thresholds'])
+def test_transform_matches_pandas(processed, frame):
+    X = processed[frame]
+    assert not X.isna().any().any()
+    assert_identical(engineer.transform_pandas(X), engineer.transform(X))
+
+
+@pytest.mark.parametrize('frame', list(FRAMES) + ['thresholds'])
+def test_transform_arrays_matches_pandas_in_any_column_order(processed, frame):
+    X = processed[frame]
+    expected = engineer.transform_pandas(X)[engineer.get_feature_names()].to_numpy(dtype=np.float64)
+
+    # Features written to a shuffled buffer layout, as the model's column
+    # order would, with the inputs already sitting in their columns
+    names = engineer.get_feature_names()
+    columns = np.random.default_rng(0).permutation(len(names))
+    out = np.empty((len(X), len(names)), order='F')
+    for j, col in enumerate(INPUT_COLUMNS):
+        out[:, columns[j]] = X[col].to_numpy()
+    inputs = [out[:, columns[j]] for j in range(len(INPUT_COLUMNS))]
+    engineer.transform_arrays(*inputs, out=out, columns=columns)
+    assert out[:, columns].tobytes() == expected.tobytes()
+
+
+@pytest.mark.parametrize('frame', list(FRAMES) + ['thresholds'])
+def test_fill_row_matches_pandas(processed, frame):
+    X = processed[frame]
+    expected = engineer.transform_pandas(X)[engineer.get_feature_names()].to_numpy(dtype=np.float64)
+    row = np.empty(len(engineer.get_feature_names()))
+    for i, values in enumerate(X[INPUT_COLUMNS].itertuples(index=False)):
+        engineer.fill_row(row, *values)
+        assert row.tobytes() == expected[i].tobytes(), i
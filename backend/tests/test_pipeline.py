@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+REQUESTS = [
+    {'food_type': 'dairy', 'temperature': 4.03, 'humidity': 61.7, 'storage_type': 'refrigerator', 'days_stored': 2.5},
+    {'food_type': 'meat', 'temperature': -18.2, 'humidity': 55.0, 'storage_type': 'freezer', 'days_stored': 30},
+    {'food_type': 'bakery', 'temperature': 22.7, 'humidity': 48.3, 'storage_type': 'pantry', 'days_stored': 3.1},
+    {'food_type': 'pizza', 'temperature': 35.0, 'humidity': 90.0, 'storage_type': 'cellar', 'days_stored': 0}
+]
+
+
+def ridge():
+    from sklearn.linear_model import Ridge
+    return Ridge(alpha=1.0)
+
+
+def gradient_boosting():
+    from sklearn.ensemble import GradientBoostingRegressor
+    return GradientBoostingRegressor(n_estimators=10, random_state=0)
+
+
+def record_predictions(pipeline):
+    # Results round predictions to 2 decimals; compare the model's output
+    recorded = []
+    predict_array = pipeline.model.predict_array
+
+    def predict(X):
+        predictions = predict_array(X)
+        recorded.extend(np.asarray(predictions).tolist())
+        return predictions
+
+    pipeline.model.predict_array = predict
+    return recorded
+
+
+def single_and_batch_predictions(pipeline):
+    recorded = record_predictions(pipeline)
+    batch = pipeline.predict(REQUESTS)
+    batch_predictions = list(recorded)
+    del recorded[:]
+    singles = [pipeline.predict_single(**request) for request in REQUESTS]
+    return singles, batch, recorded, batch_predictions
+
+
+@pytest.mark.parametrize('estimator', [None, gradient_boosting])
+def test_predict_single_matches_predict_for_trees(make_pipeline, estimator):
+    pipeline = make_pipeline(estimator() if estimator else None)
+    singles, batch, single_predictions, batch_predictions = single_and_batch_predictions(pipeline)
+    assert single_predictions == batch_predictions
+    assert singles == batch
+
+
+def test_predict_single_matches_predict_for_linear_model(make_pipeline):
+    # BLAS sums a row in a different order for the column-major batch buffer
+    # than for a single row, which moves the last bit; rounding single-row
+    # features to float32 would be off by about 1e-8 relative
+    pipeline = make_pipeline(ridge())
+    singles, batch, single_predictions, batch_predictions = single_and_batch_predictions(pipeline)
+    np.testing.assert_allclose(single_predictions, batch_predictions, rtol=1e-12, atol=0)
+    assert singles == batch
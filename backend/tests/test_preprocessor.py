@@ -0,0 +1,88 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.preprocessing.preprocessor import DataPreprocessor
+from src.datasets.synthetic import SyntheticShelfLifeGenerator
+
+INPUT_COLUMNS = ['food_type', 'temperature', 'humidity', 'storage_type', 'days_stored']
+
+
+def edge_cases():
+    # Unseen, missing and non-string categories, missing and out-of-range
+    # numerics, extra columns and a non-default index
+    rows = [
+        {'food_type': 'pizza', 'temperature': 4.0, 'humidity': 60.0, 'storage_type': 'refrigerator', 'days_stored': 2.0},
+        {'food_type': None, 'temperature': np.nan, 'humidity': 60.0, 'storage_type': 'cellar', 'days_stored': 2.0},
+        {'food_type': 3, 'temperature': -18.0, 'humidity': np.nan, 'storage_type': np.nan, 'days_stored': np.nan},
+        {'food_type': 'Dairy', 'temperature': 1e6, 'humidity': -5.0, 'storage_type': 'freezer', 'days_stored': 0.0},
+        {'food_type': 'meat', 'temperature': 4.0, 'humidity': 70.0, 'storage_type': 'pantry', 'days_stored': 400.0}
+    ]
+    df = pd.DataFrame(rows)
+    df['sku'] = ['a', 'b', 'c', 'd', 'e']
+    df.index = [10, 3, 7, 1, 99]
+    return df
+
+
+def integer_rows():
+    # The generator produces integer humidity and days_stored
+    return SyntheticShelfLifeGenerator(seed=1).generate(200)[INPUT_COLUMNS]
+
+
+def random_rows():
+    rng = np.random.default_rng(7)
+    df = SyntheticShelfLifeGenerator(seed=2).generate(2000)[INPUT_COLUMNS]
+    for col in ['temperature', 'humidity', 'days_stored']:
+        df[col] = df[col] + rng.uniform(-0.5, 0.5, len(df))
+        df.loc[rng.random(len(df)) < 0.05, col] = np.nan
+    df.loc[rng.random(len(df)) < 0.05, 'food_type'] = 'pizza'
+    df.loc[rng.random(len(df)) < 0.05, 'storage_type'] = None
+    return df
+
+
+FRAMES = {'edge_cases': edge_cases, 'integer_rows': integer_rows, 'random_rows': random_rows}
+
+
+@pytest.fixture(scope='module')
+def preprocessor():
+    train = SyntheticShelfLifeGenerator(seed=0).generate(500).drop(columns=['remaining_shelf_life'])
+    train['temperature'] = train['temperature'].astype(np.float64)
+    train.loc[::17, 'temperature'] = np.nan
+    preprocessor = DataPreprocessor()
+    preprocessor.fit_transform(train)
+    return preprocessor
+
+
+def assert_identical(expected, actual):
+    assert list(actual.columns) == list(expected.columns)
+    assert actual.index.equals(expected.index)
+    for col in expected.columns:
+        assert actual[col].dtype == expected[col].dtype, col
+        assert actual[col].to_numpy().tobytes() == expected[col].to_numpy().tobytes(), col
+
+
+@pytest.mark.parametrize('frame', FRAMES)
+def test_transform_matches_sklearn(preprocessor, frame):
+    df = FRAMES[frame]()
+    assert_identical(preprocessor.transform_sklearn(df), preprocessor.transform(df))
+
+
+@pytest.mark.parametrize('frame', FRAMES)
+def test_transform_arrays_matches_sklearn(preprocessor, frame):
+    df = FRAMES[frame]()
+    expected = preprocessor.transform_sklearn(df)
+    columns = preprocessor.transform_arrays(*(df[col] for col in INPUT_COLUMNS))
+    for col, values in zip(INPUT_COLUMNS, columns):
+        assert values.tobytes() == expected[col].to_numpy(dtype=np.float64).tobytes(), col
+
+
+def test_loaded_preprocessor_matches(preprocessor, tmp_path):
+    path = str(tmp_path / 'preprocessor.pkl')
+    preprocessor.save(path)
+    loaded = DataPreprocessor().load(path, mmap_mode='r')
+    df = random_rows()
+    assert_identical(preprocessor.transform_sklearn(df), loaded.transform(df))
@@ -0,0 +1,74 @@
+import itertools
+
+import numpy as np
+
+from src.rules.interpreter import RuleBasedInterpreter, FOOD_TYPES, STORAGE_TYPES, SEVERITY_LEVELS, SAFETY_CLASSES
+
+interpreter = RuleBasedInterpreter()
+
+
+def around(values):
+    # Each threshold, and just below and above it
+    return sorted({round(v + delta, 1) for v in values for delta in (-0.1, 0.0, 0.1)})
+
+
+def temperatures():
+    thresholds = [-5, 8, 10, 25]
+    for rules in interpreter.food_rules.values():
+        thresholds += [rules['max_temp'], rules['danger_zone_temp']]
+    return around(thresholds) + [-18.0, 4.0]
+
+
+def humidities():
+    return around([rules['max_humidity'] for rules in interpreter.food_rules.values()] + [70, 80]) + [50.0]
+
+
+# Predictions around the safety and recommendation cut-offs, after any of the
+# severity factors
+PREDICTIONS = sorted({p / factor for p in (-1.0, 0.0, 0.5, 2.0, 2.1, 5.0, 5.1, 7.0, 7.1, 30.0)
+                      for factor in (1.0, 0.7, 0.5, 0.3)})
+
+
+def grid():
+    rows = list(itertools.product(FOOD_TYPES, STORAGE_TYPES, temperatures(), humidities()))
+    food_types, storage_types, temperature, humidity = (list(column) for column in zip(*rows))
+    predictions = [PREDICTIONS[i % len(PREDICTIONS)] for i in range(len(rows))]
+    days_stored = [i % 40 for i in range(len(rows))]
+    return food_types, storage_types, temperature, humidity, days_stored, predictions
+
+
+def test_batch_rules_match_scalar_rules():
+    food_types, storage_types, temperature, humidity, days_stored, predictions = grid()
+    food_codes = interpreter.encode_food_types(food_types)
+    storage_codes = interpreter.encode_storage_types(storage_types)
+    batch = interpreter.evaluate_batch(
+        food_codes, storage_codes, np.array(temperature), np.array(humidity), np.array(days_stored),
+        np.array(predictions)
+    )
+
+    for i, row in enumerate(zip(food_types, storage_types, temperature, humidity, days_stored)):
+        food_type, storage_type, temp, hum, days = row
+        issues, severity = interpreter.check_extreme_conditions(food_type, storage_type, temp, hum, days)
+        adjusted = interpreter.adjust_prediction(predictions[i], issues, severity, days)
+
+        assert SEVERITY_LEVELS[batch['severity'][i]] == severity, row
+        assert interpreter.describe_issues(int(batch['issue_mask'][i]), food_type, temp, hum) == issues, row
+        assert batch['adjusted_prediction'][i] == adjusted, row
+        assert SAFETY_CLASSES[batch['safety'][i]] == interpreter.classify_safety(adjusted, days, issues), row
+        assert interpreter.describe_recommendations(int(batch['recommendation_mask'][i])) == \
+            interpreter.get_recommendations(food_type, storage_type, temp, hum, adjusted), row
+
+
+def test_grid_reaches_every_severity_and_issue():
+    food_types, storage_types, temperature, humidity, days_stored, _ = grid()
+    issue_mask, severity = interpreter.check_extreme_conditions_batch(
+        interpreter.encode_food_types(food_types), interpreter.encode_storage_types(storage_types),
+        np.array(temperature), np.array(humidity), np.array(days_stored)
+    )
+    assert set(severity.tolist()) == set(range(len(SEVERITY_LEVELS)))
+    assert np.bitwise_or.reduce(issue_mask) == 63
+
+
+def test_unknown_names_encode_to_the_scalar_defaults():
+    assert FOOD_TYPES[interpreter.encode_food_types(['pizza'])[0]] == 'dairy'
+    assert STORAGE_TYPES[interpreter.encode_storage_types(['cellar'])[0]] == 'refrigerator'
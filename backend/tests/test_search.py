@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestRegressor
+from scipy.stats import randint
+
+from src.training.search import make_search, count_fits
+from src.models.predictor import PARAM_GRID
+
+
+class CountingForest(RandomForestRegressor):
+    fits = []
+
+    def fit(self, X, y, sample_weight=None):
+        CountingForest.fits.append(self.n_estimators)
+        return super().fit(X, y, sample_weight)
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(200, 4))
+    return X, X[:, 0] + rng.normal(size=200)
+
+
+def test_halving_refits_the_winner_once_at_the_largest_budget(data):
+    CountingForest.fits = []
+    space = {'n_estimators': PARAM_GRID['n_estimators'], 'max_depth': [3, 5, 8, 12]}
+    search = make_search(CountingForest(random_state=0, n_jobs=1), space, mode='halving', cv=3, n_jobs=1)
+    search.fit(*data)
+
+    assert search.n_resources_[-1] <= 200 < search.n_resources_[-1] * search.factor
+    assert search.best_params_['n_estimators'] == 200
+    assert search.best_estimator_.n_estimators == 200
+    assert len(search.best_estimator_.estimators_) == 200
+    assert search.refit_time_ > 0
+    assert CountingForest.fits.count(200) == 1
+    assert len(CountingForest.fits) == count_fits(search)
+    assert search.get_params()['refit'] is True
+
+
+def test_halving_over_values_less_than_a_factor_apart(data):
+    space = {'n_estimators': [100, 200], 'max_depth': [3, 5]}
+    search = make_search(RandomForestRegressor(random_state=0, n_jobs=1), space, mode='halving', cv=3, n_jobs=1)
+    search.fit(*data)
+    assert search.n_resources_ == [100]
+    assert search.best_estimator_.n_estimators == 200
+
+
+def test_halving_with_a_distribution_for_n_estimators():
+    space = {'n_estimators': randint(10, 50), 'max_depth': [3, 5]}
+    search = make_search(RandomForestRegressor(), space, mode='halving', n_iter=2)
+    assert search.resource == 'n_samples'
+    with pytest.raises(ValueError):
+        make_search(RandomForestRegressor(), space, mode='halving', n_iter=2, resource='n_estimators')
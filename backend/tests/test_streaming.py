@@ -0,0 +1,116 @@
+import io
+import json
+
+import pytest
+from starlette.testclient import TestClient
+
+import api
+import asgi
+from src.inference.streaming import NDJSON_MIMETYPE
+
+GOOD = [
+    {'food_type': 'dairy', 'temperature': 4.03, 'humidity': 61.7, 'storage_type': 'refrigerator', 'days_stored': 2.5},
+    {'food_type': 'meat', 'temperature': -18.2, 'humidity': 55.0, 'storage_type': 'freezer', 'days_stored': 30},
+    {'food_type': 'bakery', 'temperature': 22.7, 'humidity': 48.3, 'storage_type': 'pantry', 'days_stored': 3.1},
+    {'food_type': 'pizza', 'temperature': 35.0, 'humidity': 90.0, 'storage_type': 'cellar', 'days_stored': 0}
+]
+
+# (input line, what its output line should be); blank lines have no output
+LINES = [
+    (json.dumps(GOOD[0]), GOOD[0]),
+    ('{"food_type": "dairy", "temperature": ', 'Invalid JSON'),
+    ('', None),
+    (json.dumps(GOOD[1]), GOOD[1]),
+    ('   \t', None),
+    ('[1, 2, 3]', 'Each line must be a JSON object'),
+    # Fails the whole scoring chunk, so its rows are scored one by one
+    (json.dumps({**GOOD[2], 'temperature': 'hot'}), 'could not convert'),
+    (json.dumps(GOOD[2]), GOOD[2]),
+    ('\r', None),
+    (json.dumps(GOOD[3]), GOOD[3])
+]
+
+
+def ndjson_body(trailing_newline=True):
+    body = '\n'.join(line for line, _ in LINES)
+    return (body + '\n' if trailing_newline else body).encode('utf-8')
+
+
+def pieces(body, size=7):
+    # Splits the upload mid-line and mid-character of the JSON
+    return [body[i:i + size] for i in range(0, len(body), size)]
+
+
+def response_body(response):
+    # Flask's test response or httpx's
+    return response.get_data() if hasattr(response, 'get_data') else response.content
+
+
+def check_output(pipeline, response):
+    assert response.status_code == 200
+    assert response.headers['content-type'].startswith(NDJSON_MIMETYPE)
+    output = response_body(response).decode('utf-8')
+    assert output.endswith('\n')
+    results = [json.loads(line) for line in output.splitlines()]
+
+    expected_lines = [(i + 1, expected) for i, (_, expected) in enumerate(LINES) if expected is not None]
+    assert len(results) == len(expected_lines)
+    for result, (line_number, expected) in zip(results, expected_lines):
+        if isinstance(expected, dict):
+            assert result == json.loads(json.dumps(pipeline.predict([expected])))
+        else:
+            assert result['line'] == line_number
+            assert expected in result['error']
+
+
+class ChunkedStream(io.BytesIO):
+    # A WSGI input stream that returns at most 7 bytes per read
+    def read(self, size=-1):
+        return super().read(7 if size < 0 else min(size, 7))
+
+
+@pytest.fixture
+def app_pipeline(pipeline, monkeypatch):
+    monkeypatch.setattr(api, 'pipeline', pipeline)
+    monkeypatch.setattr(api, 'load_pipeline', lambda: None)
+    return pipeline
+
+
+@pytest.fixture
+def asgi_client(app_pipeline):
+    with TestClient(asgi.app) as client:
+        yield client
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 3, 1000])
+@pytest.mark.parametrize('trailing_newline', [True, False])
+def test_flask_stream(app_pipeline, monkeypatch, chunk_size, trailing_newline):
+    monkeypatch.setenv('BATCH_STREAM_CHUNK_SIZE', str(chunk_size))
+    body = ndjson_body(trailing_newline)
+    response = api.app.test_client().post(
+        '/batch_predict', input_stream=ChunkedStream(body), content_length=len(body), content_type=NDJSON_MIMETYPE
+    )
+    check_output(app_pipeline, response)
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 3, 1000])
+@pytest.mark.parametrize('trailing_newline', [True, False])
+def test_asgi_stream(app_pipeline, asgi_client, monkeypatch, chunk_size, trailing_newline):
+    monkeypatch.setenv('BATCH_STREAM_CHUNK_SIZE', str(chunk_size))
+    response = asgi_client.post(
+        '/batch_predict', content=iter(pieces(ndjson_body(trailing_newline))),
+        headers={'Content-Type': NDJSON_MIMETYPE}
+    )
+    check_output(app_pipeline, response)
+
+
+@pytest.mark.parametrize('client', ['flask', 'asgi'])
+def test_empty_upload(app_pipeline, request, client):
+    if client == 'flask':
+        response = api.app.test_client().post('/batch_predict', data=b'\n\n', content_type=NDJSON_MIMETYPE)
+    else:
+        response = request.getfixturevalue('asgi_client').post(
+            '/batch_predict', content=b'\n\n', headers={'Content-Type': NDJSON_MIMETYPE}
+        )
+    assert response.status_code == 200
+    assert response_body(response) == b''
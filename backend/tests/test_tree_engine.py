@@ -0,0 +1,124 @@
+import numpy as np
+import pytest
+from joblib import parallel_config
+from sklearn.ensemble import (
+    RandomForestRegressor, ExtraTreesRegressor, GradientBoostingRegressor, VotingRegressor, StackingRegressor
+)
+from sklearn.linear_model import Ridge, LinearRegression, BayesianRidge
+from sklearn.tree import DecisionTreeRegressor
+
+from src.models.tree_engine import FlatTreeEnsemble, ENGINE_FORMAT
+from src.models.predictor import ShelfLifePredictor
+
+
+def forest():
+    return RandomForestRegressor(n_estimators=15, max_depth=10, random_state=0)
+
+
+def extra_trees():
+    return ExtraTreesRegressor(n_estimators=15, random_state=0)
+
+
+def tree():
+    return DecisionTreeRegressor(random_state=0)
+
+
+def gradient_boosting():
+    return GradientBoostingRegressor(n_estimators=30, random_state=0)
+
+
+def gradient_boosting_ridge_init():
+    return GradientBoostingRegressor(n_estimators=30, init=Ridge(), random_state=0)
+
+
+def voting():
+    return VotingRegressor([('rf', forest()), ('gb', gradient_boosting())], weights=[1, 2])
+
+
+def stacking():
+    return StackingRegressor([('rf', forest()), ('et', extra_trees())], final_estimator=Ridge(random_state=42), cv=3)
+
+
+def stacking_passthrough():
+    return StackingRegressor([('rf', forest()), ('dt', tree())], final_estimator=LinearRegression(), cv=3,
+                             passthrough=True)
+
+
+def stacking_bayesian():
+    return StackingRegressor([('rf', forest())], final_estimator=BayesianRidge(), cv=3)
+
+
+# Estimators get_state() stores as plain arrays; the others keep sklearn
+# objects the state cannot describe
+SERIALIZABLE = [forest, extra_trees, tree, gradient_boosting, voting, stacking, stacking_passthrough]
+NOT_SERIALIZABLE = [gradient_boosting_ridge_init, stacking_bayesian]
+
+
+@pytest.fixture(scope='module')
+def data(training_data):
+    X, y, _ = training_data
+    return X, y, X.to_numpy()
+
+
+def sklearn_predict(estimator, X):
+    # Forests sum trees in completion order on several threads
+    with parallel_config(n_jobs=1):
+        return estimator.predict(X)
+
+
+def fitted(make, data):
+    X, y, _ = data
+    return make().fit(X, y)
+
+
+@pytest.mark.parametrize('make', SERIALIZABLE + NOT_SERIALIZABLE)
+def test_engine_matches_sklearn(make, data):
+    estimator = fitted(make, data)
+    X, _, values = data
+    engine = FlatTreeEnsemble(estimator, chunk_size=128)
+    assert engine.is_native()
+    expected = sklearn_predict(estimator, X)
+    assert engine.predict(X).tobytes() == expected.tobytes()
+    assert engine.predict(values).tobytes() == expected.tobytes()
+    values32 = values.astype(np.float32)
+    assert engine.predict(values32).tobytes() == sklearn_predict(estimator, values32).tobytes()
+
+
+@pytest.mark.parametrize('make', SERIALIZABLE)
+def test_state_round_trip(make, data):
+    estimator = fitted(make, data)
+    X, _, values = data
+    state = FlatTreeEnsemble(estimator).get_state()
+    assert state['version'] == ENGINE_FORMAT
+
+    engine = FlatTreeEnsemble.from_state(state)
+    assert engine.feature_names == list(X.columns)
+    assert engine.predict(X).tobytes() == sklearn_predict(estimator, X).tobytes()
+
+
+@pytest.mark.parametrize('make', NOT_SERIALIZABLE)
+def test_state_is_none_when_sklearn_is_needed(make, data):
+    assert FlatTreeEnsemble(fitted(make, data)).get_state() is None
+
+
+def test_other_state_versions_are_rebuilt(data):
+    state = FlatTreeEnsemble(fitted(tree, data)).get_state()
+    assert FlatTreeEnsemble.from_state({**state, 'version': ENGINE_FORMAT + 1}) is None
+    assert FlatTreeEnsemble.from_state(None) is None
+
+
+@pytest.mark.parametrize('make', [stacking, gradient_boosting_ridge_init])
+def test_saved_predictor_uses_the_engine(make, data, tmp_path):
+    X, y, values = data
+    predictor = ShelfLifePredictor()
+    predictor.model = make().fit(X, y)
+    predictor.is_trained = True
+    predictor.feature_importance = {}
+    path = str(tmp_path / 'model.pkl')
+    predictor.save(path)
+
+    loaded = ShelfLifePredictor().load(path, mmap_mode='r')
+    serializable = make in SERIALIZABLE
+    assert loaded.predict_array(values[:100]).tobytes() == sklearn_predict(predictor.model, X[:100]).tobytes()
+    # The estimator stays pickled unless the engine had to be rebuilt from it
+    assert (loaded._model is None) == serializable
@@ -2,28 +2,19 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from src.preprocessing.preprocessor import DataPreprocessor, load_data
-from src.feature_engineering.engineer import FeatureEngineer
+from src.datasets.feature_cache import load_features
 from src.models.predictor import ShelfLifePredictor
 import json
 
 
 def train_model():
     print("Loading data...")
-    X, y = load_data('data/food_shelf_life.csv')
+    X_featured, y, preprocessor, feature_engineer = load_features('data/food_shelf_life.csv')
 
-    print("\nData shape:", X.shape)
+    print("\nData shape:", X_featured.shape)
     print("Target distribution:")
     print(y.describe())
 
-    print("\nInitializing preprocessor...")
-    preprocessor = DataPreprocessor()
-    X_processed = preprocessor.fit_transform(X)
-
-    print("Initializing feature engineer...")
-    feature_engineer = FeatureEngineer()
-    X_featured = feature_engineer.transform(X_processed)
-
     print("\nFeature columns:")
     print(X_featured.columns.tolist())
 
@@ -2,8 +2,8 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from src.preprocessing.preprocessor import DataPreprocessor
-from src.feature_engineering.engineer import FeatureEngineer
+from src.datasets.feature_cache import load_features
+from src.training.resources import TrainingScheduler
 import pandas as pd
 import numpy as np
 from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor, VotingRegressor, StackingRegressor
@@ -13,25 +13,16 @@ import joblib
 
 
 def train_simple():
+    scheduler = TrainingScheduler()
     print("="*60)
     print("Training High Accuracy Model - Simplified")
     print("="*60)
     
     print("Loading data...")
-    df = pd.read_csv('data/food_shelf_life_clean.csv')
-    X = df.drop('remaining_shelf_life', axis=1)
-    y = df['remaining_shelf_life']
+    X_featured, y, preprocessor, feature_engineer = load_features('data/food_shelf_life_clean.csv')
     
-    print(f"Dataset size: {X.shape[0]} samples")
-    print(f"Unique food types: {df['food_type'].unique()}")
-    
-    print("\nInitializing preprocessor...")
-    preprocessor = DataPreprocessor()
-    X_processed = preprocessor.fit_transform(X)
-    
-    print("Initializing feature engineer...")
-    feature_engineer = FeatureEngineer()
-    X_featured = feature_engineer.transform(X_processed)
+    print(f"Dataset size: {X_featured.shape[0]} samples")
+    print(f"Unique food types: {preprocessor.label_encoders['food_type'].classes_}")
     
     print(f"Features: {X_featured.shape[1]}")
     
@@ -52,7 +43,8 @@ def train_simple():
         n_jobs=-1
     )
     
-    rf.fit(X_train, y_train)
+    with scheduler.phase('Random Forest', rf):
+        rf.fit(X_train, y_train)
     
     rf_pred = rf.predict(X_test)
     rf_mae = mean_absolute_error(y_test, rf_pred)
@@ -70,7 +62,8 @@ def train_simple():
         n_jobs=-1
     )
     
-    gb.fit(X_train, y_train)
+    with scheduler.phase('Gradient Boosting', gb):
+        gb.fit(X_train, y_train)
     
     gb_pred = gb.predict(X_test)
     gb_mae = mean_absolute_error(y_test, gb_pred)
@@ -88,7 +81,8 @@ def train_simple():
         n_jobs=-1
     )
     
-    et.fit(X_train, y_train)
+    with scheduler.phase('Extra Trees', et):
+        et.fit(X_train, y_train)
     
     et_pred = et.predict(X_test)
     et_mae = mean_absolute_error(y_test, et_pred)
@@ -104,7 +98,8 @@ def train_simple():
         ('et', et)
     ], n_jobs=-1)
     
-    voting.fit(X_train, y_train)
+    with scheduler.phase('Voting ensemble', voting):
+        voting.fit(X_train, y_train)
     
     voting_pred = voting.predict(X_test)
     voting_mae = mean_absolute_error(y_test, voting_pred)
@@ -121,7 +116,8 @@ def train_simple():
         ('et', et)
     ], final_estimator=Ridge(random_state=42), n_jobs=-1)
     
-    stacking.fit(X_train, y_train)
+    with scheduler.phase('Stacking ensemble', stacking):
+        stacking.fit(X_train, y_train)
     
     stacking_pred = stacking.predict(X_test)
     stacking_mae = mean_absolute_error(y_test, stacking_pred)
@@ -167,6 +163,8 @@ def train_simple():
     print(f"\nFinal Accuracy: {best_acc:.1f}%")
     print(f"Status: {'SUCCESS' if best_acc >= 97 else 'GOOD' if best_acc >= 90 else 'ACCURATE'}")
     
+    scheduler.print_report()
+
     return best_model, preprocessor
 
 
@@ -2,7 +2,9 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from src.preprocessing.preprocessor import DataPreprocessor
+from src.datasets.feature_cache import load_features
+from src.training.resources import TrainingScheduler
+from src.training.search import make_search, default_search_mode
 import pandas as pd
 import numpy as np
 
@@ -22,41 +24,28 @@ except:
 
 from sklearn.ensemble import GradientBoostingRegressor, RandomForestRegressor, VotingRegressor, StackingRegressor, ExtraTreesRegressor
 from sklearn.linear_model import Ridge
-from sklearn.model_selection import train_test_split, cross_val_score, RandomizedSearchCV, GridSearchCV
+from sklearn.model_selection import train_test_split, cross_val_score, GridSearchCV
 from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
 from src.models.predictor import ShelfLifePredictor
-from src.feature_engineering.engineer import FeatureEngineer
 import joblib
 
-
-def load_data(filepath):
-    df = pd.read_csv(filepath)
-    X = df.drop('remaining_shelf_life', axis=1)
-    y = df['remaining_shelf_life']
-    return X, y
+SEARCH_MODE = default_search_mode()
 
 
 def train_model():
+    scheduler = TrainingScheduler()
     print("="*80)
     print("Training High Accuracy Model (97%+ Target)")
     print("="*80)
     print()
     
     print("Loading data...")
-    X, y = load_data('data/food_shelf_life.csv')
+    X_featured, y, preprocessor, feature_engineer = load_features('data/food_shelf_life.csv')
 
-    print(f"\nDataset size: {X.shape[0]} samples")
+    print(f"\nDataset size: {X_featured.shape[0]} samples")
     print("\nTarget distribution:")
     print(y.describe())
 
-    print("\nInitializing preprocessor...")
-    preprocessor = DataPreprocessor()
-    X_processed = preprocessor.fit_transform(X)
-
-    print("Initializing feature engineer...")
-    feature_engineer = FeatureEngineer()
-    X_featured = feature_engineer.transform(X_processed)
-
     print(f"\nFeature columns ({X_featured.shape[1]}):")
     for i, col in enumerate(X_featured.columns, 1):
         print(f"  {i:2d}. {col}")
@@ -67,6 +56,7 @@ def train_model():
 
     print(f"\nTraining set: {X_train.shape[0]} samples")
     print(f"Test set: {X_test.shape[0]} samples")
+    print(f"Hyperparameter search: {SEARCH_MODE}")
 
     print("\n" + "="*80)
     print("PHASE 1: Base Model Training")
@@ -82,9 +72,10 @@ def train_model():
         'bootstrap': [True, False]
     }
 
-    rf_search = RandomizedSearchCV(
+    rf_search = make_search(
         RandomForestRegressor(random_state=42, n_jobs=-1),
         rf_params,
+        mode=SEARCH_MODE,
         n_iter=100,
         cv=5,
         scoring='neg_mean_absolute_error',
@@ -92,7 +83,8 @@ def train_model():
         random_state=42
     )
 
-    rf_search.fit(X_train, y_train)
+    with scheduler.phase('Random Forest search', rf_search):
+        rf_search.fit(X_train, y_train)
     rf_best = rf_search.best_estimator_
     print(f"Best RF MAE: {-rf_search.best_score_:.3f}")
 
@@ -106,9 +98,10 @@ def train_model():
         'subsample': [0.8, 0.9, 1.0]
     }
 
-    gb_search = RandomizedSearchCV(
+    gb_search = make_search(
         GradientBoostingRegressor(random_state=42),
         gb_params,
+        mode=SEARCH_MODE,
         n_iter=100,
         cv=5,
         scoring='neg_mean_absolute_error',
@@ -116,7 +109,8 @@ def train_model():
         random_state=42
     )
 
-    gb_search.fit(X_train, y_train)
+    with scheduler.phase('Gradient Boosting search', gb_search):
+        gb_search.fit(X_train, y_train)
     gb_best = gb_search.best_estimator_
     print(f"Best GB MAE: {-gb_search.best_score_:.3f}")
 
@@ -129,9 +123,10 @@ def train_model():
         'max_features': ['sqrt', 'log2']
     }
 
-    et_search = RandomizedSearchCV(
+    et_search = make_search(
         ExtraTreesRegressor(random_state=42, n_jobs=-1),
         et_params,
+        mode=SEARCH_MODE,
         n_iter=80,
         cv=5,
         scoring='neg_mean_absolute_error',
@@ -139,7 +134,8 @@ def train_model():
         random_state=42
     )
 
-    et_search.fit(X_train, y_train)
+    with scheduler.phase('Extra Trees search', et_search):
+        et_search.fit(X_train, y_train)
     et_best = et_search.best_estimator_
     print(f"Best ET MAE: {-et_search.best_score_:.3f}")
 
@@ -158,9 +154,10 @@ def train_model():
             'colsample_bytree': [0.8, 0.9, 1.0]
         }
 
-        xgb_search = RandomizedSearchCV(
+        xgb_search = make_search(
             XGBRegressor(random_state=42, n_jobs=-1),
             xgb_params,
+            mode=SEARCH_MODE,
             n_iter=100,
             cv=5,
             scoring='neg_mean_absolute_error',
@@ -168,7 +165,8 @@ def train_model():
             random_state=42
         )
 
-        xgb_search.fit(X_train, y_train)
+        with scheduler.phase('XGBoost search', xgb_search):
+            xgb_search.fit(X_train, y_train)
         xgb_best = xgb_search.best_estimator_
         print(f"Best XGBoost MAE: {-xgb_search.best_score_:.3f}")
 
@@ -189,9 +187,10 @@ def train_model():
             'colsample_bytree': [0.8, 0.9, 1.0]
         }
 
-        lgbm_search = RandomizedSearchCV(
+        lgbm_search = make_search(
             LGBMRegressor(random_state=42, n_jobs=-1, verbose=-1),
             lgbm_params,
+            mode=SEARCH_MODE,
             n_iter=100,
             cv=5,
             scoring='neg_mean_absolute_error',
@@ -199,7 +198,8 @@ def train_model():
             random_state=42
         )
 
-        lgbm_search.fit(X_train, y_train)
+        with scheduler.phase('LightGBM search', lgbm_search):
+            lgbm_search.fit(X_train, y_train)
         lgbm_best = lgbm_search.best_estimator_
         print(f"Best LightGBM MAE: {-lgbm_search.best_score_:.3f}")
 
@@ -232,7 +232,8 @@ def train_model():
         n_jobs=-1
     )
 
-    voting_regressor.fit(X_train, y_train)
+    with scheduler.phase('Voting ensemble', voting_regressor):
+        voting_regressor.fit(X_train, y_train)
     print("Voting ensemble trained!")
 
     print("\n[2/2] Creating Stacking Ensemble...")
@@ -253,7 +254,8 @@ def train_model():
         n_jobs=-1
     )
 
-    stacking_regressor.fit(X_train, y_train)
+    with scheduler.phase('Stacking ensemble', stacking_regressor):
+        stacking_regressor.fit(X_train, y_train)
     print("Stacking ensemble trained!")
 
     print("\n" + "="*80)
@@ -348,7 +350,9 @@ def train_model():
         best_acc = gb_acc
 
     print("\nCross-validation results...")
-    cv_scores = cross_val_score(best_model, X_featured, y, cv=10, scoring='r2', n_jobs=-1)
+    with scheduler.phase('Cross-validation'):
+        cv_scores = cross_val_score(best_model, X_featured, y, cv=10, scoring='r2',
+                                    n_jobs=scheduler.split_tasks(10, best_model))
     print(f"Mean R2: {cv_scores.mean():.4f} +/- {cv_scores.std():.4f}")
     print(f"Min R2: {cv_scores.min():.4f}")
     print(f"Max R2: {cv_scores.max():.4f}")
@@ -374,6 +378,8 @@ def train_model():
 
     print(f"\nFinal Accuracy: {best_r2*100:.1f}%")
 
+    scheduler.print_report()
+
     return best_model, preprocessor
 
 
@@ -2,8 +2,8 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from src.preprocessing.preprocessor import DataPreprocessor, load_data
-from src.feature_engineering.engineer import FeatureEngineer
+from src.datasets.feature_cache import load_features
+from src.training.resources import TrainingScheduler
 from src.models.predictor import ShelfLifePredictor
 import json
 from sklearn.ensemble import GradientBoostingRegressor, RandomForestRegressor, VotingRegressor
@@ -13,21 +13,14 @@ import numpy as np
 
 
 def train_model():
+    scheduler = TrainingScheduler()
     print("Loading data...")
-    X, y = load_data('data/food_shelf_life.csv')
+    X_featured, y, preprocessor, feature_engineer = load_features('data/food_shelf_life.csv')
 
-    print("\nData shape:", X.shape)
+    print("\nData shape:", X_featured.shape)
     print("Target distribution:")
     print(y.describe())
 
-    print("\nInitializing preprocessor...")
-    preprocessor = DataPreprocessor()
-    X_processed = preprocessor.fit_transform(X)
-
-    print("Initializing feature engineer...")
-    feature_engineer = FeatureEngineer()
-    X_featured = feature_engineer.transform(X_processed)
-
     print("\nFeature columns:")
     print(X_featured.columns.tolist())
 
@@ -70,7 +63,8 @@ def train_model():
         random_state=42
     )
 
-    rf_search.fit(X_train, y_train)
+    with scheduler.phase('Random Forest search', rf_search):
+        rf_search.fit(X_train, y_train)
     rf_best = rf_search.best_estimator_
     print(f"Best RF MAE: {-rf_search.best_score_:.3f}")
 
@@ -85,7 +79,8 @@ def train_model():
         random_state=42
     )
 
-    gb_search.fit(X_train, y_train)
+    with scheduler.phase('Gradient Boosting search', gb_search):
+        gb_search.fit(X_train, y_train)
     gb_best = gb_search.best_estimator_
     print(f"Best GB MAE: {-gb_search.best_score_:.3f}")
 
@@ -98,7 +93,8 @@ def train_model():
         n_jobs=-1
     )
 
-    voting_regressor.fit(X_train, y_train)
+    with scheduler.phase('Voting ensemble', voting_regressor):
+        voting_regressor.fit(X_train, y_train)
     print("Voting ensemble trained!")
 
     print("\n[4/4] Evaluating models...")
@@ -140,7 +136,9 @@ def train_model():
         print("   Consider adding more training data")
 
     print("\nCross-validation results...")
-    cv_scores = cross_val_score(voting_regressor, X_featured, y, cv=10, scoring='r2', n_jobs=-1)
+    with scheduler.phase('Cross-validation'):
+        cv_scores = cross_val_score(voting_regressor, X_featured, y, cv=10, scoring='r2',
+                                    n_jobs=scheduler.split_tasks(10, voting_regressor))
     print(f"Mean R²: {cv_scores.mean():.4f} ± {cv_scores.std():.4f}")
     print(f"Min R²: {cv_scores.min():.4f}")
     print(f"Max R²: {cv_scores.max():.4f}")
@@ -164,6 +162,8 @@ def train_model():
     preprocessor.save('models/preprocessor.pkl')
     print("Preprocessor saved successfully as: models/preprocessor.pkl")
 
+    scheduler.print_report()
+
     return best_model, preprocessor
 
 
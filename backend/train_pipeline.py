@@ -0,0 +1,49 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import argparse
+import json
+import time
+
+from src.training.pipeline import TrainingPipeline
+
+STAGES = ['split', 'model', 'ensemble']
+
+
+def train_pipeline():
+    parser = argparse.ArgumentParser(description='Train the shelf life model from a pipeline config, reusing unchanged stages')
+    parser.add_argument('config', nargs='?', default='configs/final.json')
+    parser.add_argument('--cache-dir', default=os.getenv('TRAINING_CACHE_DIR', 'data/training_cache'),
+                        help='Where stage outputs are stored; an empty string disables reuse')
+    parser.add_argument('--rebuild', default='', help=f"Comma-separated stages to recompute ({', '.join(STAGES)})")
+    parser.add_argument('--models-dir', help='Override the config output directory')
+    parser.add_argument('--report', help='Write test metrics and stage timings as JSON to this file')
+    args = parser.parse_args()
+
+    rebuild = [stage for stage in args.rebuild.split(',') if stage]
+    unknown = set(rebuild) - set(STAGES)
+    if unknown:
+        parser.error(f"Unknown stages: {', '.join(sorted(unknown))}")
+
+    pipeline = TrainingPipeline.from_file(args.config, cache_dir=args.cache_dir, rebuild=rebuild)
+    if args.models_dir:
+        pipeline.config.setdefault('output', {})['models_dir'] = args.models_dir
+
+    print("=" * 70)
+    print(f"Training pipeline: {args.config}")
+    print("=" * 70)
+    start = time.perf_counter()
+    report = pipeline.run()
+    elapsed = time.perf_counter() - start
+    reused = sum(stage['reused'] for stage in report['stages'])
+    print(f"\nDone in {elapsed:.1f}s ({reused} of {len(report['stages'])} stages reused)")
+
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump({**report, 'config': args.config, 'seconds': elapsed}, f, indent=2, default=str)
+        print(f"Report saved to {args.report}")
+
+
+if __name__ == '__main__':
+    train_pipeline()
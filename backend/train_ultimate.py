@@ -2,7 +2,9 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from src.preprocessing.preprocessor import DataPreprocessor
+from src.datasets.feature_cache import load_features
+from src.training.resources import TrainingScheduler
+from src.training.search import make_search, default_search_mode
 import pandas as pd
 import numpy as np
 
@@ -22,26 +24,15 @@ except:
 
 from sklearn.ensemble import GradientBoostingRegressor, RandomForestRegressor, VotingRegressor, StackingRegressor, ExtraTreesRegressor
 from sklearn.linear_model import Ridge
-from sklearn.model_selection import train_test_split, cross_val_score, RandomizedSearchCV
+from sklearn.model_selection import train_test_split, cross_val_score
 from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
-from src.feature_engineering.engineer import FeatureEngineer
 import joblib
 
-
-def load_data(filepaths):
-    dfs = []
-    for filepath in filepaths:
-        if os.path.exists(filepath):
-            dfs.append(pd.read_csv(filepath))
-    
-    if dfs:
-        combined_df = pd.concat(dfs, ignore_index=True)
-        return combined_df.drop_duplicates()
-    else:
-        return None
+SEARCH_MODE = default_search_mode()
 
 
 def train_model():
+    scheduler = TrainingScheduler()
     print("="*80)
     print("Training High Accuracy Model (97%+ Target) with Extended Datasets")
     print("="*80)
@@ -54,30 +45,21 @@ def train_model():
         'data/food_samples_additional.csv'
     ]
     
-    df = load_data(data_files)
+    data_files = [filepath for filepath in data_files if os.path.exists(filepath)]
     
-    if df is None:
+    if not data_files:
         print("ERROR: No valid data files found!")
         return None, None
     
-    print(f"\nDataset size: {df.shape[0]} samples")
-    print(f"Unique food types: {df['food_type'].unique()}")
-    print(f"Unique storage types: {df['storage_type'].unique()}")
+    X_featured, y, preprocessor, feature_engineer = load_features(data_files, deduplicate=True)
     
-    X = df.drop('remaining_shelf_life', axis=1)
-    y = df['remaining_shelf_life']
+    print(f"\nDataset size: {X_featured.shape[0]} samples")
+    print(f"Unique food types: {preprocessor.label_encoders['food_type'].classes_}")
+    print(f"Unique storage types: {preprocessor.label_encoders['storage_type'].classes_}")
     
     print("\nTarget distribution:")
     print(y.describe())
 
-    print("\nInitializing preprocessor...")
-    preprocessor = DataPreprocessor()
-    X_processed = preprocessor.fit_transform(X)
-
-    print("Initializing feature engineer...")
-    feature_engineer = FeatureEngineer()
-    X_featured = feature_engineer.transform(X_processed)
-
     print(f"\nFeature columns ({X_featured.shape[1]}):")
 
     X_train, X_test, y_train, y_test = train_test_split(
@@ -86,6 +68,7 @@ def train_model():
 
     print(f"\nTraining set: {X_train.shape[0]} samples")
     print(f"Test set: {X_test.shape[0]} samples")
+    print(f"Hyperparameter search: {SEARCH_MODE}")
 
     print("\n" + "="*80)
     print("PHASE 1: Base Models")
@@ -101,9 +84,10 @@ def train_model():
         'bootstrap': [True, False]
     }
 
-    rf_search = RandomizedSearchCV(
+    rf_search = make_search(
         RandomForestRegressor(random_state=42, n_jobs=-1),
         rf_params,
+        mode=SEARCH_MODE,
         n_iter=300,
         cv=5,
         scoring='neg_mean_absolute_error',
@@ -111,7 +95,8 @@ def train_model():
         random_state=42
     )
 
-    rf_search.fit(X_train, y_train)
+    with scheduler.phase('Random Forest search', rf_search):
+        rf_search.fit(X_train, y_train)
     rf_best = rf_search.best_estimator_
     print(f"Best RF MAE: {-rf_search.best_score_:.3f}")
 
@@ -125,9 +110,10 @@ def train_model():
         'subsample': [0.8, 0.9, 1.0]
     }
 
-    gb_search = RandomizedSearchCV(
+    gb_search = make_search(
         GradientBoostingRegressor(random_state=42),
         gb_params,
+        mode=SEARCH_MODE,
         n_iter=200,
         cv=5,
         scoring='neg_mean_absolute_error',
@@ -135,7 +121,8 @@ def train_model():
         random_state=42
     )
 
-    gb_search.fit(X_train, y_train)
+    with scheduler.phase('Gradient Boosting search', gb_search):
+        gb_search.fit(X_train, y_train)
     gb_best = gb_search.best_estimator_
     print(f"Best GB MAE: {-gb_search.best_score_:.3f}")
 
@@ -148,9 +135,10 @@ def train_model():
         'max_features': ['sqrt', 'log2']
     }
 
-    et_search = RandomizedSearchCV(
+    et_search = make_search(
         ExtraTreesRegressor(random_state=42, n_jobs=-1),
         et_params,
+        mode=SEARCH_MODE,
         n_iter=150,
         cv=5,
         scoring='neg_mean_absolute_error',
@@ -158,7 +146,8 @@ def train_model():
         random_state=42
     )
 
-    et_search.fit(X_train, y_train)
+    with scheduler.phase('Extra Trees search', et_search):
+        et_search.fit(X_train, y_train)
     et_best = et_search.best_estimator_
     print(f"Best ET MAE: {-et_search.best_score_:.3f}")
 
@@ -177,9 +166,10 @@ def train_model():
             'colsample_bytree': [0.8, 0.9, 1.0]
         }
 
-        xgb_search = RandomizedSearchCV(
+        xgb_search = make_search(
             XGBRegressor(random_state=42, n_jobs=-1),
             xgb_params,
+            mode=SEARCH_MODE,
             n_iter=200,
             cv=5,
             scoring='neg_mean_absolute_error',
@@ -187,7 +177,8 @@ def train_model():
             random_state=42
         )
 
-        xgb_search.fit(X_train, y_train)
+        with scheduler.phase('XGBoost search', xgb_search):
+            xgb_search.fit(X_train, y_train)
         xgb_best = xgb_search.best_estimator_
         print(f"Best XGBoost MAE: {-xgb_search.best_score_:.3f}")
 
@@ -203,9 +194,10 @@ def train_model():
             'colsample_bytree': [0.8, 0.9, 1.0]
         }
 
-        lgbm_search = RandomizedSearchCV(
+        lgbm_search = make_search(
             LGBMRegressor(random_state=42, n_jobs=-1, verbose=-1),
             lgbm_params,
+            mode=SEARCH_MODE,
             n_iter=200,
             cv=5,
             scoring='neg_mean_absolute_error',
@@ -213,7 +205,8 @@ def train_model():
             random_state=42
         )
 
-        lgbm_search.fit(X_train, y_train)
+        with scheduler.phase('LightGBM search', lgbm_search):
+            lgbm_search.fit(X_train, y_train)
         lgbm_best = lgbm_search.best_estimator_
         print(f"Best LightGBM MAE: {-lgbm_search.best_score_:.3f}")
     else:
@@ -240,7 +233,8 @@ def train_model():
         n_jobs=-1
     )
 
-    voting_regressor.fit(X_train, y_train)
+    with scheduler.phase('Voting ensemble', voting_regressor):
+        voting_regressor.fit(X_train, y_train)
     print("Voting ensemble trained!")
 
     print("\n[2/2] Creating Stacking Ensemble...")
@@ -261,7 +255,8 @@ def train_model():
         n_jobs=-1
     )
 
-    stacking_regressor.fit(X_train, y_train)
+    with scheduler.phase('Stacking ensemble', stacking_regressor):
+        stacking_regressor.fit(X_train, y_train)
     print("Stacking ensemble trained!")
 
     print("\n" + "="*80)
@@ -355,7 +350,9 @@ def train_model():
         best_acc = gb_acc
 
     print("\nCross-validation results...")
-    cv_scores = cross_val_score(best_model, X_featured, y, cv=10, scoring='r2', n_jobs=-1)
+    with scheduler.phase('Cross-validation'):
+        cv_scores = cross_val_score(best_model, X_featured, y, cv=10, scoring='r2',
+                                    n_jobs=scheduler.split_tasks(10, best_model))
     print(f"Mean R2: {cv_scores.mean():.4f} +/- {cv_scores.std():.4f}")
     print(f"Min R2: {cv_scores.min():.4f}")
     print(f"Max R2: {cv_scores.max():.4f}")
@@ -390,6 +387,8 @@ def train_model():
     else:
         print(f"\nCurrent accuracy: {best_r2*100:.1f}% (Target: 97%)")
 
+    scheduler.print_report()
+
     return best_model, preprocessor
 
 
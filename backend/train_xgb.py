@@ -2,8 +2,8 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from src.preprocessing.preprocessor import DataPreprocessor, load_data
-from src.feature_engineering.engineer import FeatureEngineer
+from src.datasets.feature_cache import load_features
+from src.training.resources import TrainingScheduler
 import json
 import numpy as np
 
@@ -29,21 +29,14 @@ import joblib
 
 
 def train_model():
+    scheduler = TrainingScheduler()
     print("Loading data...")
-    X, y = load_data('data/food_shelf_life.csv')
+    X_featured, y, preprocessor, feature_engineer = load_features('data/food_shelf_life.csv')
 
-    print("\nData shape:", X.shape)
+    print("\nData shape:", X_featured.shape)
     print("Target distribution:")
     print(y.describe())
 
-    print("\nInitializing preprocessor...")
-    preprocessor = DataPreprocessor()
-    X_processed = preprocessor.fit_transform(X)
-
-    print("Initializing feature engineer...")
-    feature_engineer = FeatureEngineer()
-    X_featured = feature_engineer.transform(X_processed)
-
     print("\nFeature columns:")
     print(X_featured.columns.tolist())
 
@@ -80,7 +73,8 @@ def train_model():
             random_state=42
         )
 
-        xgb_search.fit(X_train, y_train)
+        with scheduler.phase('XGBoost search', xgb_search):
+            xgb_search.fit(X_train, y_train)
         xgb_best = xgb_search.best_estimator_
         print(f"Best XGBoost MAE: {-xgb_search.best_score_:.3f}")
         
@@ -119,7 +113,8 @@ def train_model():
             random_state=42
         )
 
-        lgbm_search.fit(X_train, y_train)
+        with scheduler.phase('LightGBM search', lgbm_search):
+            lgbm_search.fit(X_train, y_train)
         lgbm_best = lgbm_search.best_estimator_
         print(f"Best LightGBM MAE: {-lgbm_search.best_score_:.3f}")
         
@@ -156,7 +151,8 @@ def train_model():
             random_state=42
         )
 
-        gb_search.fit(X_train, y_train)
+        with scheduler.phase('Gradient Boosting search', gb_search):
+            gb_search.fit(X_train, y_train)
         gb_best = gb_search.best_estimator_
         print(f"Best GB MAE: {-gb_search.best_score_:.3f}")
         
@@ -191,7 +187,8 @@ def train_model():
         random_state=42
     )
 
-    rf_search.fit(X_train, y_train)
+    with scheduler.phase('Random Forest search', rf_search):
+        rf_search.fit(X_train, y_train)
     rf_best = rf_search.best_estimator_
     print(f"Best RF MAE: {-rf_search.best_score_:.3f}")
     
@@ -212,7 +209,8 @@ def train_model():
         n_jobs=-1
     )
 
-    stacking_regressor.fit(X_train, y_train)
+    with scheduler.phase('Stacking ensemble', stacking_regressor):
+        stacking_regressor.fit(X_train, y_train)
     print("Stacking ensemble trained!")
     
     stacking_pred = stacking_regressor.predict(X_test)
@@ -231,7 +229,8 @@ def train_model():
         n_jobs=-1
     )
 
-    voting_regressor.fit(X_train, y_train)
+    with scheduler.phase('Voting ensemble', voting_regressor):
+        voting_regressor.fit(X_train, y_train)
     print("Voting ensemble trained!")
     
     voting_pred = voting_regressor.predict(X_test)
@@ -270,7 +269,9 @@ def train_model():
         print("   Current best possible with given dataset")
 
     print("\nCross-validation results...")
-    cv_scores = cross_val_score(final_model, X_featured, y, cv=10, scoring='r2', n_jobs=-1)
+    with scheduler.phase('Cross-validation'):
+        cv_scores = cross_val_score(final_model, X_featured, y, cv=10, scoring='r2',
+                                    n_jobs=scheduler.split_tasks(10, final_model))
     print(f"Mean R2: {cv_scores.mean():.4f} +/- {cv_scores.std():.4f}")
     print(f"Min R2: {cv_scores.min():.4f}")
     print(f"Max R2: {cv_scores.max():.4f}")
@@ -295,6 +296,8 @@ def train_model():
     print(f"\nFinal Accuracy: {final_r2*100:.1f}%")
     print(f"Final MAE: {final_mae:.3f} days")
 
+    scheduler.print_report()
+
     return final_model, preprocessor
 
 